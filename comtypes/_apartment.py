@@ -0,0 +1,212 @@
+"""Threads running calls in a COM apartment.
+
+An STA thread must pump window messages while it waits, otherwise calls
+from other apartments into its objects, and the events they fire, are
+never delivered.  `ApartmentThread` waits for both window messages and
+calls submitted from other threads, and runs the calls in the apartment.
+
+This module does not know about COM; the apartment is entered, left and
+pumped by a pump object with `initialize`, `uninitialize`, `wakeup` and
+`wait` methods.  `comtypes.client._sta` provides the real one.
+"""
+
+import collections
+import concurrent.futures
+import threading
+from typing import Any, Callable, Optional
+
+
+class ApartmentThread(threading.Thread):
+    """A daemon thread owning a COM apartment.
+
+    Callables passed to `submit` are run in the thread, in the order they
+    were submitted; their results are returned as
+    `concurrent.futures.Future` objects.  While the thread is idle, it
+    waits in the `pump`.
+    """
+
+    def __init__(self, pump: Any, name: Optional[str] = None) -> None:
+        super().__init__(name=name, daemon=True)
+        self._pump = pump
+        self._calls = collections.deque()
+        self._shutdown = False
+        # Guards `_shutdown` against `submit`, so that no call is queued
+        # after the thread stopped running them.  Reentrant, because a
+        # `PinnedObject` collected while the lock is held submits a call.
+        self._shutdown_lock = threading.RLock()
+
+    def submit(
+        self, func: Callable[..., Any], *args: Any, **kw: Any
+    ) -> concurrent.futures.Future:
+        fut = concurrent.futures.Future()
+        with self._shutdown_lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._calls.append((fut, func, args, kw))
+        self._pump.wakeup()
+        return fut
+
+    def pending(self) -> int:
+        """Returns the number of submitted calls not run yet."""
+        return len(self._calls)
+
+    def run(self) -> None:
+        pump = self._pump
+        try:
+            pump.initialize()
+        except BaseException:
+            self._close()
+            raise
+        try:
+            while not self._shutdown:
+                self._run_calls()
+                pump.wait()
+            self._run_calls()
+        finally:
+            self._close()
+            pump.uninitialize()
+
+    def _close(self) -> None:
+        """Stops accepting calls, and cancels the calls not run."""
+        with self._shutdown_lock:
+            self._shutdown = True
+        while self._calls:
+            self._calls.popleft()[0].cancel()
+
+    def _run_calls(self) -> None:
+        calls = self._calls
+        while calls:
+            fut, func, args, kw = calls.popleft()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(*args, **kw)
+            except BaseException as exc:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(result)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Runs the calls already submitted, then leaves the apartment and
+        ends the thread."""
+        with self._shutdown_lock:
+            self._shutdown = True
+        self._pump.wakeup()
+        if wait and self.is_alive():
+            self.join()
+
+
+class PinnedObject(object):
+    """A COM object living in a worker thread of an `ApartmentExecutor`.
+
+    The object can only be used through the methods of this class, which
+    run the calls in the apartment of the object and return futures.  When
+    the `PinnedObject` is garbage collected, the object is released in its
+    apartment.
+    """
+
+    def __init__(
+        self, executor: "ApartmentExecutor", worker: ApartmentThread, obj: Any
+    ) -> None:
+        self._executor = executor
+        self.worker = worker
+        self._ref = [obj]
+
+    def _thread(self) -> ApartmentThread:
+        if self._executor._multithreaded:
+            # The object can be called from any thread of the MTA.
+            return self._executor._least_loaded()
+        return self.worker
+
+    def submit(
+        self, func: Callable[..., Any], *args: Any, **kw: Any
+    ) -> concurrent.futures.Future:
+        """Calls `func(obj, *args, **kw)` in the apartment of the object."""
+        ref = self._ref
+        return self._thread().submit(lambda: func(ref[0], *args, **kw))
+
+    def call(self, name: str, *args: Any, **kw: Any) -> concurrent.futures.Future:
+        """Calls the method `name` of the object."""
+        return self.submit(lambda obj: getattr(obj, name)(*args, **kw))
+
+    def get(self, name: str) -> concurrent.futures.Future:
+        """Gets the property `name` of the object."""
+        return self.submit(getattr, name)
+
+    def set(self, name: str, value: Any) -> concurrent.futures.Future:
+        """Sets the property `name` of the object."""
+        return self.submit(setattr, name, value)
+
+    def __del__(self) -> None:
+        try:
+            self.worker.submit(self._ref.clear)
+        except RuntimeError:
+            # The worker is shut down, the object was released when it
+            # left the apartment.
+            pass
+
+
+class ApartmentExecutor(concurrent.futures.Executor):
+    """An executor owning `max_workers` threads, each one with a pump
+    created by `pump_factory`.
+
+    Objects created with `create` are pinned to the worker that created
+    them, and calls to them are queued to that worker.  With
+    `multithreaded=True`, the workers share one apartment, and the calls
+    to the objects are load-balanced across all workers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        pump_factory: Callable[[], Any],
+        multithreaded: bool = False,
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self._multithreaded = multithreaded
+        self._workers = [
+            ApartmentThread(pump_factory(), name=f"comtypes-sta-{i}")
+            for i in range(max_workers)
+        ]
+        self._next = 0
+        self._lock = threading.Lock()
+        for worker in self._workers:
+            worker.start()
+
+    def _next_index(self) -> int:
+        with self._lock:
+            index = self._next
+            self._next = (index + 1) % len(self._workers)
+        return index
+
+    def _next_worker(self) -> ApartmentThread:
+        return self._workers[self._next_index()]
+
+    def _least_loaded(self) -> ApartmentThread:
+        # Scan from the next worker in turn, so idle workers are used in
+        # round-robin order.
+        start = self._next_index()
+        workers = self._workers[start:] + self._workers[:start]
+        return min(workers, key=lambda w: w.pending())
+
+    def submit(self, fn, /, *args, **kwargs):
+        """Calls `fn(*args, **kwargs)` in the least loaded worker."""
+        return self._least_loaded().submit(fn, *args, **kwargs)
+
+    def create(
+        self, func: Callable[..., Any], *args: Any, **kw: Any
+    ) -> concurrent.futures.Future:
+        """Calls `func(*args, **kw)`, for example `CreateObject(progid)`, in
+        the next worker, and returns a future of a `PinnedObject` wrapping
+        the result."""
+        worker = self._next_worker()
+        return worker.submit(lambda: PinnedObject(self, worker, func(*args, **kw)))
+
+    def shutdown(self, wait: bool = True, **kw: Any) -> None:
+        for worker in self._workers:
+            worker.shutdown(wait=False)
+        if wait:
+            for worker in self._workers:
+                if worker.is_alive():
+                    worker.join()
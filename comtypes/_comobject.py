@@ -1,5 +1,7 @@
+import functools
 import logging
 import queue
+import threading
 from _ctypes import COMError, CopyComPointer
 from ctypes import (
     POINTER,
@@ -18,6 +20,7 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     List,
     Optional,
     Sequence,
@@ -28,7 +31,8 @@ from typing import (
 from typing import Union as _UnionT
 
 from comtypes import GUID, IPersist, IUnknown, hresult
-from comtypes._vtbl import _MethodFinder, create_dispimpl, create_vtbl_mapping
+from comtypes._objpool import ObjectPool
+from comtypes._vtbl import _Impls, _MethodFinder, create_dispimpl, get_shared_vtbl
 from comtypes.errorinfo import ISupportErrorInfo
 from comtypes.typeinfo import IProvideClassInfo, IProvideClassInfo2, ITypeInfo
 
@@ -51,36 +55,9 @@ DISPATCH_PROPERTYPUTREF = 8
 
 ################################################################
 
-try:
-    _InterlockedIncrement = windll.kernel32.InterlockedIncrement
-    _InterlockedDecrement = windll.kernel32.InterlockedDecrement
-except AttributeError:
-    import threading
-
-    _lock = threading.Lock()
-    _acquire = _lock.acquire
-    _release = _lock.release
-    # win 64 doesn't have these functions
-
-    def _InterlockedIncrement(ob: c_long) -> int:
-        _acquire()
-        refcnt = ob.value + 1
-        ob.value = refcnt
-        _release()
-        return refcnt
-
-    def _InterlockedDecrement(ob: c_long) -> int:
-        _acquire()
-        refcnt = ob.value - 1
-        ob.value = refcnt
-        _release()
-        return refcnt
-
-else:
-    _InterlockedIncrement.argtypes = [POINTER(c_long)]
-    _InterlockedDecrement.argtypes = [POINTER(c_long)]
-    _InterlockedIncrement.restype = c_long
-    _InterlockedDecrement.restype = c_long
+# Whether the debug messages of reference counting are logged.  They are
+# formatted only if they are, since AddRef and Release are called a lot.
+_debug_enabled = functools.partial(logger.isEnabledFor, logging.DEBUG)
 
 
 class LocalServer(object):
@@ -130,12 +107,15 @@ class LocalServer(object):
 class InprocServer(object):
     def __init__(self) -> None:
         self.locks = c_long(0)
+        self._lock = threading.Lock()
 
     def Lock(self) -> None:
-        _InterlockedIncrement(self.locks)
+        with self._lock:
+            self.locks.value += 1
 
     def Unlock(self) -> None:
-        _InterlockedDecrement(self.locks)
+        with self._lock:
+            self.locks.value -= 1
 
     def DllCanUnloadNow(self) -> int:
         if self.locks.value:
@@ -146,6 +126,9 @@ class InprocServer(object):
 
 
 _T_IUnknown = TypeVar("_T_IUnknown", bound=IUnknown)
+_T_COMObject = TypeVar("_T_COMObject", bound="COMObject")
+
+_pools_lock = threading.Lock()
 
 
 class COMObject(object):
@@ -156,7 +139,18 @@ class COMObject(object):
     _reg_typelib_: ClassVar[Tuple[str, int, int]]
     __typelib: "hints.ITypeLib"
     _com_pointers_: Dict[GUID, "_Pointer[_Pointer[Structure]]"]
+    _com_impls_: List[_Impls]
     _dispimpl_: Dict[Tuple[int, int], Callable[..., Any]]
+    # Set `_pool_size_` in a subclass to reuse up to that many released
+    # instances, see `_recycle_`.  Instances idle in the pool for more than
+    # `_pool_max_idle_` seconds are finalized.
+    _pool_size_: ClassVar[int] = 0
+    _pool_max_idle_: ClassVar[Optional[float]] = None
+    # The HRESULTs of expected, frequent failures, for example
+    # DISP_E_MEMBERNOTFOUND, which are returned without building error
+    # information when a method raises `ReturnHRESULT` or `COMError` with
+    # them.
+    _lightweight_errors_: ClassVar[FrozenSet[int]] = frozenset()
 
     def __new__(cls, *args, **kw):
         self = super(COMObject, cls).__new__(cls)
@@ -177,8 +171,12 @@ class COMObject(object):
         # The _com_pointers_ instance variable maps string interface iids
         # to C compatible COM pointers.
         self._com_pointers_ = {}
-        # COM refcount starts at zero.
-        self._refcnt = c_long(0)
+        # The method implementations called through the shared vtables.
+        self._com_impls_ = []
+        # COM refcount starts at zero.  Every object has its own lock for
+        # it, so objects used by different threads do not contend.
+        self._refcnt = 0
+        self._refcnt_lock = threading.Lock()
 
         # Some interfaces have a default implementation in COMObject:
         # - ISupportErrorInfo
@@ -211,9 +209,11 @@ class COMObject(object):
 
     def __make_interface_pointer(self, itf: Type[IUnknown]) -> None:
         finder = self._get_method_finder_(itf)
-        iids, vtbl = create_vtbl_mapping(itf, finder)
-        for iid in iids:
-            self._com_pointers_[iid] = pointer(pointer(vtbl))
+        shared = get_shared_vtbl(itf)
+        impls = shared.bind(finder)
+        self._com_impls_.append(impls)
+        for iid in shared.iids:
+            self._com_pointers_[iid] = shared.make_pointer(impls)
         if hasattr(itf, "_disp_methods_"):
             self._dispimpl_ = create_dispimpl(itf, finder)
 
@@ -247,7 +247,8 @@ class COMObject(object):
     @staticmethod
     def __keep__(obj: "COMObject") -> None:
         COMObject._instances_[obj] = None
-        _debug("%d active COM objects: Added   %r", len(COMObject._instances_), obj)
+        if _debug_enabled():
+            _debug("%d active COM objects: Added   %r", len(COMObject._instances_), obj)
         if COMObject.__server__:
             COMObject.__server__.Lock()
 
@@ -258,8 +259,10 @@ class COMObject(object):
         except AttributeError:
             _debug("? active COM objects: Removed %r", obj)
         else:
-            _debug("%d active COM objects: Removed %r", len(COMObject._instances_), obj)
-        _debug("Remaining: %s", list(COMObject._instances_.keys()))
+            if _debug_enabled():
+                _debug(
+                    "%d active COM objects: Removed %r", len(COMObject._instances_), obj
+                )
         if COMObject.__server__:
             COMObject.__server__.Unlock()
 
@@ -271,13 +274,15 @@ class COMObject(object):
     def IUnknown_AddRef(
         self,
         this: Any,
-        __InterlockedIncrement: Callable[[c_long], int] = _InterlockedIncrement,
         _debug=_debug,
+        _debug_enabled=_debug_enabled,
     ) -> int:
-        result = __InterlockedIncrement(self._refcnt)
+        with self._refcnt_lock:
+            result = self._refcnt = self._refcnt + 1
         if result == 1:
             self.__keep__(self)
-        _debug("%r.AddRef() -> %s", self, result)
+        if _debug_enabled():
+            _debug("%r.AddRef() -> %s", self, result)
         return result
 
     def _final_release_(self) -> None:
@@ -285,23 +290,80 @@ class COMObject(object):
         to free allocated resources or so."""
         pass
 
+    def _recycle_(self) -> None:
+        """This method may be overridden in pooled subclasses to reset
+        the state of a released object before it is reused.  If it raises
+        an exception, the object is finalized instead."""
+        pass
+
+    @classmethod
+    def _get_pool_(cls) -> Optional[ObjectPool]:
+        """Returns the pool of released instances of the class, or None if
+        the class is not pooled."""
+        if cls._pool_size_ <= 0:
+            return None
+        # Every class has its own pool, not shared with its subclasses.
+        pool = cls.__dict__.get("_COMObject__pool")
+        if pool is None:
+            with _pools_lock:
+                pool = cls.__dict__.get("_COMObject__pool")
+                if pool is None:
+                    pool = ObjectPool(
+                        cls._pool_size_, cls._pool_max_idle_, COMObject.__finalize
+                    )
+                    cls.__pool = pool
+        return pool
+
+    @classmethod
+    def _create_instance_(
+        cls: Type[_T_COMObject], *args: Any, **kw: Any
+    ) -> _T_COMObject:
+        """Returns a released instance from the pool of the class, or a new
+        instance created with the arguments."""
+        pool = cls._get_pool_()
+        if pool is not None:
+            obj = pool.get()
+            if obj is not None:
+                return obj
+        return cls(*args, **kw)
+
+    def __finalize(self) -> None:
+        self._final_release_()
+        # Hm, why isn't this cleaned up by the cycle gc?
+        self._com_pointers_ = {}
+
+    def __recycle(self) -> bool:
+        try:
+            self._recycle_()
+        except Exception:
+            logger.error("%r._recycle_() failed", self, exc_info=True)
+            return False
+        return True
+
     def IUnknown_Release(
         self,
         this: Any,
-        __InterlockedDecrement: Callable[[c_long], int] = _InterlockedDecrement,
         _debug=_debug,
+        _debug_enabled=_debug_enabled,
     ) -> int:
-        # If this is called at COM shutdown, _InterlockedDecrement()
-        # must still be available, although module level variables may
-        # have been deleted already - so we supply it as default
-        # argument.
-        result = __InterlockedDecrement(self._refcnt)
-        _debug("%r.Release() -> %s", self, result)
+        # If this is called at COM shutdown, the debug functions must still
+        # be available, although module level variables may have been
+        # deleted already - so we supply them as default arguments.
+        with self._refcnt_lock:
+            result = self._refcnt = self._refcnt - 1
+        if _debug_enabled():
+            _debug("%r.Release() -> %s", self, result)
         if result == 0:
-            self._final_release_()
-            self.__unkeep__(self)
-            # Hm, why isn't this cleaned up by the cycle gc?
-            self._com_pointers_ = {}
+            pool = self._get_pool_()
+            if pool is not None and self.__recycle():
+                # The pool finalizes the object if it is full.
+                self.__unkeep__(self)
+                pool.put(self)
+            else:
+                self._final_release_()
+                self.__unkeep__(self)
+                # Hm, why isn't this cleaned up by the cycle gc?
+                self._com_pointers_ = {}
         return result
 
     def IUnknown_QueryInterface(
@@ -1,11 +1,18 @@
 import ctypes
-from typing import Any, Literal, NamedTuple
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 from typing import Dict, List, Tuple, Type
 from typing import Optional, Union as _UnionT
 from typing import Callable, Iterator
 
-from comtypes import _CData
+if TYPE_CHECKING:
+    from ctypes import _CData  # only in `typeshed`, private in runtime
+else:
+    # Not imported from `comtypes`, so that the argspecs can be resolved
+    # where the package cannot be imported.
+    _CData = ctypes._SimpleCData.__mro__[:-1][-1]
+
 import comtypes
+from comtypes import instrumentation
 
 
 _PositionalParamFlagType = Tuple[int, Optional[str]]
@@ -50,8 +57,6 @@ def _resolve_argspec(
     - paramflags is a sequence of `(pflags: int, argname: str, | None[, defval: Any])`.
     - argtypes is a sequence of `type[_CData]`.
     """
-    from comtypes.automation import VARIANT
-
     paramflags = []
     argtypes = []
     for item in items:
@@ -59,6 +64,8 @@ def _resolve_argspec(
         pflags = _encode_idl(idl)
         if "optional" in idl:
             if defval is _NOTHING:
+                from comtypes.automation import VARIANT
+
                 if typ is VARIANT:
                     defval = VARIANT.missing
                 elif typ is ctypes.POINTER(VARIANT):
@@ -433,6 +440,7 @@ class DispPropertyGenerator(PropertyGenerator):
 
 class ComMemberGenerator(object):
     def __init__(self, cls_name: str, vtbl_offset: int, iid: "comtypes.GUID") -> None:
+        self._cls_name = cls_name
         self._vtbl_offset = vtbl_offset
         self._iid = iid
         self._props = ComPropertyGenerator(cls_name)
@@ -453,6 +461,8 @@ class ComMemberGenerator(object):
         func = self._fix_args(m, proto(vidx, m.name, m.paramflags, iid))  # high level
         func.__doc__ = m.doc
         func.__name__ = m.name  # for pyhelp
+        if instrumentation.enabled():
+            func = instrumentation.wrap_method(func, self._cls_name, m.name)
         is_prop = m.is_prop()
         if is_prop:
             self._props.add(m, func)
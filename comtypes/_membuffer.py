@@ -0,0 +1,84 @@
+"""Memory shared by the `MappedStream` COM objects of `comtypes.stream`.
+
+This module does not know about COM; `MappedStream` translates the
+exceptions raised here into the HRESULTs of the `IStream` methods.
+"""
+
+import threading
+from ctypes import c_char
+from typing import Any
+
+
+class ReadOnlyBufferError(Exception):
+    """The buffer cannot be written."""
+
+
+class FixedSizeBufferError(Exception):
+    """The buffer cannot be resized."""
+
+
+class SharedBuffer(object):
+    """The storage of a `MappedStream` and its clones: an `mmap.mmap`, a
+    `bytearray` or any other object supporting the buffer protocol.
+
+    The data is copied between the buffer and the callers' memory with a
+    single memcpy through memoryviews, which also works for read-only
+    buffers.  The memoryviews are released after each copy, so that the
+    buffer can be resized.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        self.buffer = buffer
+        with memoryview(buffer) as mv:
+            self.readonly = mv.readonly
+        self._lock = threading.Lock()
+
+    def size(self) -> int:
+        with memoryview(self.buffer) as mv:
+            return mv.nbytes
+
+    def read(self, pos: int, address: int, cb: int) -> int:
+        """Copies up to `cb` bytes at `pos` to `address`, and returns their
+        number."""
+        with self._lock, memoryview(self.buffer) as mv:
+            src = mv.cast("B")[pos : pos + cb]
+            n = len(src)
+            if n:
+                memoryview((c_char * n).from_address(address)).cast("B")[:] = src
+            src.release()
+        return n
+
+    def write(self, pos: int, address: int, cb: int) -> int:
+        """Copies `cb` bytes from `address` to `pos`, growing the buffer if
+        needed, and returns their number."""
+        if self.readonly:
+            raise ReadOnlyBufferError("The stream is read-only")
+        with self._lock:
+            if pos + cb > self.size():
+                self._resize(pos + cb)
+            with memoryview(self.buffer) as mv:
+                dst = mv.cast("B")
+                src = memoryview((c_char * cb).from_address(address)).cast("B")
+                dst[pos : pos + cb] = src
+                dst.release()
+        return cb
+
+    def set_size(self, size: int) -> None:
+        if self.readonly:
+            raise ReadOnlyBufferError("The stream is read-only")
+        with self._lock:
+            self._resize(size)
+
+    def _resize(self, size: int) -> None:
+        buffer = self.buffer
+        if isinstance(buffer, bytearray):
+            old = len(buffer)
+            if size < old:
+                del buffer[size:]
+            else:
+                buffer.extend(bytes(size - old))
+        elif hasattr(buffer, "resize"):
+            # mmap: remap the memory, the new bytes are zero
+            buffer.resize(size)
+        else:
+            raise FixedSizeBufferError("The stream cannot be resized")
@@ -0,0 +1,106 @@
+"""Pools of released COM objects, reused by the class factories.
+
+Creating a `COMObject` builds its COM pointers and looks up its method
+implementations, and releasing it runs `_final_release_`.  Servers handing
+out many short-lived objects can instead keep the released objects of a
+class in a pool, and reuse them for the next instances.
+
+This module does not know about COM; `COMObject` puts the objects in the
+pool when their reference count drops to zero, and the pool hands the
+objects it does not keep to a `finalize` callback.
+"""
+
+import collections
+import threading
+import time
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+
+class ObjectPool(object):
+    """Keeps at most `max_size` released objects for reuse.
+
+    Objects idle in the pool for more than `max_idle` seconds are evicted
+    the next time the pool is used.  The objects rejected because the pool
+    is full, and the evicted ones, are passed to `finalize`.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        max_idle: Optional[float] = None,
+        finalize: Optional[Callable[[Any], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._finalize = finalize
+        self._clock = clock
+        # (released at, object), the most recently released last.
+        self._items: Deque[Tuple[float, Any]] = collections.deque()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _expired(self, now: float) -> List[Any]:
+        # Must be called with the lock held.
+        result = []
+        if self.max_idle is not None:
+            items = self._items
+            while items and now - items[0][0] > self.max_idle:
+                result.append(items.popleft()[1])
+            self.evicted += len(result)
+        return result
+
+    def _finalize_all(self, objs: List[Any]) -> None:
+        if self._finalize is not None:
+            for obj in objs:
+                self._finalize(obj)
+
+    def get(self) -> Optional[Any]:
+        """Returns the most recently released object, or None if the pool
+        is empty."""
+        with self._lock:
+            expired = self._expired(self._clock())
+            if self._items:
+                obj = self._items.pop()[1]
+                self.hits += 1
+            else:
+                obj = None
+                self.misses += 1
+        self._finalize_all(expired)
+        return obj
+
+    def put(self, obj: Any) -> bool:
+        """Keeps `obj` for reuse; returns False, after finalizing it, if the
+        pool is full."""
+        with self._lock:
+            now = self._clock()
+            expired = self._expired(now)
+            kept = len(self._items) < self.max_size
+            if kept:
+                self._items.append((now, obj))
+        if not kept:
+            expired.append(obj)
+        self._finalize_all(expired)
+        return kept
+
+    def evict(self) -> int:
+        """Finalizes the objects idle for too long; returns their number."""
+        with self._lock:
+            expired = self._expired(self._clock())
+        self._finalize_all(expired)
+        return len(expired)
+
+    def clear(self) -> int:
+        """Finalizes all the objects in the pool; returns their number."""
+        with self._lock:
+            objs = [obj for _, obj in self._items]
+            self._items.clear()
+        self._finalize_all(objs)
+        return len(objs)
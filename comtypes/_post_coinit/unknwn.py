@@ -277,7 +277,9 @@ class _compointer_base(c_void_p, metaclass=_compointer_meta):
             #
             if not type(self)._com_shutting_down:
                 _debug("Release %s", self)
-                self.Release()  # type: ignore
+                # The COM method itself, not `Release`, which may be
+                # replaced to count the references (see `comtypes.leaks`).
+                self._IUnknown__com_Release()  # type: ignore
 
     def __eq__(self, other):
         if not isinstance(other, _compointer_base):
@@ -1,17 +1,81 @@
 import os
 import sys
+import time
+from typing import Dict, Optional, Tuple
 
+# How often the timestamp of a typelib is checked when a generated module
+# is imported:
+#   "always": on every import (the default).
+#   "once": only on the first import per typelib in this process.
+#   "ttl": again if the last check is older than `ttl` seconds.
+#   "never": not at all; only the `comtypes` version is checked.
+STALENESS_POLICIES = ("always", "once", "ttl", "never")
 
-def _check_version(actual, tlib_cached_mtime=None):
+_policy = "always"
+_ttl = 60.0
+
+# typelib path -> (`time.monotonic()` of the check, `st_mtime`)
+_checked_mtimes: Dict[str, Tuple[float, float]] = {}
+
+
+def set_staleness_policy(policy: str, ttl: Optional[float] = None) -> None:
+    """Sets how often the typelib timestamps of generated modules are checked.
+
+    `policy` must be one of "always", "once", "ttl" and "never".
+    `ttl` is the time in seconds after that a cached timestamp is checked
+    again, only used by the "ttl" policy.
+    """
+    global _policy, _ttl
+    if policy not in STALENESS_POLICIES:
+        raise ValueError(f"'{policy}' is not a valid staleness policy")
+    if ttl is not None:
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        _ttl = ttl
+    _policy = policy
+
+
+def get_staleness_policy() -> Tuple[str, float]:
+    """Returns the current staleness policy and ttl."""
+    return _policy, _ttl
+
+
+def _remember_mtime(tlb_path: str, mtime: float) -> None:
+    _checked_mtimes[tlb_path] = (time.monotonic(), mtime)
+
+
+def _forget_mtimes() -> None:
+    _checked_mtimes.clear()
+
+
+def _get_tlib_mtime(tlb_path: str) -> float:
+    """Returns the timestamp of the typelib, reusing the timestamp that was
+    already checked if the staleness policy allows it."""
+    cached = _checked_mtimes.get(tlb_path)
+    if cached is not None:
+        if _policy == "once":
+            return cached[1]
+        if _policy == "ttl" and time.monotonic() - cached[0] < _ttl:
+            return cached[1]
+    mtime = os.stat(tlb_path).st_mtime
+    _remember_mtime(tlb_path, mtime)
+    return mtime
+
+
+def _check_version(actual, tlib_cached_mtime=None, tlb_path=None):
     from comtypes.tools.codegenerator import version as required
 
     if actual != required:
         raise ImportError("Wrong version")
     if not hasattr(sys, "frozen"):
-        g = sys._getframe(1).f_globals
-        tlb_path = g.get("typelib_path")
+        if _policy == "never":
+            return
+        if tlb_path is None:
+            # modules generated before the typelib path was passed explicitly
+            g = sys._getframe(1).f_globals
+            tlb_path = g.get("typelib_path")
         try:
-            tlib_curr_mtime = os.stat(tlb_path).st_mtime
+            tlib_curr_mtime = _get_tlib_mtime(tlb_path)
         except (OSError, TypeError):
             return
         if not tlib_cached_mtime or abs(tlib_curr_mtime - tlib_cached_mtime) >= 1:
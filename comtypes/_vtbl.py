@@ -1,6 +1,7 @@
 import logging
+import weakref
 from _ctypes import COMError
-from ctypes import WINFUNCTYPE, Structure, c_void_p
+from ctypes import WINFUNCTYPE, Structure, addressof, c_void_p, pointer
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -9,19 +10,18 @@ from typing import (
     Iterator,
     List,
     Optional,
-    Sequence,
     Tuple,
     Type,
 )
 from typing import Union as _UnionT
 
 import comtypes
-from comtypes import GUID, IUnknown, hresult
+from comtypes import GUID, IUnknown, hresult, instrumentation
 from comtypes._memberspec import _encode_idl
-from comtypes.errorinfo import ReportError, ReportException
+from comtypes.errorinfo import ReportError, ReportException, ReportHResult
 
 if TYPE_CHECKING:
-    from ctypes import _FuncPointer
+    from ctypes import _FuncPointer, _Pointer
 
     from comtypes import hints  # type: ignore
     from comtypes._memberspec import _ArgSpecElmType, _DispMemberSpec, _ParamFlagType
@@ -89,21 +89,27 @@ def catch_errors(
     mthname: str,
 ) -> Callable[..., Any]:
     clsid = getattr(obj, "_reg_clsid_", None)
+    lightweight = getattr(obj, "_lightweight_errors_", ())
 
     def call_with_this(*args, **kw):
         try:
             result = mth(*args, **kw)
         except comtypes.ReturnHRESULT as err:
             (hr, text) = err.args
+            if hr in lightweight:
+                return ReportHResult(hr)
             return ReportError(text, iid=interface._iid_, clsid=clsid, hresult=hr)
         except (COMError, WindowsError) as details:
+            hr = winerror(details)
+            if hr in lightweight:
+                return ReportHResult(hr)
             _error(
                 "Exception in %s.%s implementation:",
                 interface.__name__,
                 mthname,
                 exc_info=True,
             )
-            return HRESULT_FROM_WIN32(winerror(details))
+            return HRESULT_FROM_WIN32(hr)
         except E_NotImplemented:
             _warning("Unimplemented method %s.%s called", interface.__name__, mthname)
             return hresult.E_NOTIMPL
@@ -162,6 +168,7 @@ def hack(
     #     return catch_errors(inst, mth, interface, mthname)
 
     clsid = getattr(inst, "_reg_clsid_", None)
+    lightweight = getattr(inst, "_lightweight_errors_", ())
 
     def call_without_this(this, *args):
         # Method implementations could check for and return E_POINTER
@@ -187,9 +194,13 @@ def hack(
                     args[args_out_idx[i]][0] = value
         except comtypes.ReturnHRESULT as err:
             (hr, text) = err.args
+            if hr in lightweight:
+                return ReportHResult(hr)
             return ReportError(text, iid=interface._iid_, clsid=clsid, hresult=hr)
         except COMError as err:
             (hr, text, details) = err.args
+            if hr in lightweight:
+                return ReportHResult(hr)
             _error(
                 "Exception in %s.%s implementation:",
                 interface.__name__,
@@ -246,8 +257,12 @@ class _MethodFinder(object):
     ) -> Callable[..., Any]:
         mth = self.find_impl(interface, mthname, paramflags, idlflags)
         if mth is None:
-            return _do_implement(interface.__name__, mthname)
-        return hack(self.inst, mth, paramflags, interface, mthname)
+            impl = _do_implement(interface.__name__, mthname)
+        else:
+            impl = hack(self.inst, mth, paramflags, interface, mthname)
+        if instrumentation.enabled():
+            return instrumentation.wrap_thunk(impl, interface.__name__, mthname)
+        return impl
 
     def find_method(self, fq_name: str, mthname: str) -> Callable[..., Any]:
         # Try to find a method, first with the fully qualified name
@@ -334,25 +349,84 @@ _vtbl_types: Dict[Tuple[Tuple[str, Type["_FuncPointer"]], ...], Type[Structure]]
 ################################################################
 
 
-def create_vtbl_mapping(
-    itf: Type[IUnknown], finder: _MethodFinder
-) -> Tuple[Sequence[GUID], Structure]:
-    methods: List[Callable[..., Any]] = []  # method implementations
-    fields: List[Tuple[str, Type["_FuncPointer"]]] = []  # virtual function table
-    iids: List[GUID] = []  # interface identifiers.
-    # iterate over interface inheritance in reverse order to build the
-    # virtual function table, and leave out the 'object' base class.
-    for interface in itf.__mro__[-2::-1]:
-        iids.append(interface._iid_)
-        for m in interface._methods_:
-            restype, mthname, argtypes, paramflags, idlflags, helptext = m
-            proto = WINFUNCTYPE(restype, c_void_p, *argtypes)
-            fields.append((mthname, proto))
-            mth = finder.get_impl(interface, mthname, paramflags, idlflags)
-            methods.append(proto(mth))
-    Vtbl = _create_vtbl_type(tuple(fields), itf)
-    vtbl = Vtbl(*methods)
-    return (iids, vtbl)
+class _Impls(list):
+    """The method implementations of a COM object for the methods of a
+    `_SharedVtbl`, in vtable order."""
+
+    # (a list subclass, so that it can be weakly referenced)
+
+
+# Maps the `this` pointers of the COM objects using shared vtables to weak
+# references to their method implementations.  The objects own their
+# `_Impls`; the entries are removed when the objects are collected.
+_this_to_impls: Dict[int, "weakref.ref[_Impls]"] = {}
+
+
+def _make_thunk(index: int) -> Callable[..., Any]:
+    def thunk(this, *args):
+        ref = _this_to_impls.get(this)
+        impls = ref() if ref is not None else None
+        if impls is None:
+            # an unknown `this`, or the object was already collected
+            _error("Call on unknown or released COM object at 0x%x", this)
+            return hresult.E_UNEXPECTED
+        return impls[index](this, *args)
+
+    return thunk
+
+
+class _SharedVtbl(object):
+    """The virtual function table of an interface, shared by all the COM
+    objects implementing it.
+
+    Creating the callback thunks of a vtable is expensive, and they are
+    never freed; so the thunks are created once per interface, and find
+    the method implementation of the object by its `this` pointer.
+    """
+
+    def __init__(self, itf: Type[IUnknown]) -> None:
+        fields: List[Tuple[str, Type["_FuncPointer"]]] = []
+        self.iids: List[GUID] = []
+        self.specs: List[Tuple[Type[IUnknown], str, Any, Any]] = []
+        for interface in itf.__mro__[-2::-1]:
+            self.iids.append(interface._iid_)
+            for m in interface._methods_:
+                restype, mthname, argtypes, paramflags, idlflags, helptext = m
+                proto = WINFUNCTYPE(restype, c_void_p, *argtypes)
+                fields.append((mthname, proto))
+                self.specs.append((interface, mthname, paramflags, idlflags))
+        Vtbl = _create_vtbl_type(tuple(fields), itf)
+        self.vtbl = Vtbl(
+            *[proto(_make_thunk(i)) for i, (_, proto) in enumerate(fields)]
+        )
+
+    def bind(self, finder: _MethodFinder) -> _Impls:
+        """Returns the implementations of the methods found by `finder`."""
+        return _Impls(finder.get_impl(*spec) for spec in self.specs)
+
+    def make_pointer(self, impls: _Impls) -> "_Pointer[_Pointer[Structure]]":
+        """Returns a new COM pointer to the vtable, calling `impls`."""
+        vtbl_ptr = pointer(self.vtbl)
+        this = addressof(vtbl_ptr)
+
+        def forget(ref, this=this):
+            if _this_to_impls.get(this) is ref:
+                del _this_to_impls[this]
+
+        _this_to_impls[this] = weakref.ref(impls, forget)
+        return pointer(vtbl_ptr)
+
+
+_shared_vtbls: "weakref.WeakKeyDictionary[Type[IUnknown], _SharedVtbl]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_vtbl(itf: Type[IUnknown]) -> _SharedVtbl:
+    try:
+        return _shared_vtbls[itf]
+    except KeyError:
+        return _shared_vtbls.setdefault(itf, _SharedVtbl(itf))
 
 
 def create_dispimpl(
@@ -13,6 +13,7 @@ import comtypes
 import comtypes.patcher
 from comtypes import BSTR, COMMETHOD, GUID, IID, STDMETHOD, IUnknown, _CData, _safearray
 from comtypes import hresult as hresult
+from comtypes import instrumentation
 from comtypes.safearray import _midlSAFEARRAY
 
 if TYPE_CHECKING:
@@ -827,6 +828,21 @@ class IDispatch(IUnknown):
         return ids[:]
 
     def _invoke(self, memid: int, invkind: int, lcid: int, *args: Any) -> Any:
+        tracer = instrumentation._tracer
+        if tracer is not None:
+            return instrumentation.trace_call(
+                tracer,
+                type(self).__name__,
+                f"Invoke({memid})",
+                self.__invoke,
+                memid,
+                invkind,
+                lcid,
+                *args,
+            )
+        return self.__invoke(memid, invkind, lcid, *args)
+
+    def __invoke(self, memid: int, invkind: int, lcid: int, *args: Any) -> Any:
         var = VARIANT()
         argerr = c_uint()
         dp = DISPPARAMS()
@@ -864,7 +880,20 @@ class IDispatch(IUnknown):
 
     def Invoke(self, dispid: int, *args: Any, **kw: Any) -> Any:
         """Invoke a method or property."""
+        tracer = instrumentation._tracer
+        if tracer is not None:
+            return instrumentation.trace_call(
+                tracer,
+                type(self).__name__,
+                f"Invoke({dispid})",
+                self.__Invoke,
+                dispid,
+                *args,
+                **kw,
+            )
+        return self.__Invoke(dispid, *args, **kw)
 
+    def __Invoke(self, dispid: int, *args: Any, **kw: Any) -> Any:
         # Memory management in Dispatch::Invoke calls:
         # http://msdn.microsoft.com/library/en-us/automat/htm/chap5_4x2q.asp
         # Quote:
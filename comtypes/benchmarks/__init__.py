@@ -0,0 +1,20 @@
+"""Benchmarks for the parts of comtypes which do not need a COM runtime.
+
+The benchmarks build their inputs synthetically (see `synthetic`), so they
+do not need any type library or COM server, e.g.
+
+    py -m comtypes.benchmarks.bench_codegen --interfaces 10000
+
+`suite` collects micro benchmarks of the hot paths, stores their results,
+and compares the results of two runs:
+
+    py -m comtypes.benchmarks.suite run -o results/
+    py -m comtypes.benchmarks.suite compare results/OLD.json results/NEW.json
+
+The benchmarks do not need COM.  Where the `comtypes` package cannot be
+imported, e.g. on Linux, they are run as scripts, and the suite uses ctypes
+stand-ins for the COM types:
+
+    python comtypes/benchmarks/suite.py run
+    python comtypes/benchmarks/bench_codegen.py --interfaces 10000
+"""
@@ -0,0 +1,56 @@
+"""Benchmarks `CodeGenerator.generate_wrapper_code` on synthetic typelibs.
+
+py -m comtypes.benchmarks.bench_codegen [--interfaces N] [--repeat N]
+
+The benchmark does not use COM; where the `comtypes` package cannot be
+imported, e.g. on Linux, it is run as a script:
+
+python comtypes/benchmarks/bench_codegen.py [--interfaces N] [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Optional, Sequence, Tuple
+
+if not __package__:
+    import _placeholder  # noqa
+
+from comtypes.benchmarks.synthetic import build_typedescs, known_namespaces
+from comtypes.tools.codegenerator import codegenerator
+
+
+def run(
+    interfaces: int, methods: int = 4
+) -> Tuple[float, codegenerator.GenerationStats]:
+    """Generates the wrapper code of a synthetic typelib, and returns the
+    time it took and the statistics of the code generator."""
+    items = build_typedescs(interfaces, methods)
+    codegen = codegenerator.CodeGenerator(*known_namespaces())
+    start = time.perf_counter()
+    codegen.generate_wrapper_code(items, None)
+    return time.perf_counter() - start, codegen.stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="py -m comtypes.benchmarks.bench_codegen",
+        description="Benchmarks the code generator on synthetic typelibs.",
+    )
+    parser.add_argument("--interfaces", type=int, default=10000)
+    parser.add_argument("--methods", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    best = None
+    for _ in range(args.repeat):
+        elapsed, stats = run(args.interfaces, args.methods)
+        print(f"{elapsed:.3f}s")
+        if best is None or elapsed < best[0]:
+            best = (elapsed, stats)
+    if best is not None:
+        print(f"best of {args.repeat}: {best[0]:.3f}s")
+        print(best[1].report())
+
+
+if __name__ == "__main__":
+    main()
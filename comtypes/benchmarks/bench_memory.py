@@ -0,0 +1,90 @@
+"""Measures the memory used by the type descriptions of a synthetic typelib,
+and by generating its wrapper code.
+
+    py -m comtypes.benchmarks.bench_memory [--methods N]
+
+The benchmark does not use COM; where the `comtypes` package cannot be
+imported, e.g. on Linux, it is run as a script:
+
+    python comtypes/benchmarks/bench_memory.py [--methods N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Dict, Optional, Sequence
+
+if not __package__:
+    import _placeholder  # noqa
+
+from comtypes.benchmarks.synthetic import build_typedescs, known_namespaces
+from comtypes.tools.codegenerator import codegenerator
+
+_MB = 1024 * 1024
+
+
+def _peak_rss() -> Optional[int]:
+    """Returns the peak resident set size of the process in bytes, if the
+    platform provides it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    import sys
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def run(methods: int, methods_per_interface: int = 5) -> Dict[str, float]:
+    """Builds a typedesc graph with about `methods` COM methods, generates
+    its wrapper code, and returns the memory and time it took."""
+    interfaces = max(methods // (2 * methods_per_interface), 1)
+    result: Dict[str, float] = {}
+    # Each phase is traced on its own; `tracemalloc.reset_peak` needs
+    # Python 3.9.
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        items = build_typedescs(interfaces, methods_per_interface)
+        result["build_time"] = time.perf_counter() - start
+        result["typedesc_bytes"], result["build_peak_bytes"] = (
+            tracemalloc.get_traced_memory()
+        )
+    finally:
+        tracemalloc.stop()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        codegen = codegenerator.CodeGenerator(*known_namespaces())
+        codegen.generate_wrapper_code(items, None)
+        result["codegen_time"] = time.perf_counter() - start
+        result["codegen_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    rss = _peak_rss()
+    if rss is not None:
+        result["peak_rss_bytes"] = rss
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="py -m comtypes.benchmarks.bench_memory",
+        description="Measures the memory used by parsing and code generation.",
+    )
+    parser.add_argument("--methods", type=int, default=50000)
+    parser.add_argument("--methods-per-interface", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = run(args.methods, args.methods_per_interface)
+    for key, value in result.items():
+        if key.endswith("_bytes"):
+            print(f"{key[: -len('_bytes')]:<20} {value / _MB:10.1f} MB")
+        else:
+            print(f"{key:<20} {value:10.3f} s")
+
+
+if __name__ == "__main__":
+    main()
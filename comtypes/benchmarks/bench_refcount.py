@@ -0,0 +1,77 @@
+"""Measures the throughput of `COMObject.AddRef`/`Release` pairs called
+concurrently from several threads.
+
+    py -m comtypes.benchmarks.bench_refcount [--threads N] [--calls N]
+
+Every thread calls the methods on its own objects, and all threads on a
+shared object, the way a server's objects are used by clients in the MTA.
+"""
+
+import argparse
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from comtypes import COMObject, IUnknown
+
+
+class _Object(COMObject):
+    _com_interfaces_ = [IUnknown]
+
+
+def _run_threads(objects: Sequence[COMObject], calls: int) -> float:
+    barrier = threading.Barrier(len(objects) + 1)
+
+    def work(obj: COMObject) -> None:
+        addref, release = obj.IUnknown_AddRef, obj.IUnknown_Release
+        barrier.wait()
+        for _ in range(calls):
+            addref(None)
+            release(None)
+
+    threads = [threading.Thread(target=work, args=(obj,)) for obj in objects]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def run(threads: int = 8, calls: int = 100000) -> Dict[str, float]:
+    """Calls `calls` AddRef/Release pairs in each of `threads` threads, and
+    returns the pairs per second."""
+    # An outstanding reference, so that the objects are not released and
+    # registered again on every pair.
+    shared = _Object()
+    shared.IUnknown_AddRef(None)
+    own = [_Object() for _ in range(threads)]
+    for obj in own:
+        obj.IUnknown_AddRef(None)
+    try:
+        result = {
+            "own_objects": threads * calls / _run_threads(own, calls),
+            "shared_object": threads * calls / _run_threads([shared] * threads, calls),
+        }
+    finally:
+        for obj in own + [shared]:
+            obj.IUnknown_Release(None)
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="py -m comtypes.benchmarks.bench_refcount",
+        description="Measures the AddRef/Release throughput of COM objects.",
+    )
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    for key, value in run(args.threads, args.calls).items():
+        print(f"{key:<20} {value:12.0f} pairs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,518 @@
+"""A suite of micro benchmarks for the hot paths of comtypes that do not need
+a COM runtime, with stored results and a comparison of two runs.
+
+    py -m comtypes.benchmarks.suite run [--filter PATTERN] [--output FILE]
+    py -m comtypes.benchmarks.suite compare OLD.json NEW.json [--threshold 1.1]
+
+Where the `comtypes` package cannot be imported, e.g. on Linux, the suite
+is run as a script, and the benchmarks use ctypes stand-ins for the COM
+types and functions:
+
+    python comtypes/benchmarks/suite.py run
+
+`run` times every benchmark and writes the results, with the git commit and
+the Python version they were measured with, to a JSON file.  `compare`
+prints the ratio of the best times of two result files, and exits with 1
+if a benchmark became slower than `threshold`, so that it can fail a CI job.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from ctypes import POINTER, Structure, Union, byref, memmove
+from ctypes import c_int, c_int32, c_long, c_ubyte, c_uint16, c_uint32, c_ushort
+from ctypes import c_void_p, c_wchar_p
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+if not __package__:
+    import _placeholder  # noqa
+
+# name -> setup function, which returns the function to time.
+_benchmarks: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+FORMAT_VERSION = 1
+
+# The reason for skipping a benchmark.
+NO_NUMPY = "numpy is not installed"
+
+
+class SkipBenchmark(Exception):
+    """Raised by the setup of a benchmark which cannot run here."""
+
+
+def benchmark(name: str) -> Callable[[Callable[[], Callable[[], Any]]], Any]:
+    """Register a benchmark.  The decorated function does the setup, and
+    returns the function to time."""
+
+    def decorator(setup: Callable[[], Callable[[], Any]]) -> Any:
+        _benchmarks[name] = setup
+        return setup
+
+    return decorator
+
+
+def names(pattern: str = "*") -> List[str]:
+    """Return the names of the benchmarks matching `pattern`."""
+    return sorted(n for n in _benchmarks if fnmatch.fnmatchcase(n, pattern))
+
+
+################################################################
+# benchmarks
+
+
+# `comtypes.automation.VT_I4`
+_VT_I4 = 3
+
+
+class _VARIANT_U(Union):
+    _fields_ = [("VT_I4", c_int32), ("_tagBRECORD", c_void_p * 2)]
+
+
+class _VARIANT(Structure):
+    """Stands in for `comtypes.automation.VARIANT` where COM is not
+    available; it has the same layout, but only holds integers."""
+
+    _fields_ = [("vt", c_ushort), ("wReserved", c_ushort * 3), ("_", _VARIANT_U)]
+
+    def _set_value(self, value: int) -> None:
+        self.vt = _VT_I4
+        self._.VT_I4 = value
+
+    value = property(fset=_set_value)
+
+
+class _GUID(Structure):
+    """Stands in for `comtypes.GUID` where ole32 is not available; GUIDs are
+    parsed and formatted with `uuid` instead."""
+
+    _fields_ = [
+        ("Data1", c_uint32),
+        ("Data2", c_uint16),
+        ("Data3", c_uint16),
+        ("Data4", c_ubyte * 8),
+    ]
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        if name is not None:
+            memmove(byref(self), uuid.UUID(name).bytes_le, 16)
+
+    def __str__(self) -> str:
+        return "{%s}" % str(uuid.UUID(bytes_le=bytes(self))).upper()
+
+
+def _com_types() -> Tuple[Any, Any, Any]:
+    """Return the BSTR, HRESULT and VARIANT types, or stand-ins for them where
+    the `comtypes` package cannot be imported, so that the member specs can
+    be benchmarked there, too."""
+    try:
+        from comtypes import BSTR, HRESULT
+        from comtypes.automation import VARIANT
+    except ImportError:
+        return c_wchar_p, c_long, _VARIANT
+    return BSTR, HRESULT, VARIANT
+
+
+def _guid_type() -> Any:
+    """Return `comtypes.GUID`, or a stand-in for it where the `comtypes`
+    package cannot be imported."""
+    try:
+        from comtypes.GUID import GUID
+    except ImportError:
+        return _GUID
+    return GUID
+
+
+@benchmark("memberspec.COMMETHOD")
+def _commethod() -> Callable[[], Any]:
+    from comtypes._memberspec import COMMETHOD, defaultvalue, helpstring
+
+    BSTR, HRESULT, _ = _com_types()
+
+    def func():
+        return COMMETHOD(
+            [helpstring("Spam the egg"), "propget", 42],
+            HRESULT,
+            "Spam",
+            (["in"], BSTR, "name"),
+            (["in", "optional"], c_int, "count", defaultvalue(3)),
+            (["in", "optional"], POINTER(c_int), "flags", defaultvalue(None)),
+            (["out", "retval"], POINTER(BSTR), "result"),
+        )
+
+    return func
+
+
+@benchmark("memberspec.DISPMETHOD")
+def _dispmethod() -> Callable[[], Any]:
+    from comtypes._memberspec import DISPMETHOD, dispid
+
+    BSTR, _, VARIANT = _com_types()
+
+    def func():
+        return DISPMETHOD(
+            [dispid(7), "propget"],
+            VARIANT,
+            "Spam",
+            (["in"], BSTR, "name"),
+            (["in", "optional"], VARIANT, "value", 0),
+        )
+
+    return func
+
+
+@benchmark("memberspec.ComPropertyGenerator")
+def _com_property_generator() -> Callable[[], Any]:
+    from comtypes._memberspec import COMMETHOD, ComPropertyGenerator
+
+    _, HRESULT, _ = _com_types()
+    specs = []
+    for i in range(20):
+        specs.append(
+            COMMETHOD(["propget"], HRESULT, f"_get_P{i}", (["out"], POINTER(c_int)))
+        )
+        specs.append(COMMETHOD(["propput"], HRESULT, f"_set_P{i}", (["in"], c_int)))
+        specs.append(
+            COMMETHOD(
+                ["propget"],
+                HRESULT,
+                f"_get_Item{i}",
+                (["in"], c_int, "index"),
+                (["out"], POINTER(c_int)),
+            )
+        )
+
+    def method(self, *args):
+        pass
+
+    def func():
+        gen = ComPropertyGenerator("IBench")
+        for m in specs:
+            gen.add(m, method)
+        return list(gen)
+
+    return func
+
+
+@benchmark("codegen.generate_wrapper_code")
+def _generate_wrapper_code() -> Callable[[], Any]:
+    from comtypes.benchmarks.synthetic import build_typedescs, known_namespaces
+    from comtypes.tools.codegenerator import codegenerator
+
+    items = build_typedescs(20)
+    known_symbols, known_interfaces = known_namespaces()
+
+    def func():
+        codegen = codegenerator.CodeGenerator(known_symbols, known_interfaces)
+        return codegen.generate_wrapper_code(items, None)
+
+    return func
+
+
+def _synthetic_interface(cls: type) -> Any:
+    from comtypes.benchmarks.synthetic import build_typedescs
+
+    return [item for item in build_typedescs(8, 8) if isinstance(item, cls)][-1]
+
+
+@benchmark("typeannotator.ComInterfaceMembersAnnotator")
+def _com_annotator() -> Callable[[], Any]:
+    from comtypes.tools import typedesc
+    from comtypes.tools.codegenerator import typeannotator
+
+    itf = _synthetic_interface(typedesc.ComInterface)
+
+    def func():
+        return typeannotator.ComInterfaceMembersAnnotator(itf).generate()
+
+    return func
+
+
+@benchmark("typeannotator.DispInterfaceMembersAnnotator")
+def _disp_annotator() -> Callable[[], Any]:
+    from comtypes.tools import typedesc
+    from comtypes.tools.codegenerator import typeannotator
+
+    itf = _synthetic_interface(typedesc.DispInterface)
+
+    def func():
+        return typeannotator.DispInterfaceMembersAnnotator(itf).generate()
+
+    return func
+
+
+@benchmark("namespaces.ImportedNamespaces.getvalue")
+def _imported_namespaces() -> Callable[[], Any]:
+    from comtypes.tools.codegenerator.namespaces import ImportedNamespaces
+
+    imports = ImportedNamespaces()
+    imports.add("ctypes", "*")
+    imports.add("ctypes.wintypes")
+    for i in range(100):
+        imports.add("comtypes", f"Symbol{i}")
+        imports.add(f"comtypes.gen._Module{i % 10}", f"IItem{i}")
+
+    return imports.getvalue
+
+
+@benchmark("packing.calc_packing")
+def _calc_packing() -> Callable[[], Any]:
+    from comtypes.tools import typedesc
+    from comtypes.tools._fundamentals import char_type, double_type, int_type
+    from comtypes.tools.codegenerator.packing import calc_packing
+
+    # A packed structure, so that all the packings are tried.
+    fields = []
+    offset = 0
+    for i in range(10):
+        for typ in (char_type, int_type, double_type):
+            fields.append(typedesc.Field(f"f{len(fields)}", typ, None, offset))
+            offset += typ.size
+    struct = typedesc.Structure("Packed", 8, fields, [], offset)
+
+    def func():
+        return calc_packing(struct, fields)
+
+    return func
+
+
+def _npsupport() -> Any:
+    from comtypes._npsupport import interop as npsupport
+
+    try:
+        npsupport.enable()
+    except ImportError:
+        raise SkipBenchmark(NO_NUMPY)
+    return npsupport
+
+
+@benchmark("npsupport.VARIANT_dtype.from_variants")
+def _from_variants() -> Callable[[], Any]:
+    npsupport = _npsupport()
+    _, _, VARIANT = _com_types()
+    dtype = npsupport.VARIANT_dtype
+    variants = (VARIANT * 1000)()
+    for i, v in enumerate(variants):
+        v.value = i
+
+    def func():
+        return npsupport.numpy.frombuffer(variants, dtype=dtype)["_"]["VT_I4"]
+
+    return func
+
+
+@benchmark("npsupport.VARIANT_dtype.to_variants")
+def _to_variants() -> Callable[[], Any]:
+    npsupport = _npsupport()
+    _, _, VARIANT = _com_types()
+    dtype = npsupport.VARIANT_dtype
+    numpy = npsupport.numpy
+    values = numpy.arange(1000, dtype="<i4")
+
+    def func():
+        array = numpy.zeros(len(values), dtype=dtype)
+        array["vt"] = _VT_I4
+        array["_"]["VT_I4"] = values
+        # a view of the bytes; numpy cannot export the union dtype itself
+        return (VARIANT * len(values)).from_buffer(array.view(numpy.uint8))
+
+    return func
+
+
+_IID_IDispatch = "{00020400-0000-0000-C000-000000000046}"
+
+
+@benchmark("GUID.__str__")
+def _guid_str() -> Callable[[], Any]:
+    guid = _guid_type()(_IID_IDispatch)
+    return guid.__str__
+
+
+@benchmark("GUID.__init__")
+def _guid_init() -> Callable[[], Any]:
+    GUID = _guid_type()
+
+    def func():
+        return GUID(_IID_IDispatch)
+
+    return func
+
+
+################################################################
+# running
+
+
+def _measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    # Find the number of loops taking at least `min_time`, like `timeit`.
+    clock = time.perf_counter
+    loops = 1
+    while True:
+        start = clock()
+        for _ in range(loops):
+            func()
+        if clock() - start >= min_time:
+            break
+        loops *= 2
+    times = []
+    for _ in range(repeat):
+        start = clock()
+        for _ in range(loops):
+            func()
+        times.append((clock() - start) / loops)
+    return {
+        "loops": loops,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode("ascii").strip()
+
+
+def run(pattern: str = "*", repeat: int = 5, min_time: float = 0.1) -> Dict[str, Any]:
+    """Run the benchmarks matching `pattern`, and return the results.
+
+    Every benchmark is timed `repeat` times, running it as many times as
+    it takes `min_time` seconds.  The times are in seconds per call.
+    """
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    for name in names(pattern):
+        try:
+            func = _benchmarks[name]()
+        except SkipBenchmark as err:
+            skipped[name] = str(err)
+            continue
+        results[name] = _measure(func, repeat, min_time)
+    return {
+        "version": FORMAT_VERSION,
+        "commit": _git_commit(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "benchmarks": results,
+        "skipped": skipped,
+    }
+
+
+def save(result: Dict[str, Any], path: str) -> str:
+    """Write `result` to `path`.  If `path` is a directory, the file is
+    named after the commit the results were measured on."""
+    if os.path.isdir(path):
+        name = result["commit"] or datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+        path = os.path.join(path, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        result = json.load(f)
+    if result.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported results version")
+    return result
+
+
+def compare(
+    old: Dict[str, Any], new: Dict[str, Any], threshold: float = 1.1
+) -> List[Tuple[str, Optional[float], Optional[float], str]]:
+    """Compare the best times of two results, and return a list of
+    `(name, old, new, status)` tuples.
+
+    The status is "slower" or "faster" when the times differ by more than
+    the `threshold` factor, "added" or "removed" for benchmarks that are
+    only in one of the results, and "" otherwise.
+    """
+    rows = []
+    old_bm, new_bm = old["benchmarks"], new["benchmarks"]
+    for name in sorted(set(old_bm) | set(new_bm)):
+        before = old_bm[name]["min"] if name in old_bm else None
+        after = new_bm[name]["min"] if name in new_bm else None
+        if before is None:
+            status = "added"
+        elif after is None:
+            status = "removed"
+        elif after > before * threshold:
+            status = "slower"
+        elif after * threshold < before:
+            status = "faster"
+        else:
+            status = ""
+        rows.append((name, before, after, status))
+    return rows
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="py -m comtypes.benchmarks.suite",
+        description="Runs the comtypes benchmark suite, or compares results.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--filter", default="*", help="fnmatch pattern")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.1)
+    run_parser.add_argument(
+        "--output", "-o", help="a file, or a directory to store the results in"
+    )
+    compare_parser = commands.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=1.1)
+    commands.add_parser("list", help="list the benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(names()))
+        return 0
+    if args.command == "run":
+        result = run(args.filter, args.repeat, args.min_time)
+        for name, times in result["benchmarks"].items():
+            print(
+                f"{name:<50} {_format_time(times['min']):>10}"
+                f" {_format_time(times['median']):>10}"
+            )
+        for name, reason in result["skipped"].items():
+            print(f"{name:<50} skipped: {reason}")
+        if args.output:
+            print(f"results written to {save(result, args.output)}")
+        return 0
+    rows = compare(load(args.old), load(args.new), args.threshold)
+    for name, before, after, status in rows:
+        ratio = f"{after / before:.2f}x" if before and after else ""
+        print(
+            f"{name:<50} {_format_time(before):>10} {_format_time(after):>10}"
+            f" {ratio:>7} {status}"
+        )
+    return 1 if any(row[3] == "slower" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
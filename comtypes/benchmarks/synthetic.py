@@ -0,0 +1,121 @@
+"""Synthetic type description graphs, as `tlbparser` would create them
+from a type library, for benchmarking the code generator.
+
+This module does not use COM, so the graphs can be built where the
+`comtypes` package cannot be imported.
+"""
+
+import ctypes
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from comtypes.tools import typedesc
+from comtypes.tools._fundamentals import (
+    PTR,
+    BSTR_type,
+    HRESULT_type,
+    IDISPATCH_type,
+    int_type,
+    void_type,
+)
+
+IUNKNOWN = typedesc.ComInterface(
+    "IUnknown", None, "{00000000-0000-0000-C000-000000000046}", ["hidden"], None
+)
+IDISPATCH = typedesc.ComInterface(
+    "IDispatch",
+    IUNKNOWN,
+    "{00020400-0000-0000-C000-000000000046}",
+    ["restricted"],
+    None,
+)
+
+
+def known_namespaces() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Returns the known symbols and interfaces to pass to `CodeGenerator`.
+
+    They stand in for those of `comtypes.client._generate`, which imports
+    the `comtypes` modules to collect them: only the names used by the code
+    generated for the synthetic graphs are included.
+    """
+    known_symbols = {"HRESULT": "ctypes"}
+    for name in ("BSTR", "CoClass", "COMMETHOD", "dispid", "DISPMETHOD"):
+        known_symbols[name] = "comtypes"
+    for name in ("DISPPROPERTY", "GUID", "helpstring", "IUnknown"):
+        known_symbols[name] = "comtypes"
+    for name in ("IDispatch", "VARIANT"):
+        known_symbols[name] = "comtypes.automation"
+    known_symbols.update((name, "ctypes") for name in vars(ctypes))
+    known_interfaces = {"IUnknown": IUNKNOWN.iid, "IDispatch": IDISPATCH.iid}
+    return known_symbols, known_interfaces
+
+
+class _TLibAttr(NamedTuple):
+    """Stands in for the `TLIBATTR` of a type library; the code generator
+    only uses these fields."""
+
+    guid: str
+    wMajorVerNum: int
+    wMinorVerNum: int
+
+
+def _guid(i: int, kind: int) -> str:
+    return "{%08X-%04X-0000-0000-000000000000}" % (i, kind)
+
+
+def build_typedescs(interfaces: int, methods: int = 4) -> List[Any]:
+    """Returns the type descriptions of a typelib with `interfaces` dual
+    interfaces, as many dispinterfaces and coclasses, and a few enums and
+    structures.
+
+    Every interface has `methods` methods, which take structures, enums and
+    pointers to the previously defined interfaces as parameters, so the
+    code generator has to resolve dependencies between them.
+    """
+    tlibattr = _TLibAttr(_guid(0, 0), 1, 0)
+    items: List[Any] = []
+    enums = []
+    for i in range(max(interfaces // 100, 1)):
+        enum = typedesc.Enumeration(f"Enum{i}", 32, 32)
+        for j in range(8):
+            enum.add_value(typedesc.EnumValue(f"Enum{i}Value{j}", j, enum))
+        enums.append(enum)
+    structs = []
+    for i in range(max(interfaces // 100, 1)):
+        struct = typedesc.Structure(
+            f"Struct{i}", align=32, members=[], bases=[], size=64
+        )
+        struct.members.append(typedesc.Field("x", int_type, None, 0))
+        struct.members.append(typedesc.Field("y", enums[i], None, 32))
+        structs.append(struct)
+    itfs: List[typedesc.ComInterface] = []
+    for i in range(interfaces):
+        itf = typedesc.ComInterface(
+            f"IItem{i}", IDISPATCH, _guid(i, 1), ["dual", "oleautomation"], None
+        )
+        for j in range(methods):
+            get_prop = typedesc.ComMethod(
+                2, j, f"Prop{j}", HRESULT_type, ["propget"], None
+            )
+            get_prop.add_argument(PTR(BSTR_type), "pVal", ["out", "retval"], None)
+            mth = typedesc.ComMethod(1, 1000 + j, f"Method{j}", HRESULT_type, [], None)
+            mth.add_argument(structs[(i + j) % len(structs)], "s", ["in"], None)
+            mth.add_argument(enums[(i * j) % len(enums)], "e", ["in"], None)
+            if itfs:
+                # A back reference, which makes the head of the other
+                # interface required before this body can be generated.
+                other = itfs[(i * 7 + j) % len(itfs)]
+                mth.add_argument(PTR(PTR(other)), "ppOther", ["out"], None)
+            itf.extend_members([get_prop, mth])
+        itfs.append(itf)
+        disp = typedesc.DispInterface(f"DItem{i}", IDISPATCH, _guid(i, 2), [], None)
+        disp.add_member(
+            typedesc.DispProperty(1, "Value", PTR(IDISPATCH_type), [], None)
+        )
+        event = typedesc.DispMethod(2, 1, "OnChanged", void_type, [], None)
+        event.add_argument(enums[i % len(enums)], "e", ["in"], None)
+        disp.add_member(event)
+        coclass = typedesc.CoClass(f"Item{i}", _guid(i, 3), [], tlibattr, None)
+        coclass.add_interface(itf, 1)
+        coclass.add_interface(disp, 3)
+        items += [coclass, itf, disp]
+    return enums + structs + items
@@ -0,0 +1,274 @@
+"""Manages the modules generated into the comtypes cache directories.
+
+Unlike `comtypes.clear_cache`, which removes whole cache directories,
+this lists, prunes, invalidates and verifies single generated modules.
+
+A wrapper module and the friendly module importing it are handled as one
+cache entry; removing an entry removes both of them, their byte-compiled
+files and their manifest entry.  Next time `GetModule` is called for the
+typelib, the modules are generated again.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from comtypes.clear_cache import chdir
+
+_WRAPPER_STEM = re.compile(
+    r"^_([0-9A-F]{8}_[0-9A-F]{4}_[0-9A-F]{4}_[0-9A-F]{4}_[0-9A-F]{12})"
+    r"_(\d+)_(\d+)_(\d+)(?:_only_[0-9a-f]{12})?$",
+    re.IGNORECASE,
+)
+_WRAPPER_IMPORT = re.compile(r"^import (comtypes\.gen\.\w+) as __wrapper_module__$")
+
+
+class CacheEntry(NamedTuple):
+    gen_dir: str
+    wrapper_name: str  # 'comtypes.gen._xxxxxxxx_xxxx_xxxx_xxxx_xxxxxxxxxxxx_l_M_m'
+    friendly_names: List[str]  # 'comtypes.gen.xxx'
+    libid: str  # '{xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx}'
+    lcid: int
+    version: Tuple[int, int]
+    paths: List[str]  # source and byte-compiled files
+    size: int
+    last_used: float
+
+    def describe(self) -> str:
+        names = ", ".join(n.split(".")[-1] for n in self.friendly_names)
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.last_used))
+        major, minor = self.version
+        return (
+            f"{self.libid} {major}.{minor} lcid={self.lcid} "
+            f"{names or '-'} {self.size} bytes, last used {used}"
+        )
+
+
+def _module_files(gen_dir: str, stem: str) -> List[str]:
+    paths = [os.path.join(gen_dir, f"{stem}.py")]
+    paths += glob.glob(os.path.join(gen_dir, "__pycache__", f"{stem}.*.pyc"))
+    return [p for p in paths if os.path.isfile(p)]
+
+
+def _last_used(paths: Iterable[str]) -> float:
+    # `GetModule` updates the access time of the modules it returns from
+    # the cache, see `comtypes.client._generate._mark_used`.
+    result = 0.0
+    for p in paths:
+        st = os.stat(p)
+        result = max(result, st.st_atime, st.st_mtime)
+    return result
+
+
+def _imported_wrapper(path: str) -> Optional[str]:
+    try:
+        with open(path) as ifi:
+            for line in ifi:
+                mo = _WRAPPER_IMPORT.match(line.strip())
+                if mo:
+                    return mo.group(1)
+    except (OSError, UnicodeDecodeError):
+        pass
+    return None
+
+
+def find_entries(gen_dirs: Sequence[str]) -> List[CacheEntry]:
+    """Returns the cache entries found in `gen_dirs`."""
+    result = []
+    for gen_dir in gen_dirs:
+        if not os.path.isdir(gen_dir):
+            continue
+        stems = [
+            os.path.splitext(fname)[0]
+            for fname in os.listdir(gen_dir)
+            if fname.endswith(".py") and fname != "__init__.py"
+        ]
+        friendlies = {}
+        for stem in stems:
+            if not _WRAPPER_STEM.match(stem):
+                wrp = _imported_wrapper(os.path.join(gen_dir, f"{stem}.py"))
+                if wrp is not None:
+                    friendlies.setdefault(wrp, []).append(f"comtypes.gen.{stem}")
+        for stem in stems:
+            mo = _WRAPPER_STEM.match(stem)
+            if not mo:
+                continue
+            guid, lcid, major, minor = mo.groups()
+            wrapper_name = f"comtypes.gen.{stem}"
+            friendly_names = friendlies.get(wrapper_name, [])
+            paths = _module_files(gen_dir, stem)
+            for name in friendly_names:
+                paths += _module_files(gen_dir, name.split(".")[-1])
+            libid = "{%s}" % guid.replace("_", "-")
+            entry = CacheEntry(
+                gen_dir,
+                wrapper_name,
+                friendly_names,
+                libid.upper(),
+                int(lcid),
+                (int(major), int(minor)),
+                paths,
+                sum(os.path.getsize(p) for p in paths),
+                _last_used(paths),
+            )
+            result.append(entry)
+    return result
+
+
+def remove_entries(entries: Iterable[CacheEntry]) -> None:
+    """Removes the files and manifest entries of the cache entries."""
+    from comtypes.client import _manifest
+
+    for entry in entries:
+        for p in entry.paths:
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        _manifest.remove_modules(entry.gen_dir, [entry.wrapper_name])
+
+
+def select_lru(
+    entries: Sequence[CacheEntry],
+    max_size: Optional[int] = None,
+    max_age: Optional[float] = None,
+    now: Optional[float] = None,
+) -> List[CacheEntry]:
+    """Selects the entries to prune.
+
+    The entries not used for more than `max_age` seconds are selected, then
+    the least recently used ones until the total size of the remaining
+    entries does not exceed `max_size` bytes.
+    """
+    if now is None:
+        now = time.time()
+    selected = []
+    remaining = sorted(entries, key=lambda e: e.last_used)
+    if max_age is not None:
+        selected += [e for e in remaining if now - e.last_used > max_age]
+        remaining = [e for e in remaining if now - e.last_used <= max_age]
+    if max_size is not None:
+        total = sum(e.size for e in remaining)
+        while remaining and total > max_size:
+            entry = remaining.pop(0)
+            total -= entry.size
+            selected.append(entry)
+    return selected
+
+
+def select_libid(
+    entries: Sequence[CacheEntry], libid: str, version: Optional[str] = None
+) -> List[CacheEntry]:
+    """Selects the entries of the typelib `libid`, optionally only the ones of
+    the version `version` ('major.minor')."""
+    libid = libid.upper()
+    if not libid.startswith("{"):
+        libid = "{%s}" % libid
+    result = [e for e in entries if e.libid == libid]
+    if version is not None:
+        major, minor = (int(v) for v in version.split("."))
+        result = [e for e in result if e.version == (major, minor)]
+    return result
+
+
+def verify_entries(entries: Sequence[CacheEntry]) -> List[CacheEntry]:
+    """Returns the entries which cannot be compiled or whose typelib was
+    modified since they were generated."""
+    from comtypes.client import _manifest
+
+    broken = []
+    stale = set()
+    for gen_dir in set(e.gen_dir for e in entries):
+        stale.update(_manifest.validate_manifest(gen_dir))
+    for entry in entries:
+        if entry.wrapper_name in stale:
+            broken.append(entry)
+            continue
+        for p in entry.paths:
+            if not p.endswith(".py"):
+                continue
+            try:
+                with open(p, "rb") as ifi:
+                    compile(ifi.read(), p, "exec")
+            except (SyntaxError, ValueError) as details:
+                print(f"{p}: {details}", file=sys.stderr)
+                broken.append(entry)
+                break
+    return broken
+
+
+def _get_gen_dirs() -> List[str]:
+    # change cwd to avoid import from local folder during installation process
+    with chdir(os.path.dirname(sys.executable)):
+        try:
+            import comtypes.client
+        except ImportError:
+            print("Could not import comtypes", file=sys.stderr)
+            sys.exit(1)
+    from comtypes.client._code_cache import _ensure_list
+
+    return [os.path.abspath(p) for p in _ensure_list(comtypes.gen.__path__)]
+
+
+def _report(verb: str, entries: Sequence[CacheEntry], removed: bool) -> None:
+    for e in entries:
+        print(f"{verb} {e.wrapper_name}: {e.describe()}")
+    size = sum(e.size for e in entries)
+    print(f"{len(entries)} module(s), {size} bytes{'' if removed else ' (kept)'}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="py -m comtypes.cache",
+        description="Manages the modules in the comtypes cache folders.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List the generated modules")
+    p_prune = sub.add_parser("prune", help="Remove least recently used modules")
+    p_prune.add_argument("--max-size", type=int, help="Maximum total size in bytes")
+    p_prune.add_argument("--max-age", type=float, help="Maximum unused days")
+    p_inval = sub.add_parser("invalidate", help="Remove the modules of a typelib")
+    p_inval.add_argument("libid", help="The GUID of the typelib")
+    p_inval.add_argument("--version", help="'major.minor' version of the typelib")
+    p_verify = sub.add_parser("verify", help="Recompile the modules and check them")
+    p_verify.add_argument(
+        "--remove", action="store_true", help="Remove broken and stale modules"
+    )
+    for p in (p_prune, p_inval):
+        p.add_argument("-n", "--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    entries = find_entries(_get_gen_dirs())
+    if args.command == "list":
+        for e in sorted(entries, key=lambda e: e.last_used, reverse=True):
+            print(f"{e.wrapper_name} [{e.gen_dir}]")
+            print(f"    {e.describe()}")
+        print(f"{len(entries)} module(s), {sum(e.size for e in entries)} bytes")
+    elif args.command == "prune":
+        if args.max_size is None and args.max_age is None:
+            parser.error("prune requires --max-size and/or --max-age")
+        max_age = None if args.max_age is None else args.max_age * 86400
+        selected = select_lru(entries, args.max_size, max_age)
+        if not args.dry_run:
+            remove_entries(selected)
+        _report("Pruned", selected, not args.dry_run)
+    elif args.command == "invalidate":
+        selected = select_libid(entries, args.libid, args.version)
+        if not args.dry_run:
+            remove_entries(selected)
+        _report("Invalidated", selected, not args.dry_run)
+    elif args.command == "verify":
+        broken = verify_entries(entries)
+        if args.remove:
+            remove_entries(broken)
+        _report("Broken", broken, args.remove)
+        if broken and not args.remove:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
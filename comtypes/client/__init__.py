@@ -21,8 +21,11 @@ from comtypes import automation, CoClass, GUID, IUnknown, typeinfo
 import comtypes.client.dynamic
 from comtypes.client._constants import Constants
 from comtypes.client._events import GetEvents, ShowEvents, PumpEvents
+from comtypes.client._aio import EventStream, run_in_sta, stream_events
+from comtypes.client._sta import STAExecutor
 from comtypes.client._generate import GetModule
 from comtypes.client._code_cache import _find_gen_dir
+from comtypes.client import _marshal_cache
 
 if TYPE_CHECKING:
     from comtypes import hints  # type: ignore
@@ -33,6 +36,15 @@ import comtypes.gen
 ### for testing
 ##gen_dir = None
 
+# If `gen_dir` is `None`, the code objects of the modules generated in memory
+# are marshalled into this directory and loaded from there on later imports.
+code_cache_dir: Optional[str] = None
+_marshal_cache.install_finder()
+
+# If set, large typelibs are parsed in this many worker processes by
+# `GetModule`, see `comtypes.tools.tlbparser.parse_partitioned`.
+parse_processes: Optional[int] = None
+
 _T_IUnknown = TypeVar("_T_IUnknown", bound=IUnknown)
 logger = logging.getLogger(__name__)
 
@@ -319,5 +331,6 @@ def CoGetObject(
 __all__ = [
     "CreateObject", "GetActiveObject", "CoGetObject", "GetEvents",
     "ShowEvents", "PumpEvents", "GetModule", "GetClassObject",
+    "EventStream", "run_in_sta", "stream_events", "STAExecutor",
 ]
 # fmt: on
@@ -0,0 +1,179 @@
+"""comtypes.client._aio helper module.
+
+Bridges asyncio and COM objects living in an STA thread.
+
+The COM objects are created and called in a `_STAThread`, which also
+pumps the window messages the apartment needs, so the asyncio event loop
+never blocks in `PumpEvents` or in a message loop.  `run_in_sta` awaits
+a call made in that thread, and `EventStream` delivers the events of any
+number of COM objects connected in that thread to a coroutine with
+`async for`.
+"""
+
+import asyncio
+import collections
+import threading
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+import comtypes
+from comtypes.client._events import FindOutgoingInterface, GetEvents
+from comtypes.client._sta import _STAThread
+
+_default_sta: Optional[_STAThread] = None
+_default_sta_lock = threading.Lock()
+
+
+def get_sta_thread() -> _STAThread:
+    """Returns the STA thread used by `run_in_sta` and `EventStream` by
+    default, starting it on first use."""
+    global _default_sta
+    with _default_sta_lock:
+        if _default_sta is None or not _default_sta.is_alive():
+            _default_sta = _STAThread(name="comtypes-sta")
+            _default_sta.start()
+        return _default_sta
+
+
+async def run_in_sta(
+    func: Callable[..., Any], *args: Any, sta: Optional[_STAThread] = None
+) -> Any:
+    """Calls `func(*args)` in the STA thread `sta` (by default, the one
+    returned by `get_sta_thread()`) and returns its result.
+
+    COM objects created this way belong to the apartment of that thread,
+    so they must only be used through `run_in_sta` with the same thread.
+    Use `functools.partial` to pass keyword arguments.
+    """
+    if sta is None:
+        sta = get_sta_thread()
+    return await asyncio.wrap_future(sta.submit(func, *args))
+
+
+class Event(NamedTuple):
+    name: str
+    args: Tuple[Any, ...]
+
+
+class EventStream(object):
+    """Delivers COM events to an asyncio event loop.
+
+    The stream is used as the sink of `connect`ed COM objects; every event
+    they fire in the STA thread is queued as an `Event(name, args)` and
+    received with `async for event in stream`.  The loop is woken up once
+    per batch of events, not once per event.
+
+    With a positive `maxsize`, at most that many events are queued; the
+    oldest ones are dropped if the consumer falls behind, and counted in
+    `dropped`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        sta: Optional[_STAThread] = None,
+    ) -> None:
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._sta = sta
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._pending = collections.deque()
+        self._lock = threading.Lock()
+        self._wakeup_scheduled = False
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._connections = []
+        self._prefixes = set()
+
+    def __getattr__(self, name):
+        # Event handlers are created on demand, like in `EventDumper`.
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        for prefix in self._prefixes:
+            if name.startswith(prefix):
+                name = name[len(prefix) :]
+                break
+
+        def handler(self, this, *args):
+            self._post(Event(name, args))
+
+        return comtypes.instancemethod(handler, self, EventStream)
+
+    def _post(self, event: Event) -> None:
+        # Called in the STA thread.
+        with self._lock:
+            if self._closed:
+                return
+            if self.maxsize > 0 and len(self._pending) >= self.maxsize:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(event)
+            if self._wakeup_scheduled:
+                return
+            self._wakeup_scheduled = True
+        self._loop.call_soon_threadsafe(self._wakeup)
+
+    def _wakeup(self) -> None:
+        with self._lock:
+            self._wakeup_scheduled = False
+        self._ready.set()
+
+    def __aiter__(self) -> "EventStream":
+        return self
+
+    async def __anext__(self) -> Event:
+        while True:
+            with self._lock:
+                if self._pending:
+                    return self._pending.popleft()
+                if self._closed:
+                    raise StopAsyncIteration
+                self._ready.clear()
+            await self._ready.wait()
+
+    async def connect(self, source: Any, interface: Any = None) -> None:
+        """Receives the events of `source`, a COM object created in the STA
+        thread of the stream."""
+
+        def advise():
+            itf = interface
+            if itf is None:
+                itf = FindOutgoingInterface(source)
+            self._prefixes.add(f"{itf.__name__}_")
+            return GetEvents(source, self, itf)
+
+        self._connections.append(await run_in_sta(advise, sta=self._sta))
+
+    async def aclose(self) -> None:
+        """Disconnects from the sources; the events already queued can still
+        be received."""
+        connections, self._connections = self._connections, []
+
+        def unadvise():
+            for conn in connections:
+                conn.disconnect()
+
+        if connections:
+            await run_in_sta(unadvise, sta=self._sta)
+        self.close()
+
+    def close(self) -> None:
+        """Stops queueing events; `async for` ends when the queued events
+        have been received."""
+        with self._lock:
+            self._closed = True
+        self._ready.set()
+
+
+async def stream_events(
+    source: Any,
+    interface: Any = None,
+    maxsize: int = 0,
+    sta: Optional[_STAThread] = None,
+) -> EventStream:
+    """Returns an `EventStream` receiving the events of `source`."""
+    stream = EventStream(maxsize, sta=sta)
+    await stream.connect(source, interface)
+    return stream
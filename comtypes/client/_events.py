@@ -1,5 +1,7 @@
 import ctypes
+from operator import attrgetter
 import traceback
+from typing import Any, Callable, Dict, NamedTuple, Sequence
 import comtypes
 import comtypes.hresult
 import comtypes.automation
@@ -169,15 +171,182 @@ class _SinkMethodFinder(_MethodFinder):
                 return getattr(self.sink, mthname)
 
 
+# The VARIANT union members holding the values of the simple types.
+_VARIANT_FIELDS = {
+    comtypes.automation.VT_BOOL: "VT_BOOL",
+    comtypes.automation.VT_I1: "VT_I1",
+    comtypes.automation.VT_I2: "VT_I2",
+    comtypes.automation.VT_I4: "VT_I4",
+    comtypes.automation.VT_I8: "VT_I8",
+    comtypes.automation.VT_UI1: "VT_UI1",
+    comtypes.automation.VT_UI2: "VT_UI2",
+    comtypes.automation.VT_UI4: "VT_UI4",
+    comtypes.automation.VT_UI8: "VT_UI8",
+    comtypes.automation.VT_R4: "VT_R4",
+    comtypes.automation.VT_R8: "VT_R8",
+    comtypes.automation.VT_BSTR: "bstrVal",
+}
+
+_Decoder = Callable[[Any], Any]
+
+
+def _variant_value(var):
+    return var.value
+
+
+def _arg_decoder(argtype) -> _Decoder:
+    """Returns a function unpacking an event argument of type `argtype` from
+    its VARIANT.
+
+    For the simple types, the value is read from the union member directly
+    when the VARIANT has the declared type, instead of going through the
+    chain of type checks in `VARIANT.value`.
+    """
+    vt = comtypes.automation._ctype_to_vartype.get(argtype)
+    field = _VARIANT_FIELDS.get(vt)
+    if field is None:
+        return _variant_value
+    getter = attrgetter(f"_.{field}")
+
+    def decode(var):
+        if var.vt == vt:
+            return getter(var)
+        return var.value
+
+    return decode
+
+
+def _compile_invoke(
+    impl: Callable[..., Any], decoders: Sequence[_Decoder]
+) -> Callable[[Any, Any], Any]:
+    # Unnamed arguments are packed into the DISPPARAMS array in reverse
+    # order, see `COMObject.IDispatch_Invoke`.
+    nargs = len(decoders)
+    if nargs == 0:
+
+        def invoke(this, params):
+            return impl(this)
+
+    elif nargs == 1:
+        (d0,) = decoders
+
+        def invoke(this, params):
+            return impl(this, d0(params.rgvarg[0]))
+
+    elif nargs == 2:
+        d0, d1 = decoders
+
+        def invoke(this, params):
+            rgvarg = params.rgvarg
+            return impl(this, d0(rgvarg[1]), d1(rgvarg[0]))
+
+    elif nargs == 3:
+        d0, d1, d2 = decoders
+
+        def invoke(this, params):
+            rgvarg = params.rgvarg
+            return impl(this, d0(rgvarg[2]), d1(rgvarg[1]), d2(rgvarg[0]))
+
+    elif nargs == 4:
+        d0, d1, d2, d3 = decoders
+
+        def invoke(this, params):
+            rgvarg = params.rgvarg
+            return impl(
+                this, d0(rgvarg[3]), d1(rgvarg[2]), d2(rgvarg[1]), d3(rgvarg[0])
+            )
+
+    else:
+        indexed = tuple(zip(decoders, range(nargs - 1, -1, -1)))
+
+        def invoke(this, params):
+            rgvarg = params.rgvarg
+            return impl(this, *[d(rgvarg[i]) for d, i in indexed])
+
+    return invoke
+
+
+class _SinkEntry(NamedTuple):
+    handler: Callable[..., Any]
+    decoders: Sequence[_Decoder]
+    invoke: Callable[[Any, Any], Any]
+
+
+def _event_methods(interface):
+    # Yields (dispid, argtypes, has_outargs) of the methods of the event
+    # interface, which is either a dispinterface or a dual interface.
+    if hasattr(interface, "_disp_methods_"):
+        for m in interface._disp_methods_:
+            if m.what != "DISPMETHOD" or m.is_prop():
+                continue
+            has_outargs = m.restype is not None or any("out" in a[0] for a in m.argspec)
+            yield m.memid, [a[1] for a in m.argspec], has_outargs
+    else:
+        for m in interface._methods_:
+            restype, mthname, argtypes, paramflags, idlflags, helptext = m
+            has_outargs = any(f[0] & 2 for f in paramflags or ())
+            yield idlflags[0], argtypes, has_outargs
+
+
+def _compile_sink_table(
+    interface, dispimpl: Dict[Any, Callable[..., Any]]
+) -> Dict[int, _SinkEntry]:
+    """Builds the `dispid -> _SinkEntry` table of the event methods which
+    only have input arguments.
+
+    Events with output arguments, and calls with named arguments, are left
+    to the generic `COMObject.IDispatch_Invoke`.
+    """
+    table = {}
+    for dispid, argtypes, has_outargs in _event_methods(interface):
+        impl = dispimpl.get((dispid, comtypes.automation.DISPATCH_METHOD))
+        if impl is None or has_outargs or getattr(impl, "has_outargs", False):
+            continue
+        decoders = tuple(_arg_decoder(t) for t in argtypes)
+        table[dispid] = _SinkEntry(impl, decoders, _compile_invoke(impl, decoders))
+    return table
+
+
 def CreateEventReceiver(interface, handler):
     class Sink(comtypes.COMObject):
         _com_interfaces_ = [interface]
+        _sink_table_: Dict[int, _SinkEntry] = {}
 
         def _get_method_finder_(self, itf):
             # Use a special MethodFinder that will first try 'self',
             # then the sink.
             return _SinkMethodFinder(self, handler)
 
+        def IDispatch_Invoke(
+            self,
+            this,
+            dispIdMember,
+            riid,
+            lcid,
+            wFlags,
+            pDispParams,
+            pVarResult,
+            pExcepInfo,
+            puArgErr,
+        ):
+            if wFlags == comtypes.automation.DISPATCH_METHOD:
+                entry = self._sink_table_.get(dispIdMember)
+                if entry is not None:
+                    params = pDispParams[0]
+                    if params.cNamedArgs == 0 and params.cArgs == len(entry.decoders):
+                        return entry.invoke(this, params)
+            return super().IDispatch_Invoke(
+                this,
+                dispIdMember,
+                riid,
+                lcid,
+                wFlags,
+                pDispParams,
+                pVarResult,
+                pExcepInfo,
+                puArgErr,
+            )
+
     sink = Sink()
 
     # Since our Sink object doesn't have typeinfo, it needs a
@@ -197,6 +366,12 @@ def CreateEventReceiver(interface, handler):
             # methods - are they allowed on event interfaces?
             dispimpl[(dispid, comtypes.automation.DISPATCH_METHOD)] = impl
 
+    # Dispatch the events with positional input arguments only through a
+    # table compiled once, instead of unpacking the DISPPARAMS generically
+    # for each call.
+    if hasattr(sink, "_dispimpl_"):
+        sink._sink_table_ = _compile_sink_table(interface, sink._dispimpl_)
+
     return sink
 
 
@@ -4,13 +4,17 @@ import inspect
 import logging
 import os
 import sys
+import tempfile
+import time
 import types
-from typing import Any, Tuple, List, Mapping, Optional, Dict, Union as _UnionT
+from typing import Any, Tuple, List, Mapping, Optional, Dict, Sequence, Set
+from typing import Union as _UnionT
 import winreg
 
 from comtypes import GUID, typeinfo
 import comtypes.client
-from comtypes.tools import codegenerator, tlbparser
+from comtypes.client import _manifest, _marshal_cache
+from comtypes.tools import codegenerator, tlbparser, typedesc
 
 
 logger = logging.getLogger(__name__)
@@ -56,7 +60,9 @@ def _resolve_filename(tlib_string: str, dirpath: str) -> Tuple[str, bool]:
     return tlib_string, False
 
 
-def GetModule(tlib: _UnionT[Any, typeinfo.ITypeLib]) -> types.ModuleType:
+def GetModule(
+    tlib: _UnionT[Any, typeinfo.ITypeLib], only: Optional[Sequence[str]] = None
+) -> types.ModuleType:
     """Create a module wrapping a COM typelibrary on demand.
 
     'tlib' must be ...
@@ -97,7 +103,19 @@ def GetModule(tlib: _UnionT[Any, typeinfo.ITypeLib]) -> types.ModuleType:
     containing the Python wrapper code for the type library used by
     UIAutomation.  The former module contains all the code, the
     latter is a short stub loading the former.
+
+    If `only` is given, it is a sequence of type names (interfaces,
+    coclasses, enums, ...) of the typelib.  Then only the named types and
+    the types they depend on are generated into a separate wrapper module,
+    and no friendly module is created.  This wrapper module is named like
+    `comtypes.gen._944DE083_8FB8_45CF_BCB7_C477ACB2F897_L_M_m_only_xxxxxxxxxxxx`,
+    where the last part is derived from the names.
+
+    Example:
+        GetModule("UIAutomationCore.dll", only=["CUIAutomation"])
     """
+    if isinstance(only, str):
+        raise TypeError(f"'only' must be a sequence of type names, not {only!r}")
     if isinstance(tlib, str):
         tlib_string = tlib
         # if a relative pathname is used, we try to interpret it relative to
@@ -122,10 +140,14 @@ def GetModule(tlib: _UnionT[Any, typeinfo.ITypeLib]) -> types.ModuleType:
         pathname = None
         tlib = _load_tlib(tlib)
     logger.debug("GetModule(%s)", tlib.GetLibAttr())
-    mod = _get_existing_module(tlib)
+    if only is not None:
+        mod = _get_existing_partial_module(tlib, only)
+    else:
+        mod = _get_existing_module(tlib)
     if mod is not None:
+        _mark_used(mod)
         return mod
-    return ModuleGenerator(tlib, pathname).generate()
+    return ModuleGenerator(tlib, pathname, only).generate()
 
 
 def _load_tlib(obj: Any) -> typeinfo.ITypeLib:
@@ -190,10 +212,85 @@ def _get_existing_module(tlib: typeinfo.ITypeLib) -> Optional[types.ModuleType]:
     return None
 
 
-def _create_module(modulename: str, code: str) -> types.ModuleType:
-    """Creates the module, then imports it."""
+def _get_existing_partial_module(
+    tlib: typeinfo.ITypeLib, only: Sequence[str]
+) -> Optional[types.ModuleType]:
+    name = codegenerator.name_partial_module(tlib, only)
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        return _my_import(name)
+    except Exception as details:
+        logger.info("Could not import %s: %s", name, details)
+    return None
+
+
+def _select_items(items: Sequence[Any], only: Sequence[str]) -> List[Any]:
+    """Returns the named items, and the typelib description.
+
+    The code generator generates the types these depend on, too.
+    """
+    wanted = set(only)
+    selected = [
+        item
+        for item in items
+        if isinstance(item, typedesc.TypeLib) or getattr(item, "name", None) in wanted
+    ]
+    missing = wanted.difference(getattr(item, "name", None) for item in selected)
+    if missing:
+        raise ValueError(f"Not defined in the typelib: {', '.join(sorted(missing))}")
+    return selected
+
+
+# paths of the module files whose access time was already updated
+_marked_paths: Set[str] = set()
+
+
+def _mark_used(mod: types.ModuleType) -> None:
+    """Updates the access time of the module files, so that `comtypes.cache`
+    can prune the least recently used modules.
+
+    The modification time is kept, it is used to validate the byte-compiled
+    files.  Each file is marked at most once per process, `GetModule` is
+    called for cached modules much more often than that.
+    """
+    for m in (mod, getattr(mod, "__wrapper_module__", None)):
+        path = getattr(m, "__file__", None)
+        if not path or path in _marked_paths:
+            continue
+        _marked_paths.add(path)
+        if not os.path.isfile(path):
+            continue  # generated in memory
+        try:
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+
+
+def _umask_mode() -> int:
+    """Returns the mode `open` creates new files with, 0o666 minus the umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _create_module(
+    modulename: str, code: Optional[str], spilled: Optional[str] = None
+) -> types.ModuleType:
+    """Creates the module, then imports it.
+
+    If `code` is `None`, the code was already streamed to the temporary
+    file `spilled`, which is renamed to the module file.
+    """
     # `modulename` is 'comtypes.gen.xxx'
     stem = modulename.split(".")[-1]
+    if code is None:
+        gen_dir: str = comtypes.client.gen_dir  # type: ignore
+        # `mkstemp` creates the file readable by the owner only.
+        os.chmod(spilled, _umask_mode())  # type: ignore
+        os.replace(spilled, os.path.join(gen_dir, f"{stem}.py"))  # type: ignore
+        importlib.invalidate_caches()
+        return _my_import(modulename)
     if comtypes.client.gen_dir is None:
         # in memory system
         import comtypes.gen as g
@@ -201,7 +298,12 @@ def _create_module(modulename: str, code: str) -> types.ModuleType:
         mod = types.ModuleType(modulename)
         abs_gen_path = os.path.abspath(g.__path__[0])  # type: ignore
         mod.__file__ = os.path.join(abs_gen_path, "<memory>")
-        exec(code, mod.__dict__)
+        codeobj = compile(code, mod.__file__, "exec")
+        exec(codeobj, mod.__dict__)
+        if comtypes.client.code_cache_dir is not None:
+            _marshal_cache.store_code(
+                comtypes.client.code_cache_dir, modulename, codeobj
+            )
         sys.modules[modulename] = mod
         setattr(g, stem, mod)
         return mod
@@ -214,31 +316,76 @@ def _create_module(modulename: str, code: str) -> types.ModuleType:
 
 
 class ModuleGenerator(object):
-    def __init__(self, tlib: typeinfo.ITypeLib, pathname: Optional[str]) -> None:
-        self.wrapper_name = codegenerator.name_wrapper_module(tlib)
-        self.friendly_name = codegenerator.name_friendly_module(tlib)
+    def __init__(
+        self,
+        tlib: typeinfo.ITypeLib,
+        pathname: Optional[str],
+        only: Optional[Sequence[str]] = None,
+    ) -> None:
+        if only is None:
+            self.wrapper_name = codegenerator.name_wrapper_module(tlib)
+            self.friendly_name = codegenerator.name_friendly_module(tlib)
+        else:
+            self.wrapper_name = codegenerator.name_partial_module(tlib, only)
+            self.friendly_name = None
+        self.only = only
         if pathname is None:
             self.pathname = tlbparser.get_tlib_filename(tlib)
         else:
             self.pathname = pathname
         self.tlib = tlib
 
+    def _parse(self) -> Dict[str, Any]:
+        processes = comtypes.client.parse_processes
+        if processes is not None and self.pathname is not None:
+            return tlbparser.parse_partitioned(self.tlib, self.pathname, processes)
+        return tlbparser.TypeLibParser(self.tlib).parse()
+
     def generate(self) -> types.ModuleType:
         """Generates wrapper and friendly modules."""
         known_symbols, known_interfaces = _get_known_namespaces()
         codegen = codegenerator.CodeGenerator(known_symbols, known_interfaces)
-        codebases: List[Tuple[str, str]] = []
+        codebases: List[Tuple[str, Optional[str]]] = []
         logger.info("# Generating %s", self.wrapper_name)
-        items = list(tlbparser.TypeLibParser(self.tlib).parse().values())
-        wrp_code = codegen.generate_wrapper_code(items, filename=self.pathname)
-        codebases.append((self.wrapper_name, wrp_code))
-        if self.friendly_name is not None:
-            logger.info("# Generating %s", self.friendly_name)
-            frd_code = codegen.generate_friendly_code(self.wrapper_name)
-            codebases.append((self.friendly_name, frd_code))
-        for ext_tlib in codegen.externals:  # generates dependency COM-lib modules
-            GetModule(ext_tlib)
-        return [_create_module(name, code) for (name, code) in codebases][-1]
+        items = list(self._parse().values())
+        if self.only is not None:
+            items = _select_items(items, self.only)
+        spilled = None
+        try:
+            if comtypes.client.gen_dir is None:
+                wrp_code = codegen.generate_wrapper_code(items, filename=self.pathname)
+                codebases.append((self.wrapper_name, wrp_code))
+            else:
+                # stream the code of the wrapper module, which may be huge, to
+                # a temporary file instead of holding it in memory.
+                fd, spilled = tempfile.mkstemp(
+                    suffix=".py.tmp", dir=comtypes.client.gen_dir
+                )
+                with open(fd, "w") as ofi:
+                    codegen.write_wrapper_code(items, self.pathname, ofi)
+                    print(file=ofi)
+                codebases.append((self.wrapper_name, None))
+            if self.friendly_name is not None:
+                logger.info("# Generating %s", self.friendly_name)
+                frd_code = codegen.generate_friendly_code(self.wrapper_name)
+                codebases.append((self.friendly_name, frd_code))
+            for ext_tlib in codegen.externals:  # generates dependency COM-lib modules
+                GetModule(ext_tlib)
+            modules = [
+                _create_module(name, code, spilled) for (name, code) in codebases
+            ]
+        finally:
+            # the file is gone if it was renamed to the wrapper module
+            if spilled is not None and os.path.exists(spilled):
+                os.unlink(spilled)
+        if comtypes.client.gen_dir is not None:
+            _manifest.record_module(
+                comtypes.client.gen_dir,
+                self.wrapper_name,
+                modules[0],
+                self.friendly_name,
+            )
+        return modules[-1]
 
 
 _SymbolName = str
@@ -0,0 +1,199 @@
+"""comtypes.client._manifest helper module.
+
+Keeps a manifest of the generated modules in a `comtypes.gen` directory,
+with the path, timestamp, size and hash of the typelib each wrapper module
+was generated from.
+
+`validate_manifest()` checks all the typelibs in a single pass, stat'ing
+every typelib only once, and lets `_check_version` reuse the results
+according to the staleness policy (see
+`comtypes._tlib_version_checker.set_staleness_policy`), instead of
+stat'ing the typelib again whenever a wrapper module is imported.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import types
+
+import comtypes
+from comtypes import _tlib_version_checker
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_comtypes_manifest.json"
+
+# Seconds to wait for the manifest lock before it is considered left over
+# by a crashed process, and taken over.
+_LOCK_TIMEOUT = 10.0
+
+_ModuleName = str
+_Entry = Dict[str, Any]
+
+
+def _manifest_path(gen_dir: str) -> str:
+    return os.path.join(gen_dir, MANIFEST_NAME)
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as ifi:
+        for chunk in iter(lambda: ifi.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(gen_dir: str) -> Dict[_ModuleName, _Entry]:
+    """Returns the manifest entries of `gen_dir`, keyed by wrapper module name.
+
+    Entries recorded by another `comtypes` version are ignored.
+    """
+    try:
+        with open(_manifest_path(gen_dir)) as ifi:
+            data = json.load(ifi)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != comtypes.__version__:
+        return {}
+    return data.get("modules", {})
+
+
+@contextlib.contextmanager
+def _locked(gen_dir: str) -> Iterator[None]:
+    """Serializes the updates of the manifest of `gen_dir` across threads and
+    processes, with a lock file next to it.
+
+    Without the lock, two processes generating modules at the same time
+    would both read the manifest, and the entry of the process writing
+    first would be lost.
+    """
+    path = f"{_manifest_path(gen_dir)}.lock"
+    deadline = time.monotonic() + _LOCK_TIMEOUT
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError as details:
+            # Windows raises `PermissionError` while the lock file of
+            # another process is being deleted.
+            if not isinstance(details, FileExistsError) and not os.path.exists(path):
+                # `gen_dir` is not writable; saving will fail and log, too.
+                yield
+                return
+            if time.monotonic() < deadline:
+                time.sleep(0.01)
+                continue
+            logger.info("Taking over the manifest lock %s", path)
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            deadline = time.monotonic() + _LOCK_TIMEOUT
+            continue
+        os.close(fd)
+        break
+    try:
+        yield
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+def _save_manifest(gen_dir: str, entries: Dict[_ModuleName, _Entry]) -> None:
+    path = _manifest_path(gen_dir)
+    data = {"version": comtypes.__version__, "modules": entries}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as ofi:
+            json.dump(data, ofi, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as details:
+        logger.info("Could not write manifest %s: %s", path, details)
+
+
+def record_module(
+    gen_dir: str,
+    modulename: _ModuleName,
+    module: types.ModuleType,
+    friendly_name: Optional[_ModuleName] = None,
+) -> None:
+    """Records the typelib a generated wrapper module belongs to."""
+    tlb_path = getattr(module, "typelib_path", None)
+    entry: _Entry = {
+        "typelib_path": tlb_path,
+        "friendly_name": friendly_name,
+        "mtime": None,
+        "size": None,
+        "sha256": None,
+    }
+    if tlb_path is not None:
+        try:
+            st = os.stat(tlb_path)
+            entry["mtime"] = st.st_mtime
+            entry["size"] = st.st_size
+            entry["sha256"] = _hash_file(tlb_path)
+        except OSError:
+            pass
+    with _locked(gen_dir):
+        entries = load_manifest(gen_dir)
+        entries[modulename] = entry
+        _save_manifest(gen_dir, entries)
+
+
+def remove_modules(gen_dir: str, modulenames: Iterable[_ModuleName]) -> None:
+    """Removes the entries of the wrapper modules from the manifest."""
+    with _locked(gen_dir):
+        entries = load_manifest(gen_dir)
+        removed = [entries.pop(name) for name in modulenames if name in entries]
+        if removed:
+            _save_manifest(gen_dir, entries)
+
+
+def validate_manifest(gen_dir: Optional[str] = None, deep: bool = False) -> List[str]:
+    """Validates the typelibs of all the modules in the manifest at once.
+
+    Every typelib is stat'ed only once, no matter how many modules were
+    generated from it.  The timestamps of the unchanged typelibs are handed
+    over to `_check_version`, so with the "once", "ttl" and "never"
+    staleness policies, importing those modules does not stat them again.
+    If `deep` is true, the hash of the typelib contents is compared, too.
+
+    Returns the names of the wrapper modules whose typelib was modified.
+    """
+    if gen_dir is None:
+        import comtypes.client
+
+        gen_dir = comtypes.client.gen_dir
+        if gen_dir is None:
+            return []
+    entries = load_manifest(gen_dir)
+    by_path: Dict[str, List[_ModuleName]] = {}
+    for name, entry in entries.items():
+        if entry.get("typelib_path") is not None:
+            by_path.setdefault(entry["typelib_path"], []).append(name)
+    stale: List[_ModuleName] = []
+    for tlb_path, names in by_path.items():
+        try:
+            st = os.stat(tlb_path)
+        except OSError:
+            # `_check_version` also ignores typelibs that cannot be found.
+            continue
+        digest = None
+        for name in names:
+            entry = entries[name]
+            if (
+                entry["mtime"] is None
+                or abs(st.st_mtime - entry["mtime"]) >= 1
+                or st.st_size != entry["size"]
+            ):
+                stale.append(name)
+                continue
+            if deep:
+                if digest is None:
+                    digest = _hash_file(tlb_path)
+                if digest != entry["sha256"]:
+                    stale.append(name)
+                    continue
+            _tlib_version_checker._remember_mtime(tlb_path, st.st_mtime)
+    return stale
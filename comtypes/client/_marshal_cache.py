@@ -0,0 +1,167 @@
+"""comtypes.client._marshal_cache helper module.
+
+When `comtypes.client.gen_dir` is `None`, generated modules only live in
+memory and they would be generated and compiled again on every process
+start.  This module stores the compiled code objects of those modules as
+marshalled data in `comtypes.client.code_cache_dir`, and provides a
+meta path finder that loads them directly from there.
+
+The cached code is only reused when the magic number of the running
+interpreter and the `comtypes` version match.  The typelib identity is
+encoded in the module name, and the typelib timestamp is checked by the
+`_check_version` call at the bottom of each generated wrapper module, so
+a stale cache entry fails to import and is discarded.
+"""
+
+import compileall
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import logging
+import marshal
+import os
+import sys
+import types
+from typing import Optional, Sequence
+
+import comtypes
+
+logger = logging.getLogger(__name__)
+
+_GEN_PREFIX = "comtypes.gen."
+_SUFFIX = f".{sys.implementation.cache_tag}.ctc"
+
+
+def _get_cache_dir() -> Optional[str]:
+    """Returns the directory of the marshal cache, or `None` if the cache
+    is not in use."""
+    import comtypes.client
+
+    if comtypes.client.gen_dir is not None:
+        # modules are written to the file system, and Python's own
+        # `__pycache__` does the job.
+        return None
+    return comtypes.client.code_cache_dir
+
+
+def _cache_path(cache_dir: str, modulename: str) -> str:
+    # `modulename` is 'comtypes.gen.xxx'
+    stem = modulename.split(".")[-1]
+    return os.path.join(cache_dir, f"{stem}{_SUFFIX}")
+
+
+def store_code(cache_dir: str, modulename: str, code: types.CodeType) -> None:
+    """Marshals the code object of a generated module into `cache_dir`."""
+    path = _cache_path(cache_dir, modulename)
+    data = importlib.util.MAGIC_NUMBER + marshal.dumps((comtypes.__version__, code))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, so that a concurrently running
+        # process never sees a partially written file.
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as ofi:
+            ofi.write(data)
+        os.replace(tmp, path)
+    except OSError as details:
+        logger.info("Could not write marshal cache %s: %s", path, details)
+    else:
+        logger.debug("Stored %s in marshal cache %s", modulename, path)
+
+
+def load_code(cache_dir: str, modulename: str) -> Optional[types.CodeType]:
+    """Returns the cached code object of a generated module, or `None` if
+    there is no cached code usable by this interpreter and `comtypes`."""
+    path = _cache_path(cache_dir, modulename)
+    try:
+        with open(path, "rb") as ifi:
+            data = ifi.read()
+    except OSError:
+        return None
+    magic = importlib.util.MAGIC_NUMBER
+    if data[: len(magic)] != magic:
+        return None
+    try:
+        version, code = marshal.loads(data[len(magic) :])
+    except (EOFError, ValueError, TypeError):
+        logger.info("Broken marshal cache: %s", path)
+        return None
+    if version != comtypes.__version__:
+        return None
+    return code
+
+
+def discard_code(cache_dir: str, modulename: str) -> None:
+    """Removes the cached code object of a generated module, if any."""
+    try:
+        os.remove(_cache_path(cache_dir, modulename))
+    except OSError:
+        pass
+
+
+class _MarshalCacheLoader(importlib.abc.Loader):
+    def __init__(self, cache_dir: str, code: types.CodeType) -> None:
+        self.cache_dir = cache_dir
+        self.code = code
+
+    def create_module(self, spec):
+        return None  # use the default module creation semantics
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        import comtypes.gen as g
+
+        abs_gen_path = os.path.abspath(g.__path__[0])  # type: ignore
+        module.__file__ = os.path.join(abs_gen_path, "<memory>")
+        try:
+            exec(self.code, module.__dict__)
+        except ImportError:
+            # e.g. `_check_version` detected that the typelib was modified.
+            discard_code(self.cache_dir, module.__name__)
+            raise
+
+
+class MarshalCacheFinder(importlib.abc.MetaPathFinder):
+    """Finds the generated modules stored in the marshal cache."""
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[types.ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        if not fullname.startswith(_GEN_PREFIX):
+            return None
+        cache_dir = _get_cache_dir()
+        if cache_dir is None:
+            return None
+        code = load_code(cache_dir, fullname)
+        if code is None:
+            return None
+        loader = _MarshalCacheLoader(cache_dir, code)
+        return importlib.machinery.ModuleSpec(fullname, loader, origin="<memory>")
+
+
+def install_finder() -> None:
+    """Appends the `MarshalCacheFinder` to `sys.meta_path`, if not yet there.
+
+    It is appended, so the modules that really exist in `comtypes.gen`
+    take precedence over the cached ones.
+    """
+    if not any(isinstance(f, MarshalCacheFinder) for f in sys.meta_path):
+        sys.meta_path.append(MarshalCacheFinder())
+
+
+def compile_gen_dir(
+    gen_dir: Optional[str] = None, force: bool = False, quiet: int = 1
+) -> bool:
+    """Byte-compiles all generated modules in `gen_dir` (by default the
+    directory returned by `_find_gen_dir()`), like `compileall` does.
+
+    This is useful to prepare the generated modules of a deployment
+    beforehand, so that the first import does not need to compile them.
+    Returns `True` if all the modules were compiled successfully.
+    """
+    if gen_dir is None:
+        from comtypes.client._code_cache import _find_gen_dir
+
+        gen_dir = _find_gen_dir()
+    return bool(compileall.compile_dir(gen_dir, maxlevels=0, force=force, quiet=quiet))
@@ -0,0 +1,136 @@
+"""comtypes.client._sta helper module.
+
+Threads owning a COM single-threaded apartment (STA).
+
+The threads and the executor are the ones of `comtypes._apartment`, which
+do the waiting with a pump object; `_Win32Pump` is the real one, which
+enters the apartment and dispatches its window messages.
+"""
+
+import ctypes
+from ctypes import byref, c_void_p
+from ctypes.wintypes import BOOL, DWORD, HANDLE, LPVOID, MSG
+import functools
+from typing import Any, Callable, Optional
+
+import comtypes
+from comtypes._apartment import ApartmentExecutor, ApartmentThread, PinnedObject
+
+INFINITE = 0xFFFFFFFF
+QS_ALLINPUT = 0x04FF
+PM_REMOVE = 0x0001
+
+
+class _Win32API(object):
+    """The functions of kernel32 and user32 used by `_Win32Pump`."""
+
+    def __init__(self) -> None:
+        kernel32 = ctypes.WinDLL("kernel32")
+        user32 = ctypes.WinDLL("user32")
+
+        self.CreateEventW = kernel32.CreateEventW
+        self.CreateEventW.argtypes = [LPVOID, BOOL, BOOL, LPVOID]
+        self.CreateEventW.restype = HANDLE
+        self.SetEvent = kernel32.SetEvent
+        self.SetEvent.argtypes = [HANDLE]
+        self.CloseHandle = kernel32.CloseHandle
+        self.CloseHandle.argtypes = [HANDLE]
+
+        self.MsgWaitForMultipleObjects = user32.MsgWaitForMultipleObjects
+        self.MsgWaitForMultipleObjects.argtypes = [
+            DWORD,
+            ctypes.POINTER(HANDLE),
+            BOOL,
+            DWORD,
+            DWORD,
+        ]
+        self.MsgWaitForMultipleObjects.restype = DWORD
+        self.PeekMessageW = user32.PeekMessageW
+        self.PeekMessageW.argtypes = [
+            ctypes.POINTER(MSG),
+            c_void_p,
+            ctypes.c_uint,
+            ctypes.c_uint,
+            ctypes.c_uint,
+        ]
+        self.TranslateMessage = user32.TranslateMessage
+        self.DispatchMessageW = user32.DispatchMessageW
+
+
+@functools.lru_cache(maxsize=None)
+def _win32_api() -> _Win32API:
+    # The DLLs are loaded when the first pump is created.
+    return _Win32API()
+
+
+class _Win32Pump(object):
+    """Waits in `MsgWaitForMultipleObjects`, dispatching the window messages
+    of the thread, until `wakeup()` is called from any thread."""
+
+    def __init__(self, flags: int = comtypes.COINIT_APARTMENTTHREADED) -> None:
+        self.flags = flags
+        self._api = api = _win32_api()
+        # An auto-reset event, signalled by `wakeup`.
+        self._event = api.CreateEventW(None, False, False, None)
+        if not self._event:
+            raise ctypes.WinError()
+
+    def initialize(self) -> None:
+        comtypes.CoInitializeEx(self.flags)
+
+    def uninitialize(self) -> None:
+        comtypes.CoUninitialize()
+        self._api.CloseHandle(self._event)
+        self._event = None
+
+    def wakeup(self) -> None:
+        self._api.SetEvent(self._event)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        api = self._api
+        ms = INFINITE if timeout is None else int(timeout * 1000)
+        handles = (HANDLE * 1)(self._event)
+        api.MsgWaitForMultipleObjects(1, handles, False, ms, QS_ALLINPUT)
+        msg = MSG()
+        while api.PeekMessageW(byref(msg), None, 0, 0, PM_REMOVE):
+            api.TranslateMessage(byref(msg))
+            api.DispatchMessageW(byref(msg))
+
+
+class _STAThread(ApartmentThread):
+    """A daemon thread owning a COM apartment, by default a single-threaded
+    one pumped by a `_Win32Pump`."""
+
+    def __init__(self, pump: Any = None, name: Optional[str] = None) -> None:
+        super().__init__(pump if pump is not None else _Win32Pump(), name=name)
+
+
+class STAExecutor(ApartmentExecutor):
+    """An executor owning `max_workers` threads, each one in its own
+    single-threaded apartment with a message pump.
+
+    COM objects created with `create` are pinned to the worker that created
+    them, and calls to them are queued to that worker.  With
+    `multithreaded=True`, the workers enter the multithreaded apartment
+    instead, and the calls to the objects are load-balanced across all
+    workers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        multithreaded: bool = False,
+        pump_factory: Optional[Callable[[int], Any]] = None,
+    ) -> None:
+        if multithreaded:
+            flags = comtypes.COINIT_MULTITHREADED
+        else:
+            flags = comtypes.COINIT_APARTMENTTHREADED
+        if pump_factory is None:
+            pump_factory = _Win32Pump
+        super().__init__(
+            max_workers, functools.partial(pump_factory, flags), multithreaded
+        )
+
+
+__all__ = ["PinnedObject", "STAExecutor"]
@@ -67,6 +67,33 @@ def SetErrorInfo(errinfo):
     return _oleaut32.SetErrorInfo(0, errinfo)
 
 
+# The progids of the clsids passed to `ReportError`, or None for the clsids
+# without one.  The keys are the clsid strings, or the binary GUIDs.
+_progids = {}
+
+
+def _get_progid(clsid):
+    key = clsid if isinstance(clsid, str) else bytes(clsid)
+    try:
+        return _progids[key]
+    except KeyError:
+        pass
+    if isinstance(clsid, str):
+        clsid = GUID(clsid)
+    try:
+        progid = clsid.as_progid()
+    except OSError:
+        progid = None
+    _progids[key] = progid
+    return progid
+
+
+def clear_progid_cache():
+    """Forgets the progids looked up by `ReportError`, for example after
+    classes have been registered or unregistered."""
+    _progids.clear()
+
+
 def ReportError(
     text, iid, clsid=None, helpfile=None, helpcontext=0, hresult=DISP_E_EXCEPTION
 ):
@@ -76,16 +103,11 @@ def ReportError(
     ei.SetGUID(iid)
     if helpfile is not None:
         ei.SetHelpFile(helpfile)
-    if helpcontext is not None:
+    if helpcontext:
         ei.SetHelpContext(helpcontext)
     if clsid is not None:
-        if isinstance(clsid, str):
-            clsid = GUID(clsid)
-        try:
-            progid = clsid.as_progid()
-        except WindowsError:
-            pass
-        else:
+        progid = _get_progid(clsid)
+        if progid is not None:
             ei.SetSource(
                 progid
             )  # progid for the class or application that created the error
@@ -93,6 +115,16 @@ def ReportError(
     return hresult
 
 
+def ReportHResult(hresult):
+    """Report a COM error without error information, for expected failures
+    which are too frequent to build an `IErrorInfo` each time.  Returns the
+    passed in hresult value."""
+    # Clear the error information of the thread, so that the caller does
+    # not get the one of an earlier error.
+    _oleaut32.SetErrorInfo(0, None)
+    return hresult
+
+
 def ReportException(
     hresult, iid, clsid=None, helpfile=None, helpcontext=None, stacklevel=None
 ):
@@ -119,6 +151,7 @@ def ReportException(
 # fmt: off
 __all__ = [
     "ICreateErrorInfo", "IErrorInfo", "ISupportErrorInfo", "ReportError",
-    "ReportException", "SetErrorInfo", "GetErrorInfo", "CreateErrorInfo",
+    "ReportException", "ReportHResult", "SetErrorInfo", "GetErrorInfo",
+    "CreateErrorInfo", "clear_progid_cache",
 ]
 # fmt: on
@@ -25,6 +25,12 @@ CONNECT_E_CANNOTCONNECT = -2147220990
 CONNECT_E_ADVISELIMIT = -2147220991
 CONNECT_E_NOCONNECTION = -2147220992
 
+# structured storage error codes
+STG_E_INVALIDFUNCTION = -2147287039  # 0x80030001
+STG_E_ACCESSDENIED = -2147287035  # 0x80030005
+STG_E_INVALIDPOINTER = -2147287031  # 0x80030009
+STG_E_MEDIUMFULL = -2147286928  # 0x80030070
+
 TYPE_E_ELEMENTNOTFOUND = -2147352077  # 0x8002802BL
 
 TYPE_E_REGISTRYACCESS = -2147319780  # 0x8002801CL
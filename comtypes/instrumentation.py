@@ -0,0 +1,285 @@
+"""Tracing of COM method calls.
+
+A tracer is any object with a `record(interface, method, duration, error,
+nbytes)` method; install one with `set_tracer`.  It is called for
+
+- the methods of the interfaces (the high-level functions that
+  `ComMemberGenerator` builds, and so the properties),
+- `IDispatch.Invoke` and `IDispatch._invoke`, and with them the calls
+  made through `comtypes.client.dynamic` and `comtypes.client.lazybind`,
+- the method implementations of `COMObject` instances called by clients.
+
+Calling an interface method is calling a ctypes function pointer, there is
+no Python code on the way to wrap when tracing is off.  So the methods of
+interfaces and `COMObject` instances are only wrapped when they are created
+while instrumentation is enabled: when the `COMTYPES_INSTRUMENT` environment
+variable is set, or after `set_tracer` has been called.  A wrapped method
+checks for a tracer on each call; with `set_tracer(None)` only that check
+remains.
+
+`StatsTracer` collects call counts, errors, bytes and latency histograms per
+interface method, and exports them to a dict, JSON or the Prometheus text
+format.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from ctypes import c_int, sizeof
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+__all__ = ["DEFAULT_BUCKETS", "StatsTracer", "get_tracer", "set_tracer"]
+
+_CData = c_int.__mro__[-2]
+
+# Upper bounds of the latency histogram buckets, in seconds.
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+_clock = time.perf_counter
+_tracer: Optional[Any] = None
+_enabled = bool(os.environ.get("COMTYPES_INSTRUMENT"))
+
+
+def set_tracer(tracer: Optional[Any]) -> Optional[Any]:
+    """Install `tracer` for all COM calls, and return the previous tracer.
+    `None` stops tracing."""
+    global _tracer, _enabled
+    previous = _tracer
+    if tracer is not None:
+        _enabled = True
+    _tracer = tracer
+    return previous
+
+
+def get_tracer() -> Optional[Any]:
+    """Return the installed tracer, or `None`."""
+    return _tracer
+
+
+def enabled() -> bool:
+    """Return whether methods created now are wrapped for tracing."""
+    return _enabled
+
+
+def _nbytes(args: Iterable[Any]) -> int:
+    # An estimate of the bytes passed to a call.
+    n = 0
+    for a in args:
+        if isinstance(a, (bytes, bytearray)):
+            n += len(a)
+        elif isinstance(a, memoryview):
+            n += a.nbytes
+        elif isinstance(a, str):
+            n += 2 * len(a)  # UTF-16
+        elif isinstance(a, _CData):
+            n += sizeof(a)
+        elif isinstance(a, (int, float)):
+            n += 8
+    return n
+
+
+def trace_call(
+    tracer: Any, interface: str, method: str, func: Callable[..., Any], *args, **kw
+) -> Any:
+    """Call `func(*args, **kw)` and report it to `tracer`; raising an
+    exception is an error."""
+    start = _clock()
+    try:
+        result = func(*args, **kw)
+    except BaseException:
+        tracer.record(interface, method, _clock() - start, True, _nbytes(args))
+        raise
+    tracer.record(interface, method, _clock() - start, False, _nbytes(args))
+    return result
+
+
+def wrap_method(
+    func: Callable[..., Any], interface: str, method: str
+) -> Callable[..., Any]:
+    """Wrap a client side method `func(self, *args, **kw)` for tracing."""
+
+    def traced(self, *args, **kw):
+        tracer = _tracer
+        if tracer is None:
+            return func(self, *args, **kw)
+        return trace_call(tracer, interface, method, func, self, *args, **kw)
+
+    traced.__name__ = func.__name__
+    traced.__doc__ = func.__doc__
+    traced.__wrapped__ = func  # type: ignore
+    return traced
+
+
+def wrap_thunk(
+    thunk: Callable[..., Any], interface: str, method: str
+) -> Callable[..., Any]:
+    """Wrap a server side method implementation `thunk(this, *args)` for
+    tracing; returning a failure HRESULT is an error."""
+
+    def traced(this, *args):
+        tracer = _tracer
+        if tracer is None:
+            return thunk(this, *args)
+        start = _clock()
+        result = thunk(this, *args)
+        error = isinstance(result, int) and result < 0
+        tracer.record(interface, method, _clock() - start, error, _nbytes(args))
+        return result
+
+    traced.has_outargs = getattr(thunk, "has_outargs", False)  # type: ignore
+    traced.__wrapped__ = thunk  # type: ignore
+    return traced
+
+
+################################################################
+
+
+class _CallStats(object):
+    __slots__ = ("count", "errors", "seconds", "nbytes", "buckets")
+
+    def __init__(self, nbuckets: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.nbytes = 0
+        self.buckets = [0] * nbuckets
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+class StatsTracer(object):
+    """A tracer counting the calls, errors and bytes, and collecting a
+    latency histogram, per (interface, method).
+
+    `buckets` are the upper bounds of the histogram buckets in seconds; a
+    last bucket holds the slower calls.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._stats: Dict[Tuple[str, str], _CallStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, interface: str, method: str, duration: float, error: bool, nbytes: int
+    ) -> None:
+        index = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            stats = self._stats.get((interface, method))
+            if stats is None:
+                stats = _CallStats(len(self.buckets) + 1)
+                self._stats[(interface, method)] = stats
+            stats.count += 1
+            if error:
+                stats.errors += 1
+            stats.seconds += duration
+            stats.nbytes += nbytes
+            stats.buckets[index] += 1
+
+    def reset(self) -> None:
+        """Forget the collected statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    def _snapshot(self) -> List[Tuple[str, str, _CallStats]]:
+        with self._lock:
+            result = []
+            for (interface, method), stats in sorted(self._stats.items()):
+                copy = _CallStats(0)
+                copy.count = stats.count
+                copy.errors = stats.errors
+                copy.seconds = stats.seconds
+                copy.nbytes = stats.nbytes
+                copy.buckets = stats.buckets[:]
+                result.append((interface, method, copy))
+            return result
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return the statistics as `{interface: {method: {...}}}`.
+
+        The histogram maps the bucket bounds to the cumulative number of
+        calls taking at most that long, like the Prometheus format does.
+        """
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        bounds = [_format_bound(b) for b in self.buckets] + ["+Inf"]
+        for interface, method, stats in self._snapshot():
+            histogram = {}
+            total = 0
+            for bound, n in zip(bounds, stats.buckets):
+                total += n
+                histogram[bound] = total
+            result.setdefault(interface, {})[method] = {
+                "count": stats.count,
+                "errors": stats.errors,
+                "error_rate": stats.errors / stats.count,
+                "seconds": stats.seconds,
+                "bytes": stats.nbytes,
+                "histogram": histogram,
+            }
+        return result
+
+    def to_json(self, **kw: Any) -> str:
+        """Return `to_dict()` as JSON; `kw` are passed to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kw)
+
+    def to_prometheus(self, prefix: str = "comtypes") -> str:
+        """Return the statistics in the Prometheus text exposition format."""
+        calls: List[str] = []
+        errors: List[str] = []
+        nbytes: List[str] = []
+        durations: List[str] = []
+        bounds = [_format_bound(b) for b in self.buckets] + ["+Inf"]
+        for interface, method, stats in self._snapshot():
+            labels = f'interface="{_escape(interface)}",method="{_escape(method)}"'
+            calls.append(f"{prefix}_calls_total{{{labels}}} {stats.count}")
+            errors.append(f"{prefix}_call_errors_total{{{labels}}} {stats.errors}")
+            nbytes.append(f"{prefix}_call_bytes_total{{{labels}}} {stats.nbytes}")
+            total = 0
+            for bound, n in zip(bounds, stats.buckets):
+                total += n
+                durations.append(
+                    f'{prefix}_call_duration_seconds_bucket{{{labels},le="{bound}"}}'
+                    f" {total}"
+                )
+            durations.append(
+                f"{prefix}_call_duration_seconds_sum{{{labels}}} {stats.seconds!r}"
+            )
+            durations.append(
+                f"{prefix}_call_duration_seconds_count{{{labels}}} {stats.count}"
+            )
+        lines = [
+            f"# HELP {prefix}_calls_total Number of COM method calls.",
+            f"# TYPE {prefix}_calls_total counter",
+            *calls,
+            f"# HELP {prefix}_call_errors_total Number of failed COM method calls.",
+            f"# TYPE {prefix}_call_errors_total counter",
+            *errors,
+            f"# HELP {prefix}_call_bytes_total Estimated bytes passed to COM methods.",
+            f"# TYPE {prefix}_call_bytes_total counter",
+            *nbytes,
+            f"# HELP {prefix}_call_duration_seconds Duration of COM method calls.",
+            f"# TYPE {prefix}_call_duration_seconds histogram",
+            *durations,
+        ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,219 @@
+"""Tracking of leaked COM resources.
+
+`snapshot()` counts what is alive in the process:
+
+- the COM interface pointers, per interface.  Every non-NULL pointer owns
+  a reference that is released when the pointer is deleted,
+- the references added with `AddRef()` but not released with `Release()`,
+  per interface, while `tracking()` is active,
+- the BSTRs and SAFEARRAYs that comtypes has to free,
+- the `COMObject` instances that have references, per class.
+
+The difference of two snapshots shows what was created in between and
+not released:
+
+    before = leaks.snapshot()
+    do_something()
+    print(leaks.snapshot().diff(before))
+
+or, in a test,
+
+    with leaks.no_leaks():
+        do_something()
+
+The counts are taken by walking the objects the garbage collector knows,
+so nothing is counted on the way of COM calls; only `tracking()` wraps
+`IUnknown.AddRef` and `IUnknown.Release`.
+"""
+
+import collections
+import contextlib
+import gc
+import threading
+from ctypes import _Pointer
+from typing import Counter, Dict, Iterator
+
+from comtypes import BSTR, COMObject, IUnknown
+from comtypes._post_coinit.unknwn import _compointer_base
+
+__all__ = ["LeakError", "Snapshot", "no_leaks", "snapshot", "tracking"]
+
+
+class LeakError(AssertionError):
+    """COM resources were leaked."""
+
+    def __init__(self, leaked: "Snapshot") -> None:
+        super().__init__(f"COM resources leaked:\n{leaked}")
+        self.leaked = leaked
+
+
+class Snapshot(object):
+    """Counts of the COM resources alive at one time."""
+
+    def __init__(
+        self,
+        pointers: Dict[str, int],
+        references: Dict[str, int],
+        bstrs: int,
+        safearrays: int,
+        objects: Dict[str, int],
+    ) -> None:
+        self.pointers = pointers
+        self.references = references
+        self.bstrs = bstrs
+        self.safearrays = safearrays
+        self.objects = objects
+
+    def diff(self, earlier: "Snapshot") -> "Snapshot":
+        """Return the counts that increased since the `earlier` snapshot."""
+
+        def grown(now: Dict[str, int], then: Dict[str, int]) -> Dict[str, int]:
+            return {k: n - then.get(k, 0) for k, n in now.items() if n > then.get(k, 0)}
+
+        return Snapshot(
+            grown(self.pointers, earlier.pointers),
+            grown(self.references, earlier.references),
+            max(self.bstrs - earlier.bstrs, 0),
+            max(self.safearrays - earlier.safearrays, 0),
+            grown(self.objects, earlier.objects),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.pointers
+            or any(self.references.values())
+            or self.bstrs
+            or self.safearrays
+            or self.objects
+        )
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "pointers": dict(self.pointers),
+            "references": dict(self.references),
+            "bstrs": self.bstrs,
+            "safearrays": self.safearrays,
+            "objects": dict(self.objects),
+        }
+
+    def __str__(self) -> str:
+        lines = []
+        for name, n in sorted(self.pointers.items()):
+            lines.append(f"  {n} pointer(s) to {name}")
+        for name, n in sorted(self.references.items()):
+            if n:
+                lines.append(f"  {n} unreleased AddRef() on {name}")
+        if self.bstrs:
+            lines.append(f"  {self.bstrs} BSTR(s) to free")
+        if self.safearrays:
+            lines.append(f"  {self.safearrays} SAFEARRAY(s) to destroy")
+        for name, n in sorted(self.objects.items()):
+            lines.append(f"  {n} {name} instance(s) with references")
+        return "\n".join(lines) or "  nothing"
+
+    def __repr__(self) -> str:
+        return f"<Snapshot {self.as_dict()!r}>"
+
+
+################################################################
+# AddRef/Release counting
+
+_lock = threading.Lock()
+_tracking = 0
+_references: Counter[str] = collections.Counter()
+_AddRef = IUnknown.AddRef
+_Release = IUnknown.Release
+
+
+def _interface_name(ptr: IUnknown) -> str:
+    itf = getattr(type(ptr), "__com_interface__", type(ptr))
+    return itf.__name__
+
+
+def _counting_AddRef(self: IUnknown) -> int:
+    result = _AddRef(self)
+    with _lock:
+        _references[_interface_name(self)] += 1
+    return result
+
+
+def _counting_Release(self: IUnknown) -> int:
+    # The reference owned by the pointer itself is counted by `snapshot`
+    # as a live pointer; `__del__` releases it without calling `Release`.
+    result = _Release(self)
+    with _lock:
+        _references[_interface_name(self)] -= 1
+    return result
+
+
+def _start() -> None:
+    global _tracking
+    with _lock:
+        _tracking += 1
+        if _tracking == 1:
+            IUnknown.AddRef = _counting_AddRef  # type: ignore
+            IUnknown.Release = _counting_Release  # type: ignore
+
+
+def _stop() -> None:
+    global _tracking
+    with _lock:
+        _tracking -= 1
+        if _tracking == 0:
+            IUnknown.AddRef = _AddRef  # type: ignore
+            IUnknown.Release = _Release  # type: ignore
+            _references.clear()
+
+
+@contextlib.contextmanager
+def tracking() -> Iterator[None]:
+    """Count the `AddRef` and `Release` calls on COM pointers, per
+    interface, while the context is active.
+
+    References passed to VARIANTs or SAFEARRAYs are released when those
+    are cleared, not with `Release`, so they are counted as unreleased.
+    """
+    _start()
+    try:
+        yield
+    finally:
+        _stop()
+
+
+################################################################
+
+
+def snapshot() -> Snapshot:
+    """Collect garbage, and count the COM resources alive now."""
+    for _ in range(3):
+        gc.collect()
+    pointers: Counter[str] = collections.Counter()
+    bstrs = safearrays = 0
+    for obj in gc.get_objects():
+        if isinstance(obj, _compointer_base):
+            if obj:
+                pointers[_interface_name(obj)] += 1
+        elif isinstance(obj, BSTR):
+            if obj._needsfree:
+                bstrs += 1
+        elif isinstance(obj, _Pointer):
+            # POINTER(SAFEARRAY_...) types have a `_needsfree` attribute.
+            if getattr(obj, "_needsfree", False):
+                safearrays += 1
+    objects: Counter[str] = collections.Counter(
+        type(obj).__name__ for obj in list(COMObject._instances_)
+    )
+    with _lock:
+        references = dict(_references)
+    return Snapshot(dict(pointers), references, bstrs, safearrays, dict(objects))
+
+
+@contextlib.contextmanager
+def no_leaks() -> Iterator[None]:
+    """Raise `LeakError` if the code in the context leaks COM resources."""
+    with tracking():
+        before = snapshot()
+        yield
+        leaked = snapshot().diff(before)
+    if leaked:
+        raise LeakError(leaked)
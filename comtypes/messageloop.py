@@ -1,51 +1,291 @@
-import ctypes
-from ctypes import WinDLL, byref, WinError
-from ctypes.wintypes import MSG
-
-_user32 = WinDLL("user32")
-
-GetMessage = _user32.GetMessageA
-GetMessage.argtypes = [
-    ctypes.c_void_p,
-    ctypes.c_void_p,
-    ctypes.c_uint,
-    ctypes.c_uint,
-]
-TranslateMessage = _user32.TranslateMessage
-DispatchMessage = _user32.DispatchMessageA
-
-
-class _MessageLoop(object):
-    def __init__(self):
-        self._filters = []
-
-    def insert_filter(self, obj, index=-1):
-        self._filters.insert(index, obj)
-
-    def remove_filter(self, obj):
-        self._filters.remove(obj)
-
-    def run(self):
-        msg = MSG()
-        lpmsg = byref(msg)
-        while 1:
-            ret = GetMessage(lpmsg, 0, 0, 0)
-            if ret == -1:
-                raise WinError()
-            elif ret == 0:
-                return  # got WM_QUIT
-            if not self.filter_message(lpmsg):
-                TranslateMessage(lpmsg)
-                DispatchMessage(lpmsg)
-
-    def filter_message(self, lpmsg):
-        return any(list(filter(lpmsg)) for filter in self._filters)
-
-
-_messageloop = _MessageLoop()
-
-run = _messageloop.run
-insert_filter = _messageloop.insert_filter
-remove_filter = _messageloop.remove_filter
-
-__all__ = ["run", "insert_filter", "remove_filter"]
+"""The message loop used by comtypes servers running in an STA.
+
+Filters see the messages before they are translated and dispatched; a
+filter returning a true value consumes the message.  Filters can be
+restricted to a range of message ids, and are run by decreasing priority.
+The filters for a message id are looked up once and cached, so the
+messages nobody filters are dispatched without calling any filter.
+
+When the message queue is empty, the idle callbacks are called once,
+then the loop waits for the next message.  `run(timeout)` returns when
+`WM_QUIT` is received or the timeout expires.
+
+The loop gets its messages from a message source; `_User32MessageSource`
+is the real one, created when the loop first runs, tests can provide a
+stub with the same methods.
+"""
+
+import ctypes
+from ctypes import byref
+from ctypes.wintypes import MSG
+import functools
+import itertools
+import time
+
+WM_QUIT = 0x0012
+PM_REMOVE = 0x0001
+QS_ALLINPUT = 0x04FF
+INFINITE = 0xFFFFFFFF
+WAIT_FAILED = 0xFFFFFFFF
+
+
+class _User32(object):
+    """The functions of user32 used by the message loop."""
+
+    def __init__(self):
+        user32 = ctypes.WinDLL("user32")
+
+        self.GetMessage = user32.GetMessageW
+        self.GetMessage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_uint,
+            ctypes.c_uint,
+        ]
+        self.PeekMessage = user32.PeekMessageW
+        self.PeekMessage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_uint,
+            ctypes.c_uint,
+            ctypes.c_uint,
+        ]
+        self.MsgWaitForMultipleObjects = user32.MsgWaitForMultipleObjects
+        self.MsgWaitForMultipleObjects.argtypes = [
+            ctypes.c_ulong,
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.c_ulong,
+            ctypes.c_ulong,
+        ]
+        self.MsgWaitForMultipleObjects.restype = ctypes.c_ulong
+        self.TranslateMessage = user32.TranslateMessage
+        self.DispatchMessage = user32.DispatchMessageW
+
+
+@functools.lru_cache(maxsize=None)
+def _get_user32():
+    # user32 is loaded when the first message source is created.
+    return _User32()
+
+
+def __getattr__(name):
+    # The user32 functions used to be loaded at import time.
+    if name in (
+        "GetMessage",
+        "PeekMessage",
+        "MsgWaitForMultipleObjects",
+        "TranslateMessage",
+        "DispatchMessage",
+    ):
+        return getattr(_get_user32(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _User32MessageSource(object):
+    def __init__(self):
+        self._user32 = _get_user32()
+
+    def peek(self, lpmsg):
+        """Removes the next message from the queue into `lpmsg`; returns
+        False if there is none."""
+        return bool(self._user32.PeekMessage(lpmsg, None, 0, 0, PM_REMOVE))
+
+    def wait(self, timeout):
+        """Waits until a message arrives, or `timeout` seconds elapsed."""
+        ms = INFINITE if timeout is None else int(timeout * 1000)
+        wait = self._user32.MsgWaitForMultipleObjects
+        if wait(0, None, False, ms, QS_ALLINPUT) == WAIT_FAILED:
+            raise ctypes.WinError()
+
+    def dispatch(self, lpmsg):
+        self._user32.TranslateMessage(lpmsg)
+        self._user32.DispatchMessage(lpmsg)
+
+
+class LoopCounters(object):
+    """Counts what the message loop did."""
+
+    __slots__ = ("iterations", "messages", "filtered", "dispatched", "idle", "waits")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.iterations = 0
+        self.messages = 0
+        self.filtered = 0
+        self.dispatched = 0
+        self.idle = 0
+        self.waits = 0
+
+    def __repr__(self):
+        items = ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"<LoopCounters {items}>"
+
+
+def _legacy_filter(obj):
+    # Filters added with `insert_filter` return an iterable, which is
+    # non-empty if they consumed the message.  It is exhausted, so that
+    # generator filters run to completion.
+    def filter(lpmsg):
+        return bool(list(obj(lpmsg)))
+
+    return filter
+
+
+class _Filter(object):
+    __slots__ = ("obj", "func", "priority", "low", "high", "seq")
+
+    def __init__(self, obj, func, priority, msg_range, seq):
+        self.obj = obj
+        self.func = func
+        self.priority = priority
+        if msg_range is None:
+            self.low, self.high = 0, 0xFFFFFFFF
+        else:
+            self.low, self.high = msg_range
+        self.seq = seq
+
+
+class _MessageLoop(object):
+    def __init__(self, source=None):
+        self._source = source
+        self.counters = LoopCounters()
+        # the filters added by `insert_filter`, in list order
+        self._filters = []
+        self._ranged = []
+        self._seq = itertools.count()
+        self._cache = {}
+        self._idle = []
+
+    @property
+    def source(self):
+        # The default source is created on first use, so that importing
+        # this module does not load user32.
+        if self._source is None:
+            self._source = _User32MessageSource()
+        return self._source
+
+    def insert_filter(self, obj, index=-1):
+        self._filters.insert(index, obj)
+        self._cache.clear()
+
+    def add_filter(self, func, priority=0, msg_range=None):
+        """Adds `func(lpmsg)` as a filter of the messages whose id is in the
+        inclusive range `msg_range` (a (low, high) tuple), or of all the
+        messages.  `func` consumes the message by returning a true value.
+
+        The filters with a higher priority are called first; the ones
+        with the same priority in the order they were added.
+        """
+        entry = _Filter(func, func, priority, msg_range, next(self._seq))
+        self._ranged.append(entry)
+        self._cache.clear()
+
+    def remove_filter(self, obj):
+        for entry in self._ranged:
+            if entry.obj is obj:
+                self._ranged.remove(entry)
+                break
+        else:
+            self._filters.remove(obj)
+        self._cache.clear()
+
+    def add_idle_callback(self, func):
+        """Calls `func()` whenever the message queue becomes empty.  If it
+        returns a true value, it is called again before the loop waits."""
+        self._idle.append(func)
+
+    def remove_idle_callback(self, func):
+        self._idle.remove(func)
+
+    def _filters_for(self, message):
+        try:
+            return self._cache[message]
+        except KeyError:
+            pass
+        # The filters added by `insert_filter` have priority 0, and come
+        # before the ones added by `add_filter` with the same priority.
+        entries = [
+            _Filter(obj, _legacy_filter(obj), 0, None, -len(self._filters) + i)
+            for i, obj in enumerate(self._filters)
+        ]
+        entries += [e for e in self._ranged if e.low <= message <= e.high]
+        entries.sort(key=lambda e: (-e.priority, e.seq))
+        funcs = self._cache[message] = tuple(e.func for e in entries)
+        return funcs
+
+    def filter_message(self, lpmsg):
+        return self._filter(lpmsg._obj.message, lpmsg)
+
+    def _filter(self, message, lpmsg):
+        for func in self._filters_for(message):
+            if func(lpmsg):
+                return True
+        return False
+
+    def _run_idle(self):
+        # Returns True if a callback wants to be called again.
+        self.counters.idle += 1
+        again = False
+        for func in list(self._idle):
+            if func():
+                again = True
+        return again
+
+    def run(self, timeout=None):
+        """Runs the loop until WM_QUIT is received, or `timeout` seconds
+        elapsed.  Returns the exit code of WM_QUIT, or None on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        source = self.source
+        counters = self.counters
+        msg = MSG()
+        lpmsg = byref(msg)
+        idle = True
+        while True:
+            counters.iterations += 1
+            if source.peek(lpmsg):
+                message = msg.message
+                if message == WM_QUIT:
+                    return msg.wParam
+                counters.messages += 1
+                if self._filter(message, lpmsg):
+                    counters.filtered += 1
+                else:
+                    source.dispatch(lpmsg)
+                    counters.dispatched += 1
+                idle = True
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                continue
+            if idle and self._idle:
+                idle = self._run_idle()
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                continue
+            if deadline is None:
+                timeout = None
+            else:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    return None
+            counters.waits += 1
+            source.wait(timeout)
+
+
+_messageloop = _MessageLoop()
+
+run = _messageloop.run
+insert_filter = _messageloop.insert_filter
+add_filter = _messageloop.add_filter
+remove_filter = _messageloop.remove_filter
+add_idle_callback = _messageloop.add_idle_callback
+remove_idle_callback = _messageloop.remove_idle_callback
+
+# fmt: off
+__all__ = [
+    "run", "insert_filter", "add_filter", "remove_filter", "add_idle_callback",
+    "remove_idle_callback",
+]
+# fmt: on
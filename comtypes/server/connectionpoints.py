@@ -1,8 +1,16 @@
+import collections
 from ctypes import *
+from _ctypes import CopyComPointer
+import threading
+import comtypes
 from comtypes import IUnknown, COMObject, COMError
 from comtypes.hresult import *
 from comtypes.typeinfo import LoadRegTypeLib
-from comtypes.connectionpoints import IConnectionPoint
+from comtypes.connectionpoints import (
+    IConnectionPoint,
+    IEnumConnectionPoints,
+    IEnumConnections,
+)
 from comtypes.automation import IDispatch
 
 import logging
@@ -12,17 +20,374 @@ logger = logging.getLogger(__name__)
 __all__ = ["ConnectableObjectMixin"]
 
 
+# HRESULT_FROM_WIN32(RPC_S_SERVER_UNAVAILABLE); the client went away.
+_RPC_S_SERVER_UNAVAILABLE = -2147023174
+
+# What to do with the events for a sink whose delivery queue is full.
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+DISCONNECT = "disconnect"
+
+_DELIVERY_WORKERS = 4
+
+
+class _GlobalSinkRef(object):
+    """Makes a sink pointer usable from the delivery threads, by way of the
+    global interface table."""
+
+    def __init__(self, ptr, interface):
+        from comtypes import git
+
+        self._git = git
+        self._interface = interface
+        self._cookie = git.RegisterInterfaceInGlobal(ptr, interface)
+        self._ptr = None
+
+    def __call__(self):
+        # The delivery threads are all in the multithreaded apartment, so
+        # the pointer is unmarshalled only once.
+        if self._ptr is None:
+            self._ptr = self._git.GetInterfaceFromGlobal(self._cookie, self._interface)
+        return self._ptr
+
+    def revoke(self):
+        # Called in a delivery thread, which releases the pointer it
+        # unmarshalled.
+        cookie, self._cookie = self._cookie, None
+        self._ptr = None
+        if cookie is not None:
+            self._git.RevokeInterfaceFromGlobal(cookie)
+
+
+class _SinkQueue(object):
+    """The events waiting for delivery to a single sink.
+
+    At most `maxsize` events are queued; the `policy` decides what happens
+    to the events fired while the queue is full.  The queue is drained by
+    one thread of the `_DeliveryPool` at a time, so the sink receives the
+    events in the order they were fired.  When the queue is closed, that
+    thread also revokes the sink.
+    """
+
+    def __init__(self, key, sink_ref, maxsize, policy, on_error):
+        self.key = key
+        self.sink_ref = sink_ref
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._on_error = on_error
+        self._calls = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def put(self, calls):
+        """Queues the calls; returns True if the queue must be scheduled."""
+        with self._lock:
+            if self.closed:
+                return False
+            for call in calls:
+                if len(self._calls) >= self.maxsize:
+                    if self.policy == DROP_NEWEST:
+                        self.dropped += 1
+                        continue
+                    elif self.policy == DROP_OLDEST:
+                        self._calls.popleft()
+                        self.dropped += 1
+                    else:
+                        self.dropped += len(self._calls)
+                        self._calls.clear()
+                        self.closed = True
+                        return False
+                self._calls.append(call)
+            if self._scheduled or not self._calls:
+                return False
+            self._scheduled = True
+            return True
+
+    def drain(self, limit):
+        """Delivers up to `limit` events; returns True if events are left."""
+        for _ in range(limit):
+            with self._lock:
+                if self.closed or not self._calls:
+                    break
+                call, name, args, kw = self._calls.popleft()
+            try:
+                call(self.sink_ref())
+            except COMError as details:
+                if self._on_error(self.key, details, name, args, kw):
+                    self.close()
+        with self._lock:
+            if not self.closed:
+                if self._calls:
+                    return True
+                self._scheduled = False
+                return False
+        # A closed queue stays scheduled, so it is never drained again.
+        self.sink_ref.revoke()
+        return False
+
+    def close(self):
+        """Closes the queue.  Returns True if the queue must be scheduled,
+        so that a delivery thread revokes the sink."""
+        with self._lock:
+            self.closed = True
+            self._calls.clear()
+            if self._scheduled:
+                return False
+            self._scheduled = True
+            return True
+
+
+class _DeliveryPool(object):
+    """Threads in the multithreaded apartment, draining the `_SinkQueue`s
+    which have events waiting."""
+
+    def __init__(self, workers=_DELIVERY_WORKERS, batch=64):
+        self.batch = batch
+        self._ready = collections.deque()
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"comtypes-cp-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def schedule(self, queue):
+        with self._cond:
+            self._ready.append(queue)
+            self._cond.notify()
+
+    def _run(self):
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        try:
+            while True:
+                with self._cond:
+                    while not self._ready:
+                        self._cond.wait()
+                    queue = self._ready.popleft()
+                try:
+                    more = queue.drain(self.batch)
+                except Exception:
+                    logger.exception("Delivering events to sink %s", queue.key)
+                    queue.close()
+                    queue.sink_ref.revoke()
+                    more = False
+                if more:
+                    # Go to the end of the line, so that a sink with a
+                    # long backlog does not delay the other sinks.
+                    self.schedule(queue)
+        finally:
+            comtypes.CoUninitialize()
+
+
+_delivery_pool = None
+_delivery_pool_lock = threading.Lock()
+
+
+def _get_delivery_pool():
+    global _delivery_pool
+    with _delivery_pool_lock:
+        if _delivery_pool is None:
+            _delivery_pool = _DeliveryPool()
+        return _delivery_pool
+
+
+class _SubscriberRegistry(object):
+    """The sinks connected to a connection point, keyed by cookie.
+
+    A cookie is the index of a slot, tagged with a serial number so that a
+    stale cookie does not match the next sink stored in the same slot.
+    Free slots are reused, and trailing free slots are dropped when more
+    than half of the slots are free.
+
+    Firing events iterates `snapshot()`, a tuple of (cookie, sink) pairs
+    which is only rebuilt after sinks were added or removed; `add` and
+    `pop` do not wait for events being fired.
+    """
+
+    _INDEX_BITS = 20
+    _INDEX_MASK = (1 << _INDEX_BITS) - 1
+    _SERIAL_MASK = (1 << (32 - _INDEX_BITS)) - 1
+
+    def __init__(self):
+        self._slots = []  # [cookie, sink] or None
+        self._free = []
+        self._serial = 0
+        self._count = 0
+        self._snapshot = ()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, cookie):
+        return self._find(cookie) is not None
+
+    def _find(self, cookie):
+        index = (cookie & self._INDEX_MASK) - 1
+        if 0 <= index < len(self._slots):
+            slot = self._slots[index]
+            if slot is not None and slot[0] == cookie:
+                return slot
+        return None
+
+    def get(self, cookie, default=None):
+        slot = self._find(cookie)
+        return default if slot is None else slot[1]
+
+    def add(self, sink):
+        """Stores the sink, and returns its cookie."""
+        with self._lock:
+            if self._free:
+                index = self._free.pop()
+            else:
+                index = len(self._slots)
+                if index >= self._INDEX_MASK:
+                    raise MemoryError("too many connections")
+                self._slots.append(None)
+            self._serial = (self._serial + 1) & self._SERIAL_MASK
+            cookie = (self._serial << self._INDEX_BITS) | (index + 1)
+            self._slots[index] = [cookie, sink]
+            self._count += 1
+            self._snapshot = None
+        return cookie
+
+    def pop(self, cookie, default=None):
+        """Removes the sink of the cookie, and returns it."""
+        with self._lock:
+            slot = self._find(cookie)
+            if slot is None:
+                return default
+            index = (cookie & self._INDEX_MASK) - 1
+            self._slots[index] = None
+            self._free.append(index)
+            self._count -= 1
+            self._snapshot = None
+            if len(self._free) * 2 > len(self._slots):
+                self._compact()
+        return slot[1]
+
+    def _compact(self):
+        slots = self._slots
+        while slots and slots[-1] is None:
+            slots.pop()
+        # Reuse the lowest free slots first, keeping the table short.
+        self._free = sorted((i for i in self._free if i < len(slots)), reverse=True)
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = tuple(
+                        (slot[0], slot[1]) for slot in self._slots if slot is not None
+                    )
+        return snapshot
+
+    def items(self):
+        return self.snapshot()
+
+    def values(self):
+        return [sink for _, sink in self.snapshot()]
+
+
+class _SnapshotEnumerator(COMObject):
+    """Base class of the enumerators over a fixed sequence of items; later
+    changes to the connections do not affect them."""
+
+    def __init__(self, items, pos=0):
+        self._items = items
+        self._pos = pos
+        super(_SnapshotEnumerator, self).__init__()
+
+    def _store(self, item, rgelt, index):
+        raise NotImplementedError
+
+    def Next(self, this, celt, rgelt, pceltFetched):
+        if not rgelt:
+            return E_POINTER
+        items = self._items[self._pos : self._pos + celt]
+        for index, item in enumerate(items):
+            self._store(item, rgelt, index)
+        self._pos += len(items)
+        if pceltFetched:
+            pceltFetched[0] = len(items)
+        if len(items) == celt:
+            return S_OK
+        return S_FALSE
+
+    def Skip(self, this, celt):
+        self._pos += celt
+        if self._pos > len(self._items):
+            self._pos = len(self._items)
+            return S_FALSE
+        return S_OK
+
+    def Reset(self, this):
+        self._pos = 0
+        return S_OK
+
+    def Clone(self, this, ppEnum):
+        if not ppEnum:
+            return E_POINTER
+        clone = type(self)(self._items, self._pos)
+        iid = self._com_interfaces_[0]._iid_
+        return clone.IUnknown_QueryInterface(None, pointer(iid), ppEnum)
+
+
+def _copy_com_pointer(ptr, array, index):
+    # Stores an AddRef'd copy of the COM pointer into 'array[index]', without
+    # creating a Python COM pointer for the slot, which would Release it.
+    addr = cast(array, c_void_p).value + index * sizeof(c_void_p)
+    CopyComPointer(ptr, byref(c_void_p.from_address(addr)))
+
+
+class _EnumConnections(_SnapshotEnumerator):
+    _com_interfaces_ = [IEnumConnections]
+
+    def _store(self, item, rgelt, index):
+        cookie, ptr = item
+        # 'pUnk' is the first field of CONNECTDATA.
+        CopyComPointer(ptr, byref(rgelt[index]))
+        rgelt[index].dwCookie = cookie
+
+
+class _EnumConnectionPoints(_SnapshotEnumerator):
+    _com_interfaces_ = [IEnumConnectionPoints]
+
+    def _store(self, item, rgelt, index):
+        _copy_com_pointer(item, rgelt, index)
+
+
 class ConnectionPointImpl(COMObject):
-    """This object implements a connectionpoint"""
+    """This object implements a connectionpoint
+
+    By default, events are delivered to all the sinks in turn, in the
+    thread firing them.  If `queue_size` is given, every sink gets a queue
+    holding up to that many events instead, drained by worker threads, so
+    that a slow sink does not hold up the others; `drop_policy` decides
+    what happens to the events fired for a sink whose queue is full.
+    """
 
     _com_interfaces_ = [IConnectionPoint]
 
-    def __init__(self, sink_interface, sink_typeinfo):
+    def __init__(
+        self, sink_interface, sink_typeinfo, queue_size=None, drop_policy=DROP_OLDEST
+    ):
         super(ConnectionPointImpl, self).__init__()
-        self._connections = {}
-        self._cookie = 0
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST, DISCONNECT):
+            raise ValueError(f"Unknown drop policy {drop_policy!r}")
+        self._connections = _SubscriberRegistry()
         self._sink_interface = sink_interface
         self._typeinfo = sink_typeinfo
+        self._dispids = {}
+        self._queue_size = queue_size
+        self._drop_policy = drop_policy
+        self._queues = {}
+        self._queues_lock = threading.Lock()
 
     # per MSDN, all interface methods *must* be implemented, E_NOTIMPL
     # is no allowed return value
@@ -35,16 +400,25 @@ class ConnectionPointImpl(COMObject):
             ptr = pUnk.QueryInterface(self._sink_interface)
         except COMError:
             return CONNECT_E_CANNOTCONNECT
-        pdwCookie[0] = self._cookie = self._cookie + 1
-        self._connections[self._cookie] = ptr
+        cookie = self._connections.add(ptr)
+        if self._queue_size is not None:
+            queue = _SinkQueue(
+                cookie,
+                self._sink_ref(ptr),
+                self._queue_size,
+                self._drop_policy,
+                self._sink_failed,
+            )
+            with self._queues_lock:
+                self._queues[cookie] = queue
+        pdwCookie[0] = cookie
         return S_OK
 
     def IConnectionPoint_Unadvise(self, this, dwCookie):
         logger.debug("Unadvise %s", dwCookie)
-        try:
-            del self._connections[dwCookie]
-        except KeyError:
+        if self._connections.pop(dwCookie) is None:
             return CONNECT_E_NOCONNECTION
+        self._close_queue(dwCookie)
         return S_OK
 
     def IConnectionPoint_GetConnectionPointContainer(self, this, ppCPC):
@@ -53,68 +427,99 @@ class ConnectionPointImpl(COMObject):
     def IConnectionPoint_GetConnectionInterface(self, this, pIID):
         return E_NOTIMPL
 
-    def _call_sinks(self, name, *args, **kw):
-        results = []
-        logger.debug("_call_sinks(%s, %s, *%s, **%s)", self, name, args, kw)
+    def IConnectionPoint_EnumConnections(self, this, ppEnum):
+        if not ppEnum:
+            return E_POINTER
+        enum = _EnumConnections(self._connections.snapshot())
+        return enum.IUnknown_QueryInterface(
+            None, pointer(IEnumConnections._iid_), ppEnum
+        )
+
+    def _sink_ref(self, ptr):
+        return _GlobalSinkRef(ptr, self._sink_interface)
+
+    def _close_queue(self, key):
+        # Called in the threads firing events, too, and in the delivery
+        # threads when a sink failed.
+        with self._queues_lock:
+            queue = self._queues.pop(key, None)
+        if queue is not None and queue.close():
+            _get_delivery_pool().schedule(queue)
+
+    def _get_dispid(self, name):
+        try:
+            return self._dispids[name]
+        except KeyError:
+            dispid = self._dispids[name] = self._typeinfo.GetIDsOfNames(name)[0]
+            return dispid
+
+    def _make_call(self, name, args, kw):
         # Is it an IDispatch derived interface?  Then, events have to be delivered
         # via Invoke calls (even if it is a dual interface).
         if hasattr(self._sink_interface, "Invoke"):
-            # for better performance, we could cache the dispids.
-            dispid = self._typeinfo.GetIDsOfNames(name)[0]
-            for key, p in self._connections.items():
-                try:
-                    result = p.Invoke(dispid, *args, **kw)
-                except COMError as details:
-                    if details.hresult == -2147023174:
-                        logger.warning(
-                            "_call_sinks(%s, %s, *%s, **%s) failed; removing connection",
-                            self,
-                            name,
-                            args,
-                            kw,
-                            exc_info=True,
-                        )
-                        try:
-                            del self._connections[key]
-                        except KeyError:
-                            pass  # connection already gone
-                    else:
-                        logger.warning(
-                            "_call_sinks(%s, %s, *%s, **%s)",
-                            self,
-                            name,
-                            args,
-                            kw,
-                            exc_info=True,
-                        )
-                else:
-                    results.append(result)
-        else:
-            for p in self._connections.values():
+            dispid = self._get_dispid(name)
+            return lambda p: p.Invoke(dispid, *args, **kw)
+        return lambda p: getattr(p, name)(*args, **kw)
+
+    def _sink_failed(self, key, details, name, args, kw):
+        # Returns True if the connection was removed.
+        if details.hresult == _RPC_S_SERVER_UNAVAILABLE:
+            logger.warning(
+                "_call_sinks(%s, %s, *%s, **%s) failed; removing connection",
+                self,
+                name,
+                args,
+                kw,
+                exc_info=True,
+            )
+            self._connections.pop(key)  # may be gone already
+            self._close_queue(key)
+            return True
+        logger.warning(
+            "_call_sinks(%s, %s, *%s, **%s)",
+            self,
+            name,
+            args,
+            kw,
+            exc_info=True,
+        )
+        return False
+
+    def _call_sinks(self, name, *args, **kw):
+        logger.debug("_call_sinks(%s, %s, *%s, **%s)", self, name, args, kw)
+        return self._call_sinks_batch([(name, args, kw)])[0]
+
+    def _call_sinks_batch(self, events):
+        """Fires the events, a sequence of (name, args, kw) tuples.
+
+        Returns a list with the results of the sinks for each event; the
+        lists are empty if the events are queued.
+        """
+        calls = [
+            (self._make_call(name, args, kw), name, args, kw)
+            for name, args, kw in events
+        ]
+        results = [[] for _ in calls]
+        if self._queue_size is not None:
+            pool = _get_delivery_pool()
+            for key, _ in self._connections.snapshot():
+                queue = self._queues.get(key)
+                if queue is None:
+                    continue
+                if queue.put(calls):
+                    pool.schedule(queue)
+                elif queue.closed:
+                    if self._connections.pop(key, None) is not None:
+                        logger.warning("Sink %s is too slow; removing connection", key)
+                    self._close_queue(key)
+            return results
+        for key, p in self._connections.snapshot():
+            for i, (call, name, args, kw) in enumerate(calls):
                 try:
-                    result = getattr(p, name)(*args, **kw)
+                    results[i].append(call(p))
                 except COMError as details:
-                    if details.hresult == -2147023174:
-                        logger.warning(
-                            "_call_sinks(%s, %s, *%s, **%s) failed; removing connection",
-                            self,
-                            name,
-                            args,
-                            kw,
-                            exc_info=True,
-                        )
-                        del self._connections[key]
-                    else:
-                        logger.warning(
-                            "_call_sinks(%s, %s, *%s, **%s)",
-                            self,
-                            name,
-                            args,
-                            kw,
-                            exc_info=True,
-                        )
-                else:
-                    results.append(result)
+                    if self._sink_failed(key, details, name, args, kw):
+                        break
         return results
 
 
@@ -124,42 +529,50 @@ class ConnectableObjectMixin(object):
     Call Fire_Event(interface, methodname, *args, **kw) to fire an
     event.  <interface> can either be the source interface, or an
     integer index into the _outgoing_interfaces_ list.
+
+    Call Fire_Events([(methodname, args), ...], interface) to fire
+    several events at once.
     """
 
+    # If not None, the events are delivered to every sink through a queue
+    # holding at most this many events, see `ConnectionPointImpl`.
+    _sink_queue_size_ = None
+    _sink_drop_policy_ = DROP_OLDEST
+
     def __init__(self):
         super(ConnectableObjectMixin, self).__init__()
         self.__connections = {}
+        # The IConnectionPoint pointers, by IID of the outgoing interface.
+        self.__cp_pointers = {}
 
         tlib = LoadRegTypeLib(*self._reg_typelib_)
         for itf in self._outgoing_interfaces_:
             typeinfo = tlib.GetTypeInfoOfGuid(itf._iid_)
-            self.__connections[itf] = ConnectionPointImpl(itf, typeinfo)
+            conn = ConnectionPointImpl(
+                itf, typeinfo, self._sink_queue_size_, self._sink_drop_policy_
+            )
+            self.__connections[itf] = conn
+            self.__cp_pointers[itf._iid_] = conn._com_pointers_[IConnectionPoint._iid_]
 
     def IConnectionPointContainer_EnumConnectionPoints(self, this, ppEnum):
-        # according to MSDN, E_NOTIMPL is specificially disallowed
-        # because, without typeinfo, there's no way for the caller to
-        # find out.
-        return E_NOTIMPL
+        if not ppEnum:
+            return E_POINTER
+        enum = _EnumConnectionPoints(tuple(self.__cp_pointers.values()))
+        return enum.IUnknown_QueryInterface(
+            None, pointer(IEnumConnectionPoints._iid_), ppEnum
+        )
 
     def IConnectionPointContainer_FindConnectionPoint(self, this, refiid, ppcp):
         iid = refiid[0]
         logger.debug("FindConnectionPoint %s", iid)
         if not ppcp:
             return E_POINTER
-        for itf in self._outgoing_interfaces_:
-            if itf._iid_ == iid:
-                # 'byref' will not work in this case, since the QueryInterface
-                # method implementation is called on Python directly. There's
-                # no C layer between which will convert the second parameter
-                # from byref() to pointer().
-                conn = self.__connections[itf]
-                result = conn.IUnknown_QueryInterface(
-                    None, pointer(IConnectionPoint._iid_), ppcp
-                )
-                logger.debug("connectionpoint found, QI() -> %s", result)
-                return result
-        logger.debug("No connectionpoint found")
-        return CONNECT_E_NOCONNECTION
+        ptr = self.__cp_pointers.get(iid)
+        if ptr is None:
+            logger.debug("No connectionpoint found")
+            return CONNECT_E_NOCONNECTION
+        # CopyComPointer(src, dst) calls AddRef!
+        return CopyComPointer(ptr, ppcp)
 
     def Fire_Event(self, itf, name, *args, **kw):
         # Fire event 'name' with arguments *args and **kw.
@@ -169,3 +582,13 @@ class ConnectableObjectMixin(object):
         if isinstance(itf, int):
             itf = self._outgoing_interfaces_[itf]
         return self.__connections[itf]._call_sinks(name, *args, **kw)
+
+    def Fire_Events(self, events, itf=0):
+        # Fire the events, a sequence of (name, args) or (name, args, kw)
+        # tuples, on the sinks of interface 'itf' (by default, the first
+        # outgoing interface).  Returns a list of results for each event.
+        logger.debug("Fire_Events(%s, %s)", itf, events)
+        if isinstance(itf, int):
+            itf = self._outgoing_interfaces_[itf]
+        events = [(e[0], tuple(e[1]), e[2] if len(e) > 2 else {}) for e in events]
+        return self.__connections[itf]._call_sinks_batch(events)
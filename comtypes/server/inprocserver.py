@@ -1,8 +1,9 @@
 import ctypes
 import logging
 import sys
+import threading
 import winreg
-from typing import Any, Literal, Optional, Type
+from typing import Any, Dict, Literal, Optional, Tuple, Type
 
 from comtypes import GUID, COMObject, IUnknown, hresult
 from comtypes.server import IClassFactory
@@ -29,7 +30,8 @@ class ClassFactory(COMObject):
         ppv: ctypes.c_void_p,
     ) -> int:
         _debug("ClassFactory.CreateInstance(%s)", riid[0])
-        result = self._cls().IUnknown_QueryInterface(None, riid, ppv)
+        obj = self._cls._create_instance_()
+        result = obj.IUnknown_QueryInterface(None, riid, ppv)
         _debug("CreateInstance() -> %s", result)
         return result
 
@@ -45,22 +47,61 @@ class ClassFactory(COMObject):
 _clsid_to_class = {}
 
 
+class _WinRegistry(object):
+    """Reads the registration of the python COM classes from the registry."""
+
+    def read_inproc_server(self, clsid: GUID) -> Tuple[Optional[str], str]:
+        """Returns the 'PythonPath' (or None) and 'PythonClass' values of the
+        InprocServer32 key of `clsid`."""
+        key = winreg.OpenKey(
+            winreg.HKEY_CLASSES_ROOT, f"CLSID\\{clsid}\\InprocServer32"
+        )
+        try:
+            try:
+                pathdir = winreg.QueryValueEx(key, "PythonPath")[0]
+            except OSError:
+                pathdir = None
+            pythonclass = winreg.QueryValueEx(key, "PythonClass")[0]
+        finally:
+            winreg.CloseKey(key)
+        return pathdir, pythonclass
+
+
+_registry = _WinRegistry()
+
+# The classes found by `inproc_find_class`, and their class factories.
+_resolved_classes: Dict[GUID, Type[COMObject]] = {}
+_class_factories: Dict[Type[COMObject], ClassFactory] = {}
+_class_factories_lock = threading.Lock()
+
+
+def clear_class_cache() -> None:
+    """Forgets the classes and class factories looked up so far, for example
+    after re-registering a class."""
+    _resolved_classes.clear()
+    with _class_factories_lock:
+        factories = list(_class_factories.values())
+        _class_factories.clear()
+    for factory in factories:
+        factory.IUnknown_Release(None)
+
+
 def inproc_find_class(clsid: GUID) -> Type[COMObject]:
     if _clsid_to_class:
         return _clsid_to_class[clsid]
-
-    key = winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, f"CLSID\\{clsid}\\InprocServer32")
     try:
-        pathdir = winreg.QueryValueEx(key, "PythonPath")[0]
-    except:
+        return _resolved_classes[clsid]
+    except KeyError:
+        pass
+
+    pathdir, pythonclass = _registry.read_inproc_server(clsid)
+    if pathdir is None:
         _debug("NO path to insert")
+    elif not pathdir in sys.path:
+        sys.path.insert(0, str(pathdir))
+        _debug("insert path %r", pathdir)
     else:
-        if not pathdir in sys.path:
-            sys.path.insert(0, str(pathdir))
-            _debug("insert path %r", pathdir)
-        else:
-            _debug("Already in path %r", pathdir)
-    pythonclass = winreg.QueryValueEx(key, "PythonClass")[0]
+        _debug("Already in path %r", pathdir)
     parts = pythonclass.split(".")
     modname = ".".join(parts[:-1])
     classname = parts[-1]
@@ -69,9 +110,27 @@ def inproc_find_class(clsid: GUID) -> Type[COMObject]:
     mod = sys.modules[modname]
     result = getattr(mod, classname)
     _debug("Found class %s", result)
+    _resolved_classes[clsid] = result
     return result
 
 
+def _get_class_factory(cls: Type[COMObject]) -> ClassFactory:
+    # One class factory per class is enough; creating a COMObject builds
+    # its vtables, which is too expensive to do for every object created.
+    # The cache holds a reference of its own, otherwise the final Release
+    # of the clients would finalize the factory while it is still cached.
+    try:
+        return _class_factories[cls]
+    except KeyError:
+        pass
+    with _class_factories_lock:
+        factory = _class_factories.get(cls)
+        if factory is None:
+            factory = _class_factories[cls] = ClassFactory(cls)
+            factory.IUnknown_AddRef(None)
+    return factory
+
+
 _logging_configured = False
 
 
@@ -134,7 +193,7 @@ def DllGetClassObject(rclsid: int, riid: int, ppv: int) -> int:
         if not cls:
             return hresult.CLASS_E_CLASSNOTAVAILABLE
 
-        result = ClassFactory(cls).IUnknown_QueryInterface(
+        result = _get_class_factory(cls).IUnknown_QueryInterface(
             None, ctypes.pointer(iid), ctypes.c_void_p(ppv)
         )
         _debug("DllGetClassObject() -> %s", result)
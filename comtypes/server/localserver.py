@@ -72,7 +72,7 @@ class ClassFactory(comtypes.COMObject):
         ppv: c_void_p,
     ) -> int:
         _debug("ClassFactory.CreateInstance(%s)", riid[0])
-        obj = self._cls(*self._args, **self._kw)
+        obj = self._cls._create_instance_(*self._args, **self._kw)
         result = obj.IUnknown_QueryInterface(None, riid, ppv)
         _debug("CreateInstance() -> %s", result)
         return result
@@ -1,7 +1,32 @@
-from ctypes import Array, c_ubyte, c_ulong, HRESULT, POINTER, pointer
-from typing import Tuple, TYPE_CHECKING
+import contextlib
+import io
+from ctypes import (
+    Array,
+    c_char,
+    c_char_p,
+    c_longlong,
+    c_ubyte,
+    c_ulong,
+    c_ulonglong,
+    c_wchar_p,
+    cast,
+    addressof,
+    byref,
+    memset,
+    sizeof,
+    HRESULT,
+    POINTER,
+    pointer,
+    Structure,
+)
+from ctypes.wintypes import DWORD, FILETIME
+from typing import Any, Iterator, Optional, Tuple, TYPE_CHECKING
 
-from comtypes import COMMETHOD, GUID, IUnknown
+from comtypes import COMMETHOD, GUID, COMObject, IUnknown, ReturnHRESULT, hresult
+from comtypes._membuffer import FixedSizeBufferError, ReadOnlyBufferError, SharedBuffer
+
+if TYPE_CHECKING:
+    from comtypes import hints  # type: ignore
 
 
 class ISequentialStream(IUnknown):
@@ -49,6 +74,18 @@ class ISequentialStream(IUnknown):
         # return both `out` parameters
         return pv, pcb_read.contents.value
 
+    def readinto(self, b: Any) -> int:
+        """Reads into the writable buffer `b`, without allocating a new one;
+        returns the number of bytes read.
+        """
+        mv = memoryview(b).cast("B")
+        if not len(mv):
+            return 0
+        pv = (c_ubyte * len(mv)).from_buffer(mv)
+        pcb_read = c_ulong(0)
+        self.__com_RemoteRead(pv, c_ulong(len(mv)), byref(pcb_read))  # type: ignore
+        return pcb_read.value
+
     if TYPE_CHECKING:
 
         def RemoteWrite(self, pv: "Array[c_ubyte]", cb: int) -> int:
@@ -58,6 +95,479 @@ class ISequentialStream(IUnknown):
             ...
 
 
+STREAM_SEEK_SET = 0
+STREAM_SEEK_CUR = 1
+STREAM_SEEK_END = 2
+
+STGC_DEFAULT = 0
+
+STATFLAG_DEFAULT = 0
+STATFLAG_NONAME = 1
+
+STGTY_STREAM = 2
+
+STGM_READ = 0x0
+STGM_WRITE = 0x1
+STGM_READWRITE = 0x2
+
+# The largest number of bytes passed to `Read` and `Write` at once.
+_MAX_CHUNK = 0x7FFFFFFF
+
+
+class tagSTATSTG(Structure):
+    _fields_ = [
+        # Only filled when `Stat` is called without STATFLAG_NONAME; the
+        # string must then be freed with `CoTaskMemFree`.
+        ("pwcsName", c_wchar_p),
+        ("type", DWORD),
+        ("cbSize", c_ulonglong),
+        ("mtime", FILETIME),
+        ("ctime", FILETIME),
+        ("atime", FILETIME),
+        ("grfMode", DWORD),
+        ("grfLocksSupported", DWORD),
+        ("clsid", GUID),
+        ("grfStateBits", DWORD),
+        ("reserved", DWORD),
+    ]
+
+
+STATSTG = tagSTATSTG
+
+
+class IStream(ISequentialStream):
+    """Supports reading and writing data to stream objects."""
+
+    _iid_ = GUID("{0000000C-0000-0000-C000-000000000046}")
+    _idlflags_ = []
+
+    if TYPE_CHECKING:
+
+        def RemoteSeek(self, dlibMove: int, dwOrigin: int) -> int: ...
+        def SetSize(self, libNewSize: int) -> hints.Hresult: ...
+        def RemoteCopyTo(self, pstm: "IStream", cb: int) -> Tuple[int, int]: ...
+        def Commit(self, grfCommitFlags: int) -> hints.Hresult: ...
+        def Revert(self) -> hints.Hresult: ...
+        def LockRegion(
+            self, libOffset: int, cb: int, dwLockType: int
+        ) -> hints.Hresult: ...
+        def UnlockRegion(
+            self, libOffset: int, cb: int, dwLockType: int
+        ) -> hints.Hresult: ...
+        def Stat(self, grfStatFlag: int) -> tagSTATSTG: ...
+        def Clone(self) -> "IStream": ...
+
+
+IStream._methods_ = [
+    COMMETHOD(
+        [],
+        HRESULT,
+        "RemoteSeek",
+        (["in"], c_longlong, "dlibMove"),
+        (["in"], DWORD, "dwOrigin"),
+        (["out"], POINTER(c_ulonglong), "plibNewPosition"),
+    ),
+    COMMETHOD([], HRESULT, "SetSize", (["in"], c_ulonglong, "libNewSize")),
+    COMMETHOD(
+        [],
+        HRESULT,
+        "RemoteCopyTo",
+        (["in"], POINTER(IStream), "pstm"),
+        (["in"], c_ulonglong, "cb"),
+        (["out"], POINTER(c_ulonglong), "pcbRead"),
+        (["out"], POINTER(c_ulonglong), "pcbWritten"),
+    ),
+    COMMETHOD([], HRESULT, "Commit", (["in"], DWORD, "grfCommitFlags")),
+    COMMETHOD([], HRESULT, "Revert"),
+    COMMETHOD(
+        [],
+        HRESULT,
+        "LockRegion",
+        (["in"], c_ulonglong, "libOffset"),
+        (["in"], c_ulonglong, "cb"),
+        (["in"], DWORD, "dwLockType"),
+    ),
+    COMMETHOD(
+        [],
+        HRESULT,
+        "UnlockRegion",
+        (["in"], c_ulonglong, "libOffset"),
+        (["in"], c_ulonglong, "cb"),
+        (["in"], DWORD, "dwLockType"),
+    ),
+    COMMETHOD(
+        [],
+        HRESULT,
+        "Stat",
+        (["out"], POINTER(tagSTATSTG), "pstatstg"),
+        (["in"], DWORD, "grfStatFlag"),
+    ),
+    COMMETHOD([], HRESULT, "Clone", (["out"], POINTER(POINTER(IStream)), "ppstm")),
+]
+
+
+################################################################
+# Python files on top of COM streams
+
+
+class ComStreamIO(io.RawIOBase):
+    """A raw binary file reading and writing a COM stream.
+
+    `stream` is a pointer to an `ISequentialStream` or `IStream`, for example
+    one generated from a typelib; only `IStream`s are seekable.  Data is read
+    directly into the buffers passed to `readinto`, and written directly from
+    the buffers passed to `write`; wrap the file in `io.BufferedReader` (see
+    `buffered_reader`) to read small chunks efficiently.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        super().__init__()
+        self._stream = stream
+        self._seekable = hasattr(stream, "RemoteSeek")
+
+    @property
+    def stream(self) -> Any:
+        return self._stream
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._seekable
+
+    def readinto(self, b: Any) -> int:
+        self._checkClosed()
+        mv = memoryview(b).cast("B")
+        return self._stream.readinto(mv[:_MAX_CHUNK])
+
+    def readall(self) -> bytes:
+        if not self._seekable:
+            return super().readall()
+        # Read the rest of the stream at once, into a buffer of the right size.
+        remaining = self.size() - self.tell()
+        buf = bytearray(max(remaining, 0))
+        mv = memoryview(buf)
+        pos = 0
+        while pos < len(buf):
+            n = self.readinto(mv[pos:])
+            if not n:
+                break
+            pos += n
+        mv.release()
+        del buf[pos:]
+        # The stream may have grown meanwhile.
+        rest = super().readall()
+        if rest:
+            buf += rest
+        return bytes(buf)
+
+    def write(self, b: Any) -> int:
+        self._checkClosed()
+        mv = memoryview(b).cast("B")[:_MAX_CHUNK]
+        cb = len(mv)
+        if not cb:
+            return 0
+        if not mv.readonly:
+            pv = (c_ubyte * cb).from_buffer(mv)
+        elif isinstance(b, bytes):
+            # points into the bytes object, without copying it
+            pv = cast(c_char_p(b), POINTER(c_ubyte))
+        else:
+            pv = (c_ubyte * cb).from_buffer_copy(mv)
+        return self._stream.RemoteWrite(pv, cb)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if not self._seekable:
+            raise io.UnsupportedOperation("seek")
+        # io.SEEK_SET, SEEK_CUR and SEEK_END are the STREAM_SEEK_ values.
+        return self._stream.RemoteSeek(offset, whence)
+
+    def tell(self) -> int:
+        return self.seek(0, io.SEEK_CUR)
+
+    def truncate(self, size: Optional[int] = None) -> int:
+        self._checkClosed()
+        if size is None:
+            size = self.tell()
+        self._stream.SetSize(size)
+        return size
+
+    def stat(self) -> Any:
+        """Returns the `STATSTG` structure of the stream, without its name."""
+        self._checkClosed()
+        if not self._seekable:
+            raise io.UnsupportedOperation("stat")
+        return self._stream.Stat(STATFLAG_NONAME)
+
+    def size(self) -> int:
+        """Returns the size of the stream in bytes."""
+        size = self.stat().cbSize
+        # typelibs may define ULARGE_INTEGER as a structure
+        return getattr(size, "QuadPart", size)
+
+    def flush(self) -> None:
+        super().flush()
+        if self._seekable and not self.closed:
+            self._stream.Commit(STGC_DEFAULT)
+
+
+def buffered_reader(
+    stream: Any, buffer_size: int = io.DEFAULT_BUFFER_SIZE
+) -> io.BufferedReader:
+    """Returns a buffered binary file reading the COM `stream`."""
+    return io.BufferedReader(ComStreamIO(stream), buffer_size)
+
+
+################################################################
+# COM streams on top of Python files and buffers
+
+
+class _StreamObject(COMObject):
+    """Base class of the `IStream` COM objects implemented in Python.
+
+    The object keeps its own seek pointer; subclasses implement the data
+    transfer in `_read` and `_write`, which copy directly between the
+    storage and the caller's memory, and the other primitives below.
+    """
+
+    _com_interfaces_ = [IStream]
+
+    def __init__(self, pos: int = 0) -> None:
+        super().__init__()
+        self._pos = pos
+
+    def _read(self, address: int, cb: int) -> int:
+        """Copies up to `cb` bytes at the seek pointer to `address`, and
+        returns their number."""
+        raise NotImplementedError
+
+    def _write(self, address: int, cb: int) -> int:
+        """Copies `cb` bytes from `address` to the seek pointer, and returns
+        their number."""
+        raise NotImplementedError
+
+    def _size(self) -> int:
+        raise NotImplementedError
+
+    def _set_size(self, size: int) -> None:
+        raise NotImplementedError
+
+    def _mode(self) -> int:
+        return STGM_READWRITE
+
+    def _flush(self) -> None:
+        pass
+
+    def _clone(self) -> "_StreamObject":
+        raise NotImplementedError
+
+    def ISequentialStream_RemoteRead(self, this: Any, pv: Any, cb: int, pcbRead: Any):
+        if not pv:
+            return hresult.STG_E_INVALIDPOINTER
+        done = self._read(addressof(pv.contents), cb) if cb else 0
+        self._pos += done
+        if pcbRead:
+            pcbRead[0] = done
+        return hresult.S_OK if done == cb else hresult.S_FALSE
+
+    def ISequentialStream_RemoteWrite(
+        self, this: Any, pv: Any, cb: int, pcbWritten: Any
+    ):
+        if not pv:
+            return hresult.STG_E_INVALIDPOINTER
+        done = self._write(addressof(pv.contents), cb) if cb else 0
+        self._pos += done
+        if pcbWritten:
+            pcbWritten[0] = done
+        return hresult.S_OK
+
+    def IStream_RemoteSeek(
+        self, this: Any, dlibMove: int, dwOrigin: int, plibNewPosition: Any
+    ):
+        if dwOrigin == STREAM_SEEK_SET:
+            pos = dlibMove
+        elif dwOrigin == STREAM_SEEK_CUR:
+            pos = self._pos + dlibMove
+        elif dwOrigin == STREAM_SEEK_END:
+            pos = self._size() + dlibMove
+        else:
+            return hresult.STG_E_INVALIDFUNCTION
+        if pos < 0:
+            return hresult.STG_E_INVALIDFUNCTION
+        self._pos = pos
+        if plibNewPosition:
+            plibNewPosition[0] = pos
+        return hresult.S_OK
+
+    def IStream_SetSize(self, this: Any, libNewSize: int):
+        self._set_size(libNewSize)
+        return hresult.S_OK
+
+    def IStream_RemoteCopyTo(
+        self, this: Any, pstm: Any, cb: int, pcbRead: Any, pcbWritten: Any
+    ):
+        buf = (c_ubyte * min(cb, 0x100000))()
+        read = written = 0
+        while read < cb:
+            n = self._read(addressof(buf), min(len(buf), cb - read))
+            if not n:
+                break
+            self._pos += n
+            read += n
+            written += pstm.RemoteWrite(buf, n)
+        if pcbRead:
+            pcbRead[0] = read
+        if pcbWritten:
+            pcbWritten[0] = written
+        return hresult.S_OK
+
+    def IStream_Commit(self, this: Any, grfCommitFlags: int):
+        self._flush()
+        return hresult.S_OK
+
+    def IStream_Revert(self, this: Any):
+        # not transacted, nothing to revert
+        return hresult.S_OK
+
+    def IStream_LockRegion(self, this: Any, libOffset: int, cb: int, dwLockType: int):
+        return hresult.STG_E_INVALIDFUNCTION
+
+    def IStream_UnlockRegion(self, this: Any, libOffset: int, cb: int, dwLockType: int):
+        return hresult.STG_E_INVALIDFUNCTION
+
+    def IStream_Stat(self, this: Any, pstatstg: Any, grfStatFlag: int):
+        if not pstatstg:
+            return hresult.STG_E_INVALIDPOINTER
+        # The name is never returned, as if STATFLAG_NONAME was passed.
+        stat = pstatstg[0]
+        memset(addressof(stat), 0, sizeof(stat))
+        stat.type = STGTY_STREAM
+        stat.cbSize = self._size()
+        stat.grfMode = self._mode()
+        return hresult.S_OK
+
+    def IStream_Clone(self, this: Any, ppstm: Any):
+        if not ppstm:
+            return hresult.STG_E_INVALIDPOINTER
+        clone = self._clone()
+        return clone.IUnknown_QueryInterface(None, pointer(IStream._iid_), ppstm)
+
+
+class FileStream(_StreamObject):
+    """An `IStream` COM object reading and writing a seekable binary Python
+    file object.
+
+    `Read` and `Write` transfer the data directly between the file and the
+    buffer of the caller.  Clones share the file, each with its own seek
+    pointer.
+    """
+
+    def __init__(self, file: Any, pos: int = 0) -> None:
+        super().__init__(pos)
+        self._file = file
+
+    def _read(self, address: int, cb: int) -> int:
+        mv = memoryview((c_char * cb).from_address(address))
+        self._file.seek(self._pos)
+        done = 0
+        while done < cb:
+            n = self._file.readinto(mv[done:])
+            if not n:
+                break
+            done += n
+        return done
+
+    def _write(self, address: int, cb: int) -> int:
+        mv = memoryview((c_char * cb).from_address(address))
+        self._file.seek(self._pos)
+        done = 0
+        while done < cb:
+            done += self._file.write(mv[done:])
+        return done
+
+    def _size(self) -> int:
+        return self._file.seek(0, io.SEEK_END)
+
+    def _set_size(self, size: int) -> None:
+        self._file.truncate(size)
+
+    def _mode(self) -> int:
+        if not self._file.writable():
+            return STGM_READ
+        if not self._file.readable():
+            return STGM_WRITE
+        return STGM_READWRITE
+
+    def _flush(self) -> None:
+        self._file.flush()
+
+    def _clone(self) -> "FileStream":
+        return type(self)(self._file, self._pos)
+
+
+@contextlib.contextmanager
+def _buffer_errors() -> Iterator[None]:
+    # Translates the errors of the `SharedBuffer` of a `MappedStream`.
+    try:
+        yield
+    except ReadOnlyBufferError as exc:
+        raise ReturnHRESULT(hresult.STG_E_ACCESSDENIED, str(exc)) from None
+    except FixedSizeBufferError as exc:
+        raise ReturnHRESULT(hresult.STG_E_MEDIUMFULL, str(exc)) from None
+
+
+class MappedStream(_StreamObject):
+    """An `IStream` COM object on top of memory, typically an `mmap.mmap`.
+
+    `Read` and `Write` copy the data directly between the memory and the
+    buffer of the caller, without going through a file object or an
+    HGLOBAL.  Writing past the end, and `SetSize`, resize the memory if it
+    is a `bytearray` or an `mmap`.  Clones share the memory, each with its
+    own seek pointer.
+    """
+
+    def __init__(self, buffer: Any, pos: int = 0) -> None:
+        super().__init__(pos)
+        if isinstance(buffer, SharedBuffer):
+            self._buffer = buffer
+        else:
+            self._buffer = SharedBuffer(buffer)
+
+    @property
+    def buffer(self) -> Any:
+        return self._buffer.buffer
+
+    def _read(self, address: int, cb: int) -> int:
+        return self._buffer.read(self._pos, address, cb)
+
+    def _write(self, address: int, cb: int) -> int:
+        with _buffer_errors():
+            return self._buffer.write(self._pos, address, cb)
+
+    def _size(self) -> int:
+        return self._buffer.size()
+
+    def _set_size(self, size: int) -> None:
+        with _buffer_errors():
+            self._buffer.set_size(size)
+
+    def _mode(self) -> int:
+        return STGM_READ if self._buffer.readonly else STGM_READWRITE
+
+    def _flush(self) -> None:
+        flush = getattr(self._buffer.buffer, "flush", None)
+        if flush is not None:
+            # writes a file-backed mmap to disk
+            flush()
+
+    def _clone(self) -> "MappedStream":
+        return type(self)(self._buffer, self._pos)
+
+
 # fmt: off
 __known_symbols__ = [
     'ISequentialStream',
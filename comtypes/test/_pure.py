@@ -0,0 +1,44 @@
+"""Makes the modules of comtypes that do not use COM importable where the
+`comtypes` package itself cannot be imported, for example on Linux.
+
+The tests of those modules start with
+
+    try:
+        import comtypes  # noqa
+    except ImportError:
+        import _pure  # noqa
+
+which puts a placeholder `comtypes` package into `sys.modules`; its
+submodules are found as usual, but its `__init__` is not run.  The tests
+are then run from this directory:
+
+    cd comtypes/test
+    python -m unittest test_apartment test_objpool ...
+"""
+
+import os
+import re
+import sys
+import types
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _read_version() -> str:
+    # `comtypes.__version__`, which the code generator writes into the
+    # wrapper modules.
+    with open(os.path.join(_PACKAGE_DIR, "__init__.py")) as f:
+        match = re.search(r'^__version__ = "(.*)"$', f.read(), re.MULTILINE)
+    return match.group(1) if match else "0"
+
+
+def install() -> None:
+    if "comtypes" in sys.modules:
+        return
+    package = types.ModuleType("comtypes")
+    package.__path__ = [_PACKAGE_DIR]
+    package.__version__ = _read_version()
+    sys.modules["comtypes"] = package
+
+
+install()
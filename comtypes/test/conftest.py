@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.fixture
+def com_leaks():
+    """Fail the test if it leaks COM pointers, references, BSTRs, SAFEARRAYs
+    or `COMObject` instances; see `comtypes.leaks`."""
+    # Imported here, the tests of the modules which do not use COM are run
+    # where `comtypes` cannot be imported, too.
+    from comtypes import leaks
+
+    try:
+        with leaks.no_leaks():
+            yield
+    except leaks.LeakError as exc:
+        pytest.fail(str(exc), pytrace=False)
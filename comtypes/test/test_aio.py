@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import unittest as ut
+
+from comtypes.client import _aio
+from comtypes.client._sta import _STAThread
+from comtypes.test.test_apartment import FakePump
+
+
+class Test_EventStream(ut.TestCase):
+    def setUp(self):
+        self.sta = _STAThread(FakePump())
+        self.sta.start()
+        self.addCleanup(self.sta.shutdown)
+
+    def run_async(self, coro):
+        return asyncio.run(asyncio.wait_for(coro, 10))
+
+    def test_run_in_sta(self):
+        async def main():
+            return await _aio.run_in_sta(threading.get_ident, sta=self.sta)
+
+        self.assertEqual(self.run_async(main()), self.sta.ident)
+
+    def test_events(self):
+        async def main():
+            stream = _aio.EventStream(sta=self.sta)
+            stream._prefixes.add("IFeedEvents_")
+
+            def fire():
+                # what the sink of a connected COM object does
+                for i in range(1000):
+                    stream.IFeedEvents_Tick(None, "SPAM", i)
+                stream.Reset(None)
+
+            await _aio.run_in_sta(fire, sta=self.sta)
+            stream.close()
+            return [event async for event in stream]
+
+        events = self.run_async(main())
+        self.assertEqual(len(events), 1001)
+        self.assertEqual(events[0], _aio.Event("Tick", ("SPAM", 0)))
+        self.assertEqual(events[-1], _aio.Event("Reset", ()))
+
+    def test_batched_wakeups(self):
+        async def main():
+            stream = _aio.EventStream(sta=self.sta)
+            loop = asyncio.get_running_loop()
+            calls = []
+            orig = loop.call_soon_threadsafe
+
+            def call_soon_threadsafe(*args):
+                calls.append(args)
+                return orig(*args)
+
+            loop.call_soon_threadsafe = call_soon_threadsafe
+            # the loop cannot run the wakeup before `fire` returns
+            fut = self.sta.submit(lambda: [stream.Tick(None, i) for i in range(100)])
+            fut.result(5)
+            received = []
+            async for event in stream:
+                received.append(event)
+                if len(received) == 100:
+                    break
+            return len(calls)
+
+        self.assertEqual(self.run_async(main()), 1)
+
+    def test_maxsize(self):
+        async def main():
+            stream = _aio.EventStream(maxsize=10, sta=self.sta)
+            await _aio.run_in_sta(
+                lambda: [stream.Tick(None, i) for i in range(25)], sta=self.sta
+            )
+            stream.close()
+            return stream, [event.args[0] async for event in stream]
+
+        stream, received = self.run_async(main())
+        self.assertEqual(received, list(range(15, 25)))
+        self.assertEqual(stream.dropped, 15)
+
+    def test_close_ends_waiting_consumer(self):
+        async def main():
+            stream = _aio.EventStream(sta=self.sta)
+
+            async def consume():
+                return [event async for event in stream]
+
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0)
+            stream.close()
+            return await task
+
+        self.assertEqual(self.run_async(main()), [])
+
+
+if __name__ == "__main__":
+    ut.main()
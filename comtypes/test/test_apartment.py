@@ -0,0 +1,173 @@
+import gc
+import threading
+import unittest as ut
+
+try:
+    import comtypes  # noqa
+except ImportError:
+    import _pure  # noqa
+from comtypes._apartment import ApartmentExecutor, ApartmentThread, PinnedObject
+
+
+class FakePump(object):
+    """Stands in for `_Win32Pump`; there are no window messages to dispatch."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.initialized = self.uninitialized = False
+
+    def initialize(self):
+        self.initialized = True
+
+    def uninitialize(self):
+        self.uninitialized = True
+
+    def wakeup(self):
+        self._event.set()
+
+    def wait(self, timeout=None):
+        self._event.wait(timeout)
+        self._event.clear()
+
+
+class Test_ApartmentThread(ut.TestCase):
+    def setUp(self):
+        self.pump = FakePump()
+        self.sta = ApartmentThread(self.pump)
+        self.sta.start()
+        self.addCleanup(self.sta.shutdown)
+
+    def test_submit(self):
+        fut = self.sta.submit(threading.get_ident)
+        self.assertEqual(fut.result(5), self.sta.ident)
+        self.assertTrue(self.pump.initialized)
+
+    def test_exception(self):
+        fut = self.sta.submit(int, "spam")
+        self.assertRaises(ValueError, fut.result, 5)
+
+    def test_shutdown(self):
+        results = []
+        futs = [self.sta.submit(results.append, i) for i in range(100)]
+        self.sta.shutdown()
+        self.assertEqual(results, list(range(100)))
+        self.assertTrue(all(f.done() for f in futs))
+        self.assertTrue(self.pump.uninitialized)
+        self.assertRaises(RuntimeError, self.sta.submit, print)
+
+    def test_submit_racing_shutdown(self):
+        futs = []
+
+        def submit():
+            try:
+                while True:
+                    futs.append(self.sta.submit(int))
+            except RuntimeError:
+                pass
+
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for t in threads:
+            t.start()
+        self.sta.shutdown()
+        for t in threads:
+            t.join()
+        # every call accepted before the shutdown was run
+        self.assertTrue(all(f.done() for f in futs))
+        self.assertTrue(all(f.result() == 0 for f in futs))
+
+    def test_submit_after_thread_died(self):
+        pump = FakePump()
+        pump.initialize = lambda: 1 / 0
+        sta = ApartmentThread(pump)
+        sta.run = self._quiet(sta.run)
+        sta.start()
+        sta.join()
+        # no call can be queued to a thread which does not run them
+        self.assertRaises(RuntimeError, sta.submit, print)
+
+    @staticmethod
+    def _quiet(run):
+        def wrapper():
+            try:
+                run()
+            except ZeroDivisionError:
+                pass
+
+        return wrapper
+
+
+class Server(object):
+    """Stands in for a COM object; records the threads it is used in."""
+
+    def __init__(self):
+        self.threads = set()
+        self.value = 0
+
+    def Add(self, n):
+        self.threads.add(threading.get_ident())
+        self.value += n
+        return self.value
+
+
+class Test_ApartmentExecutor(ut.TestCase):
+    def create_executor(self, n, **kw):
+        executor = ApartmentExecutor(n, FakePump, **kw)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_invalid_max_workers(self):
+        self.assertRaises(ValueError, ApartmentExecutor, 0, FakePump)
+
+    def test_submit_and_map(self):
+        executor = self.create_executor(4)
+        self.assertEqual(executor.submit(pow, 2, 10).result(5), 1024)
+        self.assertEqual(list(executor.map(abs, range(-5, 0))), [5, 4, 3, 2, 1])
+
+    def test_pinned(self):
+        executor = self.create_executor(4)
+        objs = [executor.create(Server).result(5) for _ in range(8)]
+        self.assertTrue(all(isinstance(o, PinnedObject) for o in objs))
+        # the objects are spread over the workers
+        workers = [o.worker for o in objs]
+        self.assertEqual(len(set(workers)), 4)
+        futs = [o.call("Add", i) for i in range(50) for o in objs]
+        for f in futs:
+            f.result(5)
+        for o in objs:
+            self.assertEqual(o.get("value").result(5), sum(range(50)))
+            server = o._ref[0]
+            self.assertEqual(server.threads, {o.worker.ident})
+
+    def test_set(self):
+        executor = self.create_executor(1)
+        obj = executor.create(Server).result(5)
+        obj.set("value", 42).result(5)
+        self.assertEqual(obj.call("Add", 1).result(5), 43)
+
+    def test_multithreaded_load_balancing(self):
+        executor = self.create_executor(4, multithreaded=True)
+        obj = executor.create(Server).result(5)
+        barrier = threading.Barrier(4, timeout=5)
+        # four calls which can only complete when running concurrently
+        futs = [obj.submit(lambda o: barrier.wait()) for _ in range(4)]
+        for f in futs:
+            f.result(5)
+
+    def test_released_in_its_worker(self):
+        executor = self.create_executor(2)
+        released = []
+
+        class Tracked(object):
+            def __del__(self):
+                released.append(threading.get_ident())
+
+        obj = executor.create(Tracked).result(5)
+        ident = obj.worker.ident
+        del obj
+        gc.collect()
+        executor.shutdown()
+        self.assertEqual(released, [ident])
+
+
+if __name__ == "__main__":
+    ut.main()
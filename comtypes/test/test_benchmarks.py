@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest as ut
+import uuid
+from ctypes import c_void_p, sizeof
+from unittest import mock
+
+try:
+    import comtypes  # noqa
+except ImportError:
+    import _pure  # noqa
+from comtypes.benchmarks import suite
+
+
+def _result(**times):
+    return {
+        "version": suite.FORMAT_VERSION,
+        "commit": None,
+        "benchmarks": {name: {"min": t} for name, t in times.items()},
+    }
+
+
+class Test_Suite(ut.TestCase):
+    def test_run(self):
+        result = suite.run("memberspec.*", repeat=2, min_time=0.001)
+        self.assertEqual(sorted(result["benchmarks"]), suite.names("memberspec.*"))
+        for times in result["benchmarks"].values():
+            self.assertEqual(len(times["times"]), 2)
+            self.assertGreater(times["min"], 0)
+            self.assertGreaterEqual(times["median"], times["min"])
+
+    def test_all_benchmarks(self):
+        for name in suite.names():
+            with self.subTest(name=name):
+                try:
+                    func = suite._benchmarks[name]()
+                except suite.SkipBenchmark as err:
+                    self.assertEqual(str(err), suite.NO_NUMPY)
+                    continue
+                func()
+
+    def test_guid(self):
+        func = suite._benchmarks["GUID.__str__"]()
+        self.assertEqual(func(), "{00020400-0000-0000-C000-000000000046}")
+        guid = suite._GUID("{00020400-0000-0000-C000-000000000046}")
+        self.assertEqual(bytes(guid), uuid.UUID(str(guid)).bytes_le)
+
+    def test_variant_stand_in(self):
+        self.assertEqual(sizeof(suite._VARIANT), 8 + 2 * sizeof(c_void_p))
+        v = suite._VARIANT()
+        v.value = 42
+        self.assertEqual((v.vt, v._.VT_I4), (3, 42))
+
+    def test_save_load(self):
+        result = _result(spam=1.0)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = suite.save(result, tmpdir)
+            self.assertEqual(os.path.dirname(path), tmpdir)
+            self.assertEqual(suite.load(path), result)
+            with open(path, "w") as f:
+                json.dump({"version": 0}, f)
+            with self.assertRaises(ValueError):
+                suite.load(path)
+
+    def test_compare(self):
+        old = _result(same=1.0, slower=1.0, faster=1.0, removed=1.0)
+        new = _result(same=1.05, slower=1.2, faster=0.8, added=1.0)
+        self.assertEqual(
+            suite.compare(old, new, threshold=1.1),
+            [
+                ("added", None, 1.0, "added"),
+                ("faster", 1.0, 0.8, "faster"),
+                ("removed", 1.0, None, "removed"),
+                ("same", 1.0, 1.05, ""),
+                ("slower", 1.0, 1.2, "slower"),
+            ],
+        )
+
+    def test_main_compare(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            old = suite.save(_result(spam=1.0), os.path.join(tmpdir, "old.json"))
+            new = suite.save(_result(spam=2.0), os.path.join(tmpdir, "new.json"))
+            with mock.patch("builtins.print"):
+                self.assertEqual(suite.main(["compare", old, new]), 1)
+                self.assertEqual(suite.main(["compare", old, old]), 0)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,104 @@
+"""
+Test for the ``comtypes.cache`` module.
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+import unittest as ut
+
+from comtypes import cache
+
+WRAPPER_STEM = "_00020430_0000_0000_C000_000000000046_0_2_0"
+OTHER_STEM = "_420B2830_E718_11CF_893D_00A0C9054228_0_1_0"
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.gen_dir = td.name
+        self.write(f"{WRAPPER_STEM}.py", "spam = 1\n")
+        self.write(
+            "stdole.py",
+            f"from enum import IntFlag\n\n"
+            f"import comtypes.gen.{WRAPPER_STEM} as __wrapper_module__\n",
+        )
+        self.write(f"{OTHER_STEM}.py", "ham = 2\n")
+        self.write("__init__.py", "")
+
+    def write(self, fname, text, age=0):
+        path = os.path.join(self.gen_dir, fname)
+        with open(path, "w") as ofi:
+            ofi.write(text)
+        t = time.time() - age
+        os.utime(path, (t, t))
+
+    def find(self, stem):
+        (entry,) = [
+            e
+            for e in cache.find_entries([self.gen_dir])
+            if e.wrapper_name == f"comtypes.gen.{stem}"
+        ]
+        return entry
+
+    def test_find_entries(self):
+        entries = cache.find_entries([self.gen_dir])
+        self.assertEqual(len(entries), 2)
+        entry = self.find(WRAPPER_STEM)
+        self.assertEqual(entry.friendly_names, ["comtypes.gen.stdole"])
+        self.assertEqual(entry.libid, "{00020430-0000-0000-C000-000000000046}")
+        self.assertEqual(entry.version, (2, 0))
+        self.assertEqual(entry.lcid, 0)
+        self.assertEqual(len(entry.paths), 2)
+        self.assertEqual(entry.size, sum(os.path.getsize(p) for p in entry.paths))
+
+    def test_select_lru_by_age(self):
+        self.write(f"{OTHER_STEM}.py", "ham = 2\n", age=3600)
+        now = time.time()
+        selected = cache.select_lru(cache.find_entries([self.gen_dir]), max_age=60)
+        self.assertEqual(
+            [e.wrapper_name for e in selected], [f"comtypes.gen.{OTHER_STEM}"]
+        )
+        self.assertEqual(cache.select_lru([], max_age=60, now=now), [])
+
+    def test_select_lru_by_size(self):
+        self.write(f"{OTHER_STEM}.py", "ham = 2\n", age=3600)
+        entries = cache.find_entries([self.gen_dir])
+        newest = self.find(WRAPPER_STEM)
+        selected = cache.select_lru(entries, max_size=newest.size)
+        self.assertEqual(
+            [e.wrapper_name for e in selected], [f"comtypes.gen.{OTHER_STEM}"]
+        )
+        self.assertEqual(
+            cache.select_lru(entries, max_size=0),
+            sorted(entries, key=lambda e: e.last_used),
+        )
+
+    def test_select_libid(self):
+        entries = cache.find_entries([self.gen_dir])
+        libid = "00020430-0000-0000-c000-000000000046"
+        self.assertEqual(len(cache.select_libid(entries, libid)), 1)
+        self.assertEqual(len(cache.select_libid(entries, libid, "2.0")), 1)
+        self.assertEqual(cache.select_libid(entries, libid, "2.1"), [])
+
+    def test_remove_entries(self):
+        cache.remove_entries([self.find(WRAPPER_STEM)])
+        self.assertEqual(
+            sorted(os.listdir(self.gen_dir)),
+            sorted(["__init__.py", f"{OTHER_STEM}.py"]),
+        )
+
+    def test_verify_entries(self):
+        self.write(f"{OTHER_STEM}.py", "ham = \n")
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stderr(devnull):
+                broken = cache.verify_entries(cache.find_entries([self.gen_dir]))
+        self.assertEqual(
+            [e.wrapper_name for e in broken], [f"comtypes.gen.{OTHER_STEM}"]
+        )
+
+
+if __name__ == "__main__":
+    ut.main()
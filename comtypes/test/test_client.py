@@ -3,6 +3,7 @@ from ctypes import POINTER, byref
 import os
 import sys
 import unittest as ut
+from unittest import mock
 
 import comtypes.client
 from comtypes import COSERVERINFO, CLSCTX_INPROC_SERVER
@@ -113,10 +114,48 @@ class Test_GetModule(ut.TestCase):
         mod = comtypes.client.GetModule("scrrun.dll")
         self.assertTrue(hasattr(mod, "__wrapper_module__"))
 
+    def test_only(self):
+        mod = comtypes.client.GetModule("scrrun.dll", only=["Dictionary"])
+        self.assertTrue(mod.__name__.startswith(Scripting.__wrapper_module__.__name__))
+        self.assertTrue(issubclass(mod.Dictionary, comtypes.CoClass))
+        self.assertTrue(hasattr(mod, "IDictionary"))
+        self.assertFalse(hasattr(mod, "FileSystemObject"))
+        self.assertIs(mod, comtypes.client.GetModule("scrrun.dll", only=["Dictionary"]))
+        with self.assertRaises(ValueError):
+            comtypes.client.GetModule("scrrun.dll", only=["NoSuchType"])
+        with self.assertRaises(TypeError):
+            comtypes.client.GetModule("scrrun.dll", only="Dictionary")
+
     def test_raises_typerror_if_takes_unsupported(self):
         with self.assertRaises(TypeError):
             comtypes.client.GetModule(object())
 
+    def test_marks_used_once(self):
+        from comtypes.client import _generate
+
+        files = [Scripting.__file__, Scripting.__wrapper_module__.__file__]
+        with mock.patch.object(_generate, "_marked_paths", set()):
+            with mock.patch.object(os, "utime") as utime:
+                comtypes.client.GetModule("scrrun.dll")
+                comtypes.client.GetModule("scrrun.dll")
+        # the friendly and the wrapper module, unless generated in memory
+        self.assertEqual(utime.call_count, sum(map(os.path.isfile, files)))
+
+    def test_spilled_module_has_umask_mode(self):
+        import stat
+        import tempfile
+        from comtypes.client import _generate
+
+        with tempfile.TemporaryDirectory() as gen_dir:
+            fd, spilled = tempfile.mkstemp(suffix=".py.tmp", dir=gen_dir)
+            os.close(fd)
+            with mock.patch.object(comtypes.client, "gen_dir", gen_dir):
+                with mock.patch.object(_generate, "_my_import") as my_import:
+                    _generate._create_module("comtypes.gen._spilled", None, spilled)
+            my_import.assert_called_once_with("comtypes.gen._spilled")
+            mode = os.stat(os.path.join(gen_dir, "_spilled.py")).st_mode
+            self.assertEqual(stat.S_IMODE(mode), _generate._umask_mode())
+
 
 class Test_KnownSymbols(ut.TestCase):
     # It is guaranteed that each element of `__known_symbols__` is in
@@ -0,0 +1,106 @@
+import io
+import unittest
+from unittest import mock
+
+from comtypes.benchmarks.synthetic import build_typedescs
+from comtypes.client._generate import _get_known_namespaces, _select_items
+from comtypes.tools import typedesc
+from comtypes.tools.codegenerator import codegenerator
+
+
+def _interfaces(items: list) -> list:
+    return [item for item in items if isinstance(item, typedesc.ComInterface)]
+
+
+class Test_WriteWrapperCode(unittest.TestCase):
+    def _write(self, items: list) -> str:
+        codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+        output = io.StringIO()
+        codegen.write_wrapper_code(items, None, output)
+        return output.getvalue()
+
+    def test_same_as_generate_wrapper_code(self):
+        items = build_typedescs(3, 2)
+        codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+        code = codegen.generate_wrapper_code(items, None)
+        self.assertEqual(code, self._write(items))
+
+    def test_spilled_body(self):
+        items = build_typedescs(20, 2)
+        in_memory = self._write(items)
+        with mock.patch.object(codegenerator, "_SPOOL_MAX_SIZE", 128):
+            spilled = self._write(items)
+        self.assertEqual(in_memory, spilled)
+        self.assertIn("class IItem19(IDispatch):", spilled)
+        self.assertIn("IItem19._methods_ = [", spilled)
+        compile(spilled, "<spilled>", "exec")
+
+    def test_closes_stream(self):
+        codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+        codegen.write_wrapper_code(build_typedescs(1, 1), None, io.StringIO())
+        self.assertTrue(codegen.stream.closed)
+
+
+class Test_GenerateDeferred(unittest.TestCase):
+    def test_bodies_of_referenced_interfaces(self):
+        itfs = _interfaces(build_typedescs(3, 2))
+        codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+        # `IItem1` and `IItem0` are only referenced by pointer parameters of
+        # `IItem2`, so their bodies are deferred to the next round.
+        code = codegen.generate_wrapper_code(itfs[-1:], None)
+        self.assertIn("IItem0._methods_ = [", code)
+        self.assertIn("IItem1._methods_ = [", code)
+        self.assertLess(code.index("class IItem1("), code.index("IItem2._methods_"))
+        stats = codegen.stats
+        self.assertEqual(stats.rounds, 2)
+        self.assertEqual(stats.counts["ComInterfaceHead"], 3)
+        self.assertEqual(stats.counts["ComInterfaceBody"], 3)
+        self.assertEqual(stats.items, sum(stats.counts.values()))
+        self.assertIn("ComInterfaceBody", stats.report())
+
+    def test_synthetic_benchmark(self):
+        from comtypes.benchmarks import bench_codegen
+
+        _, stats = bench_codegen.run(20)
+        self.assertEqual(stats.counts["ComInterfaceBody"], 20)
+        self.assertEqual(stats.counts["CoClass"], 20)
+
+    def test_synthetic_known_namespaces(self):
+        from comtypes.benchmarks.synthetic import known_namespaces
+
+        items = build_typedescs(5, 2)
+        codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+        expected = codegen.generate_wrapper_code(items, None)
+        codegen = codegenerator.CodeGenerator(*known_namespaces())
+        self.assertEqual(codegen.generate_wrapper_code(items, None), expected)
+
+    def test_memory_benchmark(self):
+        from comtypes.benchmarks import bench_memory
+
+        result = bench_memory.run(200)
+        self.assertGreater(result["typedesc_bytes"], 0)
+        self.assertGreaterEqual(result["codegen_peak_bytes"], 0)
+
+
+class Test_SelectItems(unittest.TestCase):
+    def test_closure(self):
+        items = build_typedescs(5, 2)
+        lib = typedesc.TypeLib("FooLib", "{00000000-0000-0000-0000-000000000001}", 1, 0)
+        selected = _select_items([lib] + items, ["IItem2"])
+        self.assertEqual(selected, [lib, _interfaces(items)[2]])
+        codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+        code = codegen.generate_wrapper_code(selected, None)
+        for name in ("IItem0", "IItem1", "IItem2"):
+            self.assertIn(f"{name}._methods_ = [", code)
+        self.assertNotIn("IItem3", code)
+        self.assertIn("class Library(object):", code)
+
+    def test_missing_names(self):
+        items = build_typedescs(2, 2)
+        with self.assertRaises(ValueError) as ctx:
+            _select_items(items, ["IItem1", "IBar", "IBaz"])
+        self.assertIn("IBar, IBaz", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
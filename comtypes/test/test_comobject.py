@@ -144,3 +144,78 @@ class Test_IPersist_GetClassID(ut.TestCase):
             uiac.CUIAutomation().IPersist_GetClassID(),
             uiac.CUIAutomation._reg_clsid_,
         )
+
+
+class Pooled(COMObject):
+    _com_interfaces_ = [IUnknown]
+    _pool_size_ = 1
+
+    def __init__(self, value=0):
+        super().__init__()
+        self.value = value
+        self.recycled = 0
+        self.finalized = 0
+
+    def _recycle_(self):
+        self.value = 0
+        self.recycled += 1
+
+    def _final_release_(self):
+        self.finalized += 1
+
+
+class BrokenPooled(Pooled):
+    def _recycle_(self):
+        raise ValueError("cannot recycle")
+
+
+def _release(obj):
+    # Simulates a COM client getting and releasing a reference.
+    obj.IUnknown_AddRef(None)
+    return obj.IUnknown_Release(None)
+
+
+class Test_PooledCOMObject(ut.TestCase):
+    def tearDown(self):
+        for cls in (Pooled, BrokenPooled):
+            cls._get_pool_().clear()
+
+    def test_not_pooled(self):
+        self.assertIsNone(COMObject._get_pool_())
+
+    def test_pool_per_class(self):
+        self.assertIsNot(Pooled._get_pool_(), BrokenPooled._get_pool_())
+        self.assertIs(Pooled._get_pool_(), Pooled._get_pool_())
+
+    def test_reuse(self):
+        obj = Pooled._create_instance_(42)
+        self.assertEqual(obj.value, 42)
+        _release(obj)
+        self.assertEqual((obj.recycled, obj.finalized), (1, 0))
+        self.assertNotIn(obj, COMObject._instances_)
+        self.assertTrue(obj._com_pointers_)
+        self.assertIs(Pooled._create_instance_(42), obj)
+        self.assertEqual(obj.value, 0)
+        self.assertIsNot(Pooled._create_instance_(), obj)
+
+    def test_pool_full(self):
+        first, second = Pooled(), Pooled()
+        _release(first)
+        _release(second)
+        self.assertEqual(second.finalized, 1)
+        self.assertEqual(second._com_pointers_, {})
+        self.assertIs(Pooled._create_instance_(), first)
+
+    def test_recycle_fails(self):
+        obj = BrokenPooled()
+        with self.assertLogs("comtypes._comobject", "ERROR"):
+            _release(obj)
+        self.assertEqual(obj.finalized, 1)
+        self.assertEqual(len(BrokenPooled._get_pool_()), 0)
+
+    def test_clear_finalizes(self):
+        obj = Pooled()
+        _release(obj)
+        Pooled._get_pool_().clear()
+        self.assertEqual(obj.finalized, 1)
+        self.assertEqual(obj._com_pointers_, {})
@@ -0,0 +1,300 @@
+import threading
+import time
+import unittest as ut
+from unittest import mock
+
+import comtypes
+from comtypes import COMError, COMObject, IUnknown
+from comtypes.automation import IDispatch
+from comtypes.connectionpoints import CONNECTDATA
+from comtypes.server import connectionpoints
+from comtypes.server.connectionpoints import ConnectionPointImpl
+
+
+class FakeTypeInfo(object):
+    def __init__(self):
+        self.lookups = []
+
+    def GetIDsOfNames(self, *names):
+        self.lookups.append(names)
+        return [100 + len(names[0])]
+
+
+class Sink(object):
+    def __init__(self, error=None, delay=None):
+        self.received = []
+        self.error = error
+        self.delay = delay
+
+    def QueryInterface(self, interface):
+        return self
+
+    def _record(self, *event):
+        if self.delay is not None:
+            self.delay.wait(5)
+        if self.error is not None:
+            raise COMError(self.error, None, None)
+        self.received.append(event)
+        return len(self.received)
+
+    def Invoke(self, dispid, *args):
+        return self._record(dispid, *args)
+
+    def Changed(self, *args):
+        return self._record("Changed", *args)
+
+
+class _DirectSinkRef(object):
+    def __init__(self, ptr):
+        self.ptr = ptr
+
+    def __call__(self):
+        return self.ptr
+
+    def revoke(self):
+        pass
+
+
+class FakeGIT(object):
+    """Stands in for `comtypes.git`; records the threads revoking entries."""
+
+    def __init__(self):
+        self.table = {}
+        self.revoked_in = []
+
+    def RegisterInterfaceInGlobal(self, ptr, interface):
+        cookie = len(self.table) + len(self.revoked_in) + 1
+        self.table[cookie] = ptr
+        return cookie
+
+    def GetInterfaceFromGlobal(self, cookie, interface):
+        return self.table[cookie]
+
+    def RevokeInterfaceFromGlobal(self, cookie):
+        del self.table[cookie]
+        self.revoked_in.append(threading.get_ident())
+
+
+class QueuedConnectionPoint(ConnectionPointImpl):
+    def _sink_ref(self, ptr):
+        # no global interface table needed for fake sinks
+        return _DirectSinkRef(ptr)
+
+
+def advise(cp, sink):
+    cookie = [0]
+    cp.IConnectionPoint_Advise(None, sink, cookie)
+    return cookie[0]
+
+
+class ISinkEvents(IUnknown):
+    _iid_ = IUnknown._iid_
+    _methods_ = []
+
+
+class Test_SynchronousDelivery(ut.TestCase):
+    def test_dispid_cache(self):
+        typeinfo = FakeTypeInfo()
+        cp = ConnectionPointImpl(IDispatch, typeinfo)
+        sinks = [Sink() for _ in range(3)]
+        for s in sinks:
+            advise(cp, s)
+        for i in range(10):
+            self.assertEqual(cp._call_sinks("Tick", i), [i + 1] * 3)
+        self.assertEqual(typeinfo.lookups, [("Tick",)])
+        self.assertEqual(sinks[0].received[-1], (104, 9))
+
+    def test_dead_sink_removed(self):
+        # The sink interface has no 'Invoke' method.
+        cp = ConnectionPointImpl(ISinkEvents, None)
+        alive, dead = Sink(), Sink(error=connectionpoints._RPC_S_SERVER_UNAVAILABLE)
+        advise(cp, alive)
+        dead_cookie = advise(cp, dead)
+        with self.assertLogs(connectionpoints.logger, "WARNING"):
+            self.assertEqual(cp._call_sinks("Changed", "spam"), [1])
+        self.assertNotIn(dead_cookie, cp._connections)
+        self.assertEqual(alive.received, [("Changed", "spam")])
+
+    def test_batch(self):
+        cp = ConnectionPointImpl(IDispatch, FakeTypeInfo())
+        sink, dead = Sink(), Sink(error=connectionpoints._RPC_S_SERVER_UNAVAILABLE)
+        advise(cp, sink)
+        advise(cp, dead)
+        events = [("Tick", (i,), {}) for i in range(5)]
+        with self.assertLogs(connectionpoints.logger, "WARNING") as logs:
+            results = cp._call_sinks_batch(events)
+        # the dead sink is removed after the first failure
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(results, [[1], [2], [3], [4], [5]])
+        self.assertEqual(sink.received, [(104, i) for i in range(5)])
+
+    def test_invalid_drop_policy(self):
+        self.assertRaises(ValueError, ConnectionPointImpl, IDispatch, None, 10, "spam")
+
+
+class Test_QueuedDelivery(ut.TestCase):
+    def wait_for(self, predicate):
+        deadline = time.monotonic() + 5
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def test_slow_sink_does_not_block(self):
+        cp = QueuedConnectionPoint(IDispatch, FakeTypeInfo(), queue_size=100)
+        gate = threading.Event()
+        slow, fast = Sink(delay=gate), Sink()
+        advise(cp, slow)
+        advise(cp, fast)
+        for i in range(50):
+            self.assertEqual(cp._call_sinks("Tick", i), [])
+        self.wait_for(lambda: len(fast.received) == 50)
+        self.assertEqual(slow.received, [])
+        gate.set()
+        self.wait_for(lambda: len(slow.received) == 50)
+        self.assertEqual(slow.received, [(104, i) for i in range(50)])
+
+    def test_drop_policies(self):
+        for policy, expected in [
+            (connectionpoints.DROP_OLDEST, [0] + list(range(16, 20))),
+            (connectionpoints.DROP_NEWEST, list(range(5))),
+        ]:
+            with self.subTest(policy=policy):
+                cp = QueuedConnectionPoint(IDispatch, FakeTypeInfo(), 4, policy)
+                gate = threading.Event()
+                sink = Sink(delay=gate)
+                cookie = advise(cp, sink)
+                cp._call_sinks("Tick", 0)
+                # the first event is being delivered, the others are queued
+                self.wait_for(lambda: not cp._queues[cookie]._calls)
+                cp._call_sinks_batch([("Tick", (i,), {}) for i in range(1, 20)])
+                self.assertEqual(cp._queues[cookie].dropped, 15)
+                gate.set()
+                self.wait_for(lambda: len(sink.received) == 5)
+                self.assertEqual([e[1] for e in sink.received], expected)
+
+    def test_disconnect_policy(self):
+        cp = QueuedConnectionPoint(IDispatch, FakeTypeInfo(), 4, "disconnect")
+        gate = threading.Event()
+        self.addCleanup(gate.set)
+        cookie = advise(cp, Sink(delay=gate))
+        with self.assertLogs(connectionpoints.logger, "WARNING"):
+            cp._call_sinks_batch([("Tick", (i,), {}) for i in range(10)])
+        self.assertNotIn(cookie, cp._connections)
+        self.assertNotIn(cookie, cp._queues)
+
+    def test_unadvise(self):
+        cp = QueuedConnectionPoint(IDispatch, FakeTypeInfo(), 10)
+        cookie = advise(cp, Sink())
+        self.assertEqual(cp.IConnectionPoint_Unadvise(None, cookie), 0)
+        self.assertEqual(cp._queues, {})
+
+    def test_failed_sink_removed(self):
+        git = FakeGIT()
+        with mock.patch.object(comtypes, "git", git, create=True):
+            cp = ConnectionPointImpl(IDispatch, FakeTypeInfo(), 10)
+            cookie = advise(cp, Sink(error=connectionpoints._RPC_S_SERVER_UNAVAILABLE))
+        self.assertEqual(len(git.table), 1)
+        with self.assertLogs(connectionpoints.logger, "WARNING"):
+            cp._call_sinks("Tick", 0)
+            self.wait_for(lambda: not git.table)
+        self.assertNotIn(cookie, cp._connections)
+        self.assertNotIn(cookie, cp._queues)
+        # revoked in the delivery thread which used the sink
+        self.assertEqual(len(git.revoked_in), 1)
+        self.assertNotEqual(git.revoked_in[0], threading.get_ident())
+
+    def test_unadvise_revokes_in_delivery_thread(self):
+        git = FakeGIT()
+        with mock.patch.object(comtypes, "git", git, create=True):
+            cp = ConnectionPointImpl(IDispatch, FakeTypeInfo(), 10)
+            cookie = advise(cp, Sink())
+        cp._call_sinks("Tick", 0)
+        self.assertEqual(cp.IConnectionPoint_Unadvise(None, cookie), 0)
+        self.wait_for(lambda: not git.table)
+        self.assertNotEqual(git.revoked_in, [threading.get_ident()])
+
+
+class Test_SubscriberRegistry(ut.TestCase):
+    def test_add_pop(self):
+        reg = connectionpoints._SubscriberRegistry()
+        cookies = [reg.add(f"sink{i}") for i in range(5)]
+        self.assertEqual(len(set(cookies)), 5)
+        self.assertNotIn(0, cookies)
+        self.assertEqual(reg.pop(cookies[2]), "sink2")
+        self.assertIsNone(reg.pop(cookies[2]))
+        self.assertEqual(len(reg), 4)
+        self.assertEqual(reg.get(cookies[3]), "sink3")
+        self.assertEqual(
+            [s for _, s in reg.snapshot()], ["sink0", "sink1", "sink3", "sink4"]
+        )
+
+    def test_recycled_slot_gets_new_cookie(self):
+        reg = connectionpoints._SubscriberRegistry()
+        reg.add("spam")
+        old = reg.add("ham")
+        reg.pop(old)
+        new = reg.add("eggs")
+        self.assertEqual(len(reg._slots), 2)
+        self.assertNotEqual(old, new)
+        # a stale cookie does not remove the new sink
+        self.assertIsNone(reg.pop(old))
+        self.assertIn(new, reg)
+
+    def test_snapshot_reused_until_changed(self):
+        reg = connectionpoints._SubscriberRegistry()
+        cookie = reg.add("spam")
+        snapshot = reg.snapshot()
+        self.assertIs(reg.snapshot(), snapshot)
+        reg.pop(cookie)
+        self.assertEqual(snapshot, ((cookie, "spam"),))
+        self.assertEqual(reg.snapshot(), ())
+
+    def test_churn_compacts(self):
+        reg = connectionpoints._SubscriberRegistry()
+        keep = reg.add("keep")
+        for _ in range(100):
+            cookies = [reg.add(i) for i in range(50)]
+            for c in cookies:
+                reg.pop(c)
+        self.assertEqual(len(reg), 1)
+        self.assertLessEqual(len(reg._slots), 2)
+        self.assertEqual(reg.snapshot(), ((keep, "keep"),))
+
+
+class ComSink(COMObject):
+    _com_interfaces_ = [IUnknown]
+
+
+class Test_EnumConnections(ut.TestCase):
+    def setUp(self):
+        self.cp = ConnectionPointImpl(IUnknown, None)
+        self.cookies = [
+            self.cp._connections.add(ComSink().QueryInterface(IUnknown))
+            for _ in range(3)
+        ]
+
+    def test_next(self):
+        enum = connectionpoints._EnumConnections(self.cp._connections.snapshot())
+        # the enumerator is not affected by later changes
+        self.cp._connections.pop(self.cookies[0])
+        rgcd = (CONNECTDATA * 2)()
+        fetched = [0]
+        self.assertEqual(enum.Next(None, 2, rgcd, fetched), 0)
+        self.assertEqual([cd.dwCookie for cd in rgcd], self.cookies[:2])
+        self.assertEqual(enum.Next(None, 2, rgcd, fetched), 1)  # S_FALSE
+        self.assertEqual(fetched, [1])
+        self.assertEqual(rgcd[0].dwCookie, self.cookies[2])
+
+    def test_skip_reset(self):
+        enum = connectionpoints._EnumConnections(self.cp._connections.snapshot())
+        self.assertEqual(enum.Skip(None, 2), 0)
+        self.assertEqual(enum.Skip(None, 2), 1)  # S_FALSE
+        rgcd = (CONNECTDATA * 1)()
+        self.assertEqual(enum.Next(None, 1, rgcd, None), 1)
+        self.assertEqual(enum.Reset(None), 0)
+        self.assertEqual(enum.Next(None, 1, rgcd, None), 0)
+        self.assertEqual(rgcd[0].dwCookie, self.cookies[0])
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,90 @@
+import unittest as ut
+from unittest import mock
+
+from comtypes import GUID, COMError, COMObject, IUnknown, ReturnHRESULT, hresult
+from comtypes import _vtbl, errorinfo
+
+CLSID = "{D4E5F6A7-1B2C-4D3E-8F90-A1B2C3D4E5F6}"
+
+
+class Test_ProgIdCache(ut.TestCase):
+    def setUp(self):
+        errorinfo.clear_progid_cache()
+        self.addCleanup(errorinfo.clear_progid_cache)
+
+    def test_cached_per_clsid(self):
+        with mock.patch.object(GUID, "as_progid", return_value="Spam.Egg") as m:
+            self.assertEqual(errorinfo._get_progid(CLSID), "Spam.Egg")
+            self.assertEqual(errorinfo._get_progid(CLSID), "Spam.Egg")
+            self.assertEqual(errorinfo._get_progid(GUID(CLSID)), "Spam.Egg")
+            self.assertEqual(errorinfo._get_progid(GUID(CLSID)), "Spam.Egg")
+        self.assertEqual(m.call_count, 2)
+
+    def test_no_progid(self):
+        with mock.patch.object(GUID, "as_progid", side_effect=OSError) as m:
+            self.assertIsNone(errorinfo._get_progid(CLSID))
+            self.assertIsNone(errorinfo._get_progid(CLSID))
+        self.assertEqual(m.call_count, 1)
+
+    def test_clear(self):
+        with mock.patch.object(GUID, "as_progid", return_value="Spam.Egg") as m:
+            errorinfo._get_progid(CLSID)
+            errorinfo.clear_progid_cache()
+            errorinfo._get_progid(CLSID)
+        self.assertEqual(m.call_count, 2)
+
+
+class Object(COMObject):
+    _com_interfaces_ = [IUnknown]
+    _lightweight_errors_ = frozenset([hresult.DISP_E_MEMBERNOTFOUND])
+
+    def Probe(self, this, hr):
+        raise ReturnHRESULT(hr, "not found")
+
+    def Fail(self, this, hr):
+        raise COMError(hr, "not found", None)
+
+    def Call(self, hr):
+        raise COMError(hr, "not found", None)
+
+
+class Test_LightweightErrors(ut.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(_vtbl, "ReportError", return_value=-1)
+        self.report_error = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _wrap(self, name, paramflags):
+        obj = Object()
+        return _vtbl.hack(obj, getattr(obj, name), paramflags, IUnknown, name)
+
+    def test_with_this(self):
+        probe = self._wrap("Probe", None)
+        hr = probe(None, hresult.DISP_E_MEMBERNOTFOUND)
+        self.assertEqual(hr, hresult.DISP_E_MEMBERNOTFOUND)
+        self.report_error.assert_not_called()
+        self.assertEqual(probe(None, hresult.E_INVALIDARG), -1)
+        self.report_error.assert_called_once()
+
+    def test_com_error_with_this(self):
+        fail = self._wrap("Fail", None)
+        with mock.patch.object(_vtbl, "_error") as log_error:
+            hr = fail(None, hresult.DISP_E_MEMBERNOTFOUND)
+        self.assertEqual(hr, hresult.DISP_E_MEMBERNOTFOUND)
+        log_error.assert_not_called()
+        with mock.patch.object(_vtbl, "_error") as log_error:
+            self.assertEqual(fail(None, hresult.E_INVALIDARG), hresult.E_INVALIDARG)
+        log_error.assert_called_once()
+        self.report_error.assert_not_called()
+
+    def test_without_this(self):
+        call = self._wrap("Call", ((1, "hr"),))
+        with mock.patch.object(_vtbl, "_error") as log_error:
+            hr = call(None, hresult.DISP_E_MEMBERNOTFOUND)
+        self.assertEqual(hr, hresult.DISP_E_MEMBERNOTFOUND)
+        self.report_error.assert_not_called()
+        log_error.assert_not_called()
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest as ut
+from unittest import mock
+
+from comtypes import GUID, IUnknown
+from comtypes.server import inprocserver
+
+
+class InMemoryRegistry(object):
+    """Stands in for `_WinRegistry`."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.reads = 0
+
+    def read_inproc_server(self, clsid):
+        self.reads += 1
+        return self.entries[clsid]
+
+
+class Test_InprocFindClass(ut.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        with open(os.path.join(td.name, "_comtypes_inproc_spam.py"), "w") as ofi:
+            ofi.write(
+                textwrap.dedent(
+                    """\
+                    from comtypes import COMObject
+
+                    class Spam(COMObject):
+                        _com_interfaces_ = []
+                    """
+                )
+            )
+        self.addCleanup(sys.modules.pop, "_comtypes_inproc_spam", None)
+        self.addCleanup(lambda: td.name in sys.path and sys.path.remove(td.name))
+        self.clsid = GUID.create_new()
+        self.registry = InMemoryRegistry(
+            {self.clsid: (td.name, "_comtypes_inproc_spam.Spam")}
+        )
+        patcher = mock.patch.object(inprocserver, "_registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        inprocserver.clear_class_cache()
+        self.addCleanup(inprocserver.clear_class_cache)
+
+    def test_resolved_once(self):
+        cls = inprocserver.inproc_find_class(self.clsid)
+        self.assertEqual(cls.__name__, "Spam")
+        for _ in range(10):
+            self.assertIs(inprocserver.inproc_find_class(self.clsid), cls)
+        self.assertEqual(self.registry.reads, 1)
+
+    def test_clear_class_cache(self):
+        inprocserver.inproc_find_class(self.clsid)
+        inprocserver.clear_class_cache()
+        inprocserver.inproc_find_class(self.clsid)
+        self.assertEqual(self.registry.reads, 2)
+
+    def test_class_factory_singleton(self):
+        cls = inprocserver.inproc_find_class(self.clsid)
+        factory = inprocserver._get_class_factory(cls)
+        self.assertIsInstance(factory, inprocserver.ClassFactory)
+        self.assertIs(inprocserver._get_class_factory(cls), factory)
+        self.assertIs(factory._cls, cls)
+
+    def test_class_factory_survives_release_by_clients(self):
+        cls = inprocserver.inproc_find_class(self.clsid)
+        factory = inprocserver._get_class_factory(cls)
+        punk = factory.QueryInterface(IUnknown)
+        del punk  # the last reference of the clients
+        self.assertEqual(factory._refcnt, 1)
+        self.assertTrue(factory._com_pointers_)
+        self.assertIs(inprocserver._get_class_factory(cls), factory)
+        inprocserver.clear_class_cache()
+        self.assertEqual(factory._refcnt, 0)
+        self.assertIsNot(inprocserver._get_class_factory(cls), factory)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,156 @@
+import json
+import unittest as ut
+from ctypes import POINTER, c_int
+from unittest import mock
+
+from comtypes import COMMETHOD, GUID, HRESULT, COMObject, IUnknown, hresult
+from comtypes import _vtbl, instrumentation
+from comtypes.automation import IDispatch
+from comtypes.instrumentation import StatsTracer
+
+
+class Test_StatsTracer(ut.TestCase):
+    def setUp(self):
+        self.tracer = StatsTracer(buckets=(0.001, 0.01))
+        self.tracer.record("IFoo", "Bar", 0.0005, False, 8)
+        self.tracer.record("IFoo", "Bar", 0.005, True, 16)
+        self.tracer.record("IFoo", "Bar", 1.0, False, 0)
+        self.tracer.record("IFoo", "Baz", 0.001, False, 4)
+
+    def test_to_dict(self):
+        stats = self.tracer.to_dict()
+        self.assertEqual(sorted(stats["IFoo"]), ["Bar", "Baz"])
+        bar = stats["IFoo"]["Bar"]
+        self.assertEqual(bar["count"], 3)
+        self.assertEqual(bar["errors"], 1)
+        self.assertAlmostEqual(bar["error_rate"], 1 / 3)
+        self.assertAlmostEqual(bar["seconds"], 1.0055)
+        self.assertEqual(bar["bytes"], 24)
+        self.assertEqual(bar["histogram"], {"0.001": 1, "0.01": 2, "+Inf": 3})
+        self.assertEqual(
+            stats["IFoo"]["Baz"]["histogram"], {"0.001": 1, "0.01": 1, "+Inf": 1}
+        )
+
+    def test_to_json(self):
+        self.assertEqual(json.loads(self.tracer.to_json()), self.tracer.to_dict())
+
+    def test_to_prometheus(self):
+        text = self.tracer.to_prometheus()
+        lines = text.splitlines()
+        labels = 'interface="IFoo",method="Bar"'
+        self.assertIn("# TYPE comtypes_calls_total counter", lines)
+        self.assertIn(f"comtypes_calls_total{{{labels}}} 3", lines)
+        self.assertIn(f"comtypes_call_errors_total{{{labels}}} 1", lines)
+        self.assertIn(f"comtypes_call_bytes_total{{{labels}}} 24", lines)
+        self.assertIn(
+            f'comtypes_call_duration_seconds_bucket{{{labels},le="0.01"}} 2', lines
+        )
+        self.assertIn(
+            f'comtypes_call_duration_seconds_bucket{{{labels},le="+Inf"}} 3', lines
+        )
+        self.assertIn(f"comtypes_call_duration_seconds_count{{{labels}}} 3", lines)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_escape_labels(self):
+        tracer = StatsTracer()
+        tracer.record('I"Foo', "Bar\n", 0, False, 0)
+        self.assertIn(
+            r'comtypes_calls_total{interface="I\"Foo",method="Bar\n"} 1',
+            tracer.to_prometheus(),
+        )
+
+    def test_reset(self):
+        self.tracer.reset()
+        self.assertEqual(self.tracer.to_dict(), {})
+
+
+class TracerTestCase(ut.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(instrumentation, "_enabled")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracer = StatsTracer()
+        previous = instrumentation.set_tracer(self.tracer)
+        self.addCleanup(instrumentation.set_tracer, previous)
+
+    def stats(self, interface, method):
+        return self.tracer.to_dict()[interface][method]
+
+
+class Test_SetTracer(TracerTestCase):
+    def test_set_get(self):
+        self.assertIs(instrumentation.get_tracer(), self.tracer)
+        self.assertTrue(instrumentation.enabled())
+        self.assertIs(instrumentation.set_tracer(None), self.tracer)
+        self.assertIsNone(instrumentation.get_tracer())
+        self.assertTrue(instrumentation.enabled())
+
+
+class Test_Client(TracerTestCase):
+    def test_wrap_method(self):
+        def method(self, a, b):
+            if a < 0:
+                raise ValueError(a)
+            return a + b
+
+        traced = instrumentation.wrap_method(method, "IFoo", "Add")
+        self.assertEqual(traced(None, 1, 2), 3)
+        with self.assertRaises(ValueError):
+            traced(None, -1, 2)
+        stats = self.stats("IFoo", "Add")
+        self.assertEqual((stats["count"], stats["errors"]), (2, 1))
+        self.assertEqual(stats["bytes"], 32)
+        instrumentation.set_tracer(None)
+        self.assertEqual(traced(None, 1, 2), 3)
+        self.assertEqual(self.tracer.to_dict()["IFoo"]["Add"]["count"], 2)
+
+    def test_interface_methods(self):
+        class IFoo(IUnknown):
+            _iid_ = GUID("{B1C2D3E4-F5A6-4B7C-8D9E-0F1A2B3C4D5E}")
+            _methods_ = [COMMETHOD([], HRESULT, "Bar", (["in"], c_int, "value"))]
+
+        self.assertEqual(IFoo.Bar.__name__, "Bar")
+        self.assertTrue(hasattr(IFoo.Bar, "__wrapped__"))
+
+    def test_dispatch(self):
+        disp = POINTER(IDispatch)()
+        with mock.patch.object(
+            IDispatch, "_IDispatch__invoke", return_value=42
+        ) as invoke:
+            self.assertEqual(disp._invoke(7, 1, 0, "spam"), 42)
+        invoke.assert_called_once_with(7, 1, 0, "spam")
+        with mock.patch.object(IDispatch, "_IDispatch__Invoke", return_value=None):
+            disp.Invoke(7, _invkind=2)
+        stats = self.stats("POINTER(IDispatch)", "Invoke(7)")
+        self.assertEqual(stats["count"], 2)
+
+
+class Object(COMObject):
+    _com_interfaces_ = [IUnknown]
+
+    def Spam(self, this, value):
+        if value < 0:
+            return hresult.E_INVALIDARG
+        return hresult.S_OK
+
+
+class Test_Server(TracerTestCase):
+    def test_get_impl(self):
+        finder = _vtbl._MethodFinder(Object())
+        spec = (IUnknown, "Spam", None, ())
+        with mock.patch.object(instrumentation, "_enabled", False):
+            self.assertFalse(hasattr(finder.get_impl(*spec), "__wrapped__"))
+        with mock.patch.object(instrumentation, "_enabled", True):
+            impl = finder.get_impl(*spec)
+            missing = finder.get_impl(IUnknown, "Missing", None, ())
+        self.assertEqual(impl(None, 1), hresult.S_OK)
+        self.assertEqual(impl(None, -1), hresult.E_INVALIDARG)
+        self.assertEqual(missing(None), hresult.E_NOTIMPL)
+        stats = self.stats("IUnknown", "Spam")
+        self.assertEqual((stats["count"], stats["errors"]), (2, 1))
+        self.assertEqual(stats["bytes"], 16)
+        self.assertEqual(self.stats("IUnknown", "Missing")["errors"], 1)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,116 @@
+import unittest as ut
+from ctypes import POINTER, addressof, c_int, c_void_p
+from unittest import mock
+
+import pytest
+
+from comtypes import BSTR, COMObject, IUnknown, leaks
+from comtypes.safearray import _midlSAFEARRAY
+
+
+def _set_pointer(ptr, value):
+    c_void_p.from_address(addressof(ptr)).value = value
+
+
+class Object(COMObject):
+    _com_interfaces_ = [IUnknown]
+
+
+class Test_Snapshot(ut.TestCase):
+    def test_pointers(self):
+        before = leaks.snapshot()
+        ptr = POINTER(IUnknown)()
+        self.assertFalse(leaks.snapshot().diff(before))
+        _set_pointer(ptr, 1234)
+        # Do not call Release on a fake pointer.
+        self.addCleanup(_set_pointer, ptr, None)
+        leaked = leaks.snapshot().diff(before)
+        self.assertEqual(leaked.pointers, {"IUnknown": 1})
+        self.assertIn("1 pointer(s) to IUnknown", str(leaked))
+
+    def test_bstrs_and_safearrays(self):
+        before = leaks.snapshot()
+        bstr = BSTR("spam")
+        sa = _midlSAFEARRAY(c_int)()
+        self.assertFalse(leaks.snapshot().diff(before))
+        bstr._needsfree = True
+        sa._needsfree = True
+        leaked = leaks.snapshot().diff(before)
+        self.assertEqual((leaked.bstrs, leaked.safearrays), (1, 1))
+        del bstr, sa
+        self.assertFalse(leaks.snapshot().diff(before))
+
+    def test_objects(self):
+        before = leaks.snapshot()
+        obj = Object()
+        obj.IUnknown_AddRef(None)
+        self.assertEqual(leaks.snapshot().diff(before).objects, {"Object": 1})
+        obj.IUnknown_Release(None)
+        self.assertFalse(leaks.snapshot().diff(before))
+
+    def test_as_dict(self):
+        snapshot = leaks.Snapshot({"IFoo": 2}, {}, 1, 0, {})
+        self.assertEqual(
+            snapshot.diff(leaks.Snapshot({"IFoo": 1}, {}, 3, 0, {})).as_dict(),
+            {
+                "pointers": {"IFoo": 1},
+                "references": {},
+                "bstrs": 0,
+                "safearrays": 0,
+                "objects": {},
+            },
+        )
+
+
+class Test_Tracking(ut.TestCase):
+    def setUp(self):
+        self.com = {}
+        for name in ("AddRef", "Release"):
+            patcher = mock.patch.object(IUnknown, f"_IUnknown__com_{name}")
+            self.com[name] = patcher.start()
+            self.addCleanup(patcher.stop)
+        self.ptr = POINTER(IUnknown)()
+
+    def test_references(self):
+        with leaks.tracking():
+            self.assertIs(IUnknown.AddRef, leaks._counting_AddRef)
+            before = leaks.snapshot()
+            self.ptr.AddRef()
+            self.ptr.AddRef()
+            self.ptr.Release()
+            leaked = leaks.snapshot().diff(before)
+        self.assertEqual(leaked.references, {"IUnknown": 1})
+        self.assertIn("1 unreleased AddRef() on IUnknown", str(leaked))
+        self.assertIs(IUnknown.AddRef, leaks._AddRef)
+        self.assertEqual(leaks._references, {})
+
+    def test_release_on_delete(self):
+        with leaks.tracking():
+            before = leaks.snapshot()
+            _set_pointer(self.ptr, 1234)
+            type(self.ptr).__del__(self.ptr)
+            _set_pointer(self.ptr, None)
+            self.assertFalse(leaks.snapshot().diff(before))
+            self.assertEqual(self.com["Release"].call_count, 1)
+
+    def test_no_leaks(self):
+        with leaks.no_leaks():
+            self.ptr.AddRef()
+            self.ptr.Release()
+        with self.assertRaises(leaks.LeakError) as cm:
+            with leaks.no_leaks():
+                self.ptr.AddRef()
+        self.assertEqual(cm.exception.leaked.references, {"IUnknown": 1})
+
+
+@pytest.mark.usefixtures("com_leaks")
+class Test_Fixture(ut.TestCase):
+    def test_tracking(self):
+        self.assertIs(IUnknown.AddRef, leaks._counting_AddRef)
+        obj = Object()
+        obj.IUnknown_AddRef(None)
+        obj.IUnknown_Release(None)
+
+
+if __name__ == "__main__":
+    ut.main()
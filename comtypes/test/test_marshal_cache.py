@@ -0,0 +1,101 @@
+import importlib.util
+import os
+import tempfile
+import unittest as ut
+from unittest import mock
+
+import comtypes
+import comtypes.client
+from comtypes.client import _marshal_cache
+
+
+MODNAME = "comtypes.gen._00000000_0000_0000_0000_000000000000_0_1_0"
+
+
+class Test_StoreAndLoad(ut.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.cache_dir = td.name
+
+    def test_roundtrip(self):
+        code = compile("spam = 42", "<memory>", "exec")
+        _marshal_cache.store_code(self.cache_dir, MODNAME, code)
+        loaded = _marshal_cache.load_code(self.cache_dir, MODNAME)
+        self.assertIsNotNone(loaded)
+        ns = {}
+        exec(loaded, ns)
+        self.assertEqual(ns["spam"], 42)
+
+    def test_missing(self):
+        self.assertIsNone(_marshal_cache.load_code(self.cache_dir, MODNAME))
+
+    def test_other_comtypes_version(self):
+        code = compile("spam = 42", "<memory>", "exec")
+        with mock.patch.object(comtypes, "__version__", "0.0.0"):
+            _marshal_cache.store_code(self.cache_dir, MODNAME, code)
+        self.assertIsNone(_marshal_cache.load_code(self.cache_dir, MODNAME))
+
+    def test_other_magic_number(self):
+        path = _marshal_cache._cache_path(self.cache_dir, MODNAME)
+        with open(path, "wb") as ofi:
+            ofi.write(b"\0\0\0\0" + importlib.util.MAGIC_NUMBER)
+        self.assertIsNone(_marshal_cache.load_code(self.cache_dir, MODNAME))
+
+    def test_discard(self):
+        code = compile("spam = 42", "<memory>", "exec")
+        _marshal_cache.store_code(self.cache_dir, MODNAME, code)
+        _marshal_cache.discard_code(self.cache_dir, MODNAME)
+        path = _marshal_cache._cache_path(self.cache_dir, MODNAME)
+        self.assertFalse(os.path.exists(path))
+
+
+class Test_MarshalCacheFinder(ut.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.cache_dir = td.name
+        self.finder = _marshal_cache.MarshalCacheFinder()
+
+    def test_inactive_if_gen_dir_exists(self):
+        code = compile("spam = 42", "<memory>", "exec")
+        _marshal_cache.store_code(self.cache_dir, MODNAME, code)
+        with mock.patch.object(comtypes.client, "code_cache_dir", self.cache_dir):
+            self.assertIsNone(self.finder.find_spec(MODNAME, None))
+
+    def test_find_and_exec(self):
+        code = compile("spam = 42", "<memory>", "exec")
+        _marshal_cache.store_code(self.cache_dir, MODNAME, code)
+        with mock.patch.object(comtypes.client, "gen_dir", None):
+            with mock.patch.object(comtypes.client, "code_cache_dir", self.cache_dir):
+                self.assertIsNone(self.finder.find_spec("comtypes.spam", None))
+                spec = self.finder.find_spec(MODNAME, None)
+        self.assertIsNotNone(spec)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        self.assertEqual(mod.spam, 42)
+
+    def test_stale_module_is_discarded(self):
+        code = compile("raise ImportError('Wrong version')", "<memory>", "exec")
+        _marshal_cache.store_code(self.cache_dir, MODNAME, code)
+        with mock.patch.object(comtypes.client, "gen_dir", None):
+            with mock.patch.object(comtypes.client, "code_cache_dir", self.cache_dir):
+                spec = self.finder.find_spec(MODNAME, None)
+        mod = importlib.util.module_from_spec(spec)
+        with self.assertRaises(ImportError):
+            spec.loader.exec_module(mod)
+        self.assertIsNone(_marshal_cache.load_code(self.cache_dir, MODNAME))
+
+
+class Test_CompileGenDir(ut.TestCase):
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as gen_dir:
+            with open(os.path.join(gen_dir, "_spam.py"), "w") as ofi:
+                ofi.write("spam = 42\n")
+            self.assertTrue(_marshal_cache.compile_gen_dir(gen_dir, quiet=2))
+            cached = importlib.util.cache_from_source(os.path.join(gen_dir, "_spam.py"))
+            self.assertTrue(os.path.exists(cached))
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,71 @@
+import mmap
+import unittest as ut
+from ctypes import addressof, c_char, create_string_buffer
+
+try:
+    import comtypes  # noqa
+except ImportError:
+    import _pure  # noqa
+from comtypes._membuffer import FixedSizeBufferError, ReadOnlyBufferError, SharedBuffer
+
+
+class Test_SharedBuffer(ut.TestCase):
+    def _read(self, buffer, pos, cb):
+        dst = (c_char * cb)()
+        n = buffer.read(pos, addressof(dst), cb)
+        return dst.raw[:n]
+
+    def _write(self, buffer, pos, data):
+        src = create_string_buffer(data, len(data))
+        return buffer.write(pos, addressof(src), len(data))
+
+    def test_read(self):
+        buffer = SharedBuffer(b"spam egg bacon ham")
+        self.assertTrue(buffer.readonly)
+        self.assertEqual(buffer.size(), 18)
+        self.assertEqual(self._read(buffer, 5, 3), b"egg")
+        self.assertEqual(self._read(buffer, 15, 10), b"ham")
+        self.assertEqual(self._read(buffer, 30, 10), b"")
+
+    def test_read_only(self):
+        buffer = SharedBuffer(b"spam")
+        with self.assertRaises(ReadOnlyBufferError):
+            self._write(buffer, 0, b"x")
+        with self.assertRaises(ReadOnlyBufferError):
+            buffer.set_size(2)
+
+    def test_write_resizes_bytearray(self):
+        data = bytearray(b"spam egg")
+        buffer = SharedBuffer(data)
+        self.assertEqual(self._write(buffer, 5, b"bacon ham"), 9)
+        self.assertEqual(data, b"spam bacon ham")
+        buffer.set_size(4)
+        self.assertEqual(data, b"spam")
+        buffer.set_size(6)
+        self.assertEqual(data, b"spam\0\0")
+
+    def test_fixed_size(self):
+        data = memoryview(bytearray(b"spam"))
+        buffer = SharedBuffer(data)
+        self.assertEqual(self._write(buffer, 0, b"SPAM"), 4)
+        self.assertEqual(bytes(data), b"SPAM")
+        with self.assertRaises(FixedSizeBufferError):
+            self._write(buffer, 2, b"AM!")
+        self.assertEqual(bytes(data), b"SPAM")
+
+    def test_mmap(self):
+        mm = mmap.mmap(-1, 8)
+        self.addCleanup(mm.close)
+        buffer = SharedBuffer(mm)
+        self._write(buffer, 0, b"spam egg")
+        self.assertEqual(self._read(buffer, 5, 3), b"egg")
+        try:
+            buffer.set_size(14)
+        except (OSError, SystemError):
+            self.skipTest("anonymous maps cannot be resized here")
+        self._write(buffer, 8, b" bacon")
+        self.assertEqual(mm[:], b"spam egg bacon")
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,136 @@
+import collections
+import unittest as ut
+
+try:
+    import comtypes  # noqa
+except ImportError:
+    import _pure  # noqa
+from comtypes import messageloop
+
+WM_PAINT = 0x000F
+WM_TIMER = 0x0113
+WM_USER = 0x0400
+
+
+class StubSource(object):
+    """Stands in for `_User32MessageSource`, delivering queued message ids."""
+
+    def __init__(self, *messages):
+        self.queue = collections.deque(messages)
+        self.dispatched = []
+        self.waits = []
+        self.on_wait = None
+
+    def peek(self, lpmsg):
+        if not self.queue:
+            return False
+        lpmsg._obj.message = self.queue.popleft()
+        return True
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        if self.on_wait is not None:
+            self.on_wait()
+
+    def dispatch(self, lpmsg):
+        self.dispatched.append(lpmsg._obj.message)
+
+    def post_quit(self):
+        self.queue.append(messageloop.WM_QUIT)
+
+
+class Test_MessageLoop(ut.TestCase):
+    def setUp(self):
+        self.source = StubSource()
+        self.loop = messageloop._MessageLoop(self.source)
+
+    def run_loop(self, *messages):
+        self.source.queue.extend(messages)
+        self.source.post_quit()
+        return self.loop.run()
+
+    def test_dispatch(self):
+        self.run_loop(WM_PAINT, WM_TIMER)
+        self.assertEqual(self.source.dispatched, [WM_PAINT, WM_TIMER])
+        counters = self.loop.counters
+        self.assertEqual((counters.messages, counters.dispatched), (2, 2))
+
+    def test_message_ranges(self):
+        seen = []
+
+        def timer_filter(lpmsg):
+            seen.append(lpmsg._obj.message)
+            return True
+
+        self.loop.add_filter(timer_filter, msg_range=(WM_TIMER, WM_TIMER))
+        self.run_loop(WM_PAINT, WM_TIMER, WM_PAINT)
+        self.assertEqual(seen, [WM_TIMER])
+        self.assertEqual(self.source.dispatched, [WM_PAINT, WM_PAINT])
+        self.assertEqual(self.loop.counters.filtered, 1)
+
+    def test_priorities(self):
+        calls = []
+        self.loop.add_filter(lambda lpmsg: calls.append("low"), priority=-1)
+        self.loop.add_filter(lambda lpmsg: calls.append("high"), priority=10)
+        self.loop.insert_filter(lambda lpmsg: calls.append("legacy") or [])
+        self.loop.add_filter(lambda lpmsg: calls.append("default"))
+        self.run_loop(WM_USER)
+        self.assertEqual(calls, ["high", "legacy", "default", "low"])
+
+    def test_legacy_filter_consumes(self):
+        self.loop.insert_filter(lambda lpmsg: iter([1]))
+        self.run_loop(WM_PAINT)
+        self.assertEqual(self.source.dispatched, [])
+
+    def test_legacy_generator_filter_runs_to_completion(self):
+        calls = []
+
+        def filter(lpmsg):
+            calls.append("before")
+            yield 1
+            calls.append("after")
+
+        self.loop.insert_filter(filter)
+        self.run_loop(WM_PAINT)
+        self.assertEqual(calls, ["before", "after"])
+        self.assertEqual(self.source.dispatched, [])
+
+    def test_default_source_created_lazily(self):
+        self.assertIsNone(messageloop._MessageLoop()._source)
+
+    def test_remove_filter(self):
+        def consume(lpmsg):
+            return True
+
+        self.loop.add_filter(consume)
+        self.run_loop(WM_PAINT)
+        self.loop.remove_filter(consume)
+        self.run_loop(WM_PAINT)
+        self.assertEqual(self.source.dispatched, [WM_PAINT])
+
+    def test_wm_quit_exit_code(self):
+        self.source.post_quit()
+        self.assertEqual(self.loop.run(), 0)
+
+    def test_idle_callbacks(self):
+        calls = []
+
+        def idle():
+            calls.append(len(self.source.queue))
+            # ask to be called again once
+            return len(calls) == 1
+
+        self.loop.add_idle_callback(idle)
+        self.source.on_wait = self.source.post_quit
+        self.loop.run()
+        self.assertEqual(calls, [0, 0])
+        self.assertEqual(self.loop.counters.waits, 1)
+
+    def test_deadline(self):
+        self.assertIsNone(self.loop.run(timeout=0.05))
+        self.assertTrue(self.source.waits)
+        self.assertTrue(all(0 < t <= 0.05 for t in self.source.waits))
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,71 @@
+import unittest as ut
+
+try:
+    import comtypes  # noqa
+except ImportError:
+    import _pure  # noqa
+from comtypes._objpool import ObjectPool
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Test_ObjectPool(ut.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.finalized = []
+
+    def _pool(self, max_size, max_idle=None):
+        return ObjectPool(max_size, max_idle, self.finalized.append, self.clock)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ObjectPool(0)
+
+    def test_reuse_most_recent(self):
+        pool = self._pool(2)
+        self.assertIsNone(pool.get())
+        self.assertTrue(pool.put("a"))
+        self.assertTrue(pool.put("b"))
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.get(), "b")
+        self.assertEqual(pool.get(), "a")
+        self.assertEqual((pool.hits, pool.misses), (2, 1))
+        self.assertEqual(self.finalized, [])
+
+    def test_full(self):
+        pool = self._pool(1)
+        self.assertTrue(pool.put("a"))
+        self.assertFalse(pool.put("b"))
+        self.assertEqual(self.finalized, ["b"])
+        self.assertEqual(pool.get(), "a")
+
+    def test_idle_eviction(self):
+        pool = self._pool(3, max_idle=10)
+        pool.put("a")
+        self.clock.now = 5
+        pool.put("b")
+        self.clock.now = 12
+        self.assertEqual(pool.evict(), 1)
+        self.assertEqual(self.finalized, ["a"])
+        self.clock.now = 20
+        self.assertIsNone(pool.get())
+        self.assertEqual(self.finalized, ["a", "b"])
+        self.assertEqual(pool.evicted, 2)
+
+    def test_clear(self):
+        pool = self._pool(3)
+        pool.put("a")
+        pool.put("b")
+        self.assertEqual(pool.clear(), 2)
+        self.assertEqual(self.finalized, ["a", "b"])
+        self.assertEqual(len(pool), 0)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,79 @@
+import logging
+import threading
+import unittest as ut
+
+from comtypes import COMObject, IUnknown
+
+
+class Object(COMObject):
+    _com_interfaces_ = [IUnknown]
+
+    def __init__(self):
+        super().__init__()
+        self.reprs = 0
+        self.released = 0
+
+    def __repr__(self):
+        self.reprs += 1
+        return "<Object>"
+
+    def _final_release_(self):
+        self.released += 1
+
+
+class Test_RefCount(ut.TestCase):
+    def test_add_release(self):
+        obj = Object()
+        self.assertEqual(obj.IUnknown_AddRef(None), 1)
+        self.assertIn(obj, COMObject._instances_)
+        self.assertEqual(obj.IUnknown_AddRef(None), 2)
+        self.assertEqual(obj.IUnknown_Release(None), 1)
+        self.assertEqual(obj.IUnknown_Release(None), 0)
+        self.assertNotIn(obj, COMObject._instances_)
+        self.assertEqual(obj.released, 1)
+
+    def test_threads(self):
+        obj = Object()
+        obj.IUnknown_AddRef(None)
+
+        def work():
+            for _ in range(2000):
+                obj.IUnknown_AddRef(None)
+                obj.IUnknown_Release(None)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(obj.released, 0)
+        self.assertEqual(obj.IUnknown_Release(None), 0)
+        self.assertEqual(obj.released, 1)
+
+    def test_no_formatting_without_debug(self):
+        logger = logging.getLogger("comtypes._comobject")
+        level = logger.level
+        logger.setLevel(logging.INFO)
+        try:
+            obj = Object()
+            obj.IUnknown_AddRef(None)
+            obj.IUnknown_Release(None)
+            self.assertEqual(obj.reprs, 0)
+            logger.setLevel(logging.DEBUG)
+            with self.assertLogs(logger, logging.DEBUG):
+                obj.IUnknown_AddRef(None)
+                obj.IUnknown_Release(None)
+            self.assertGreater(obj.reprs, 0)
+        finally:
+            logger.setLevel(level)
+
+    def test_benchmark(self):
+        from comtypes.benchmarks import bench_refcount
+
+        result = bench_refcount.run(threads=2, calls=100)
+        self.assertGreater(result["own_objects"], 0)
+        self.assertGreater(result["shared_object"], 0)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,111 @@
+import unittest as ut
+from ctypes import c_double, c_int, pointer
+
+from comtypes import BSTR, DISPMETHOD, GUID, dispid
+from comtypes.automation import (
+    DISPATCH_METHOD,
+    DISPID,
+    DISPPARAMS,
+    VARIANT,
+    VARIANT_BOOL,
+    IDispatch,
+)
+from comtypes.client import _events
+
+
+class IFeedEvents(IDispatch):
+    _case_insensitive_ = True
+    _iid_ = GUID("{3B1A3F52-6F55-4B8E-9A9E-5C4A4A3D6F10}")
+    _idlflags_ = []
+    _methods_ = []
+    _disp_methods_ = [
+        DISPMETHOD([dispid(1)], None, "Reset"),
+        DISPMETHOD(
+            [dispid(2)], None, "Tick", ([], BSTR, "symbol"), ([], c_double, "price")
+        ),
+        DISPMETHOD(
+            [dispid(3)],
+            None,
+            "Quote",
+            ([], BSTR, "symbol"),
+            ([], c_double, "bid"),
+            ([], c_double, "ask"),
+            ([], c_int, "size"),
+            ([], VARIANT_BOOL, "final"),
+        ),
+        DISPMETHOD(
+            [dispid(4)], None, "Cancel", (["in", "out"], VARIANT_BOOL, "cancel")
+        ),
+    ]
+
+
+class Handler(object):
+    def __init__(self):
+        self.calls = []
+
+    def Reset(self, this):
+        self.calls.append(("Reset",))
+
+    def Tick(self, this, symbol, price):
+        self.calls.append(("Tick", symbol, price))
+
+    def Quote(self, this, *args):
+        self.calls.append(("Quote",) + args)
+
+
+def _dispparams(*args, named=()):
+    # Unnamed arguments are passed in reverse order.
+    rgvarg = (VARIANT * len(args))(*[VARIANT(a) for a in reversed(args)])
+    params = DISPPARAMS()
+    params.rgvarg = rgvarg
+    params.cArgs = len(args)
+    if named:
+        params.rgdispidNamedArgs = (DISPID * len(named))(*named)
+        params.cNamedArgs = len(named)
+    params._keep = rgvarg
+    return params
+
+
+class Test_SinkTable(ut.TestCase):
+    def setUp(self):
+        self.handler = Handler()
+        self.sink = _events.CreateEventReceiver(IFeedEvents, self.handler)
+
+    def invoke(self, dispid, params, wFlags=DISPATCH_METHOD):
+        return self.sink.IDispatch_Invoke(
+            None, dispid, None, 0, wFlags, pointer(params), None, None, None
+        )
+
+    def test_table(self):
+        table = self.sink._sink_table_
+        # events with output arguments are not compiled
+        self.assertEqual(sorted(table), [1, 2, 3])
+        self.assertEqual(len(table[3].decoders), 5)
+
+    def test_fast_paths(self):
+        self.assertEqual(self.invoke(1, _dispparams()), 0)
+        self.assertEqual(self.invoke(2, _dispparams("SPAM", 1.5)), 0)
+        self.assertEqual(self.invoke(3, _dispparams("HAM", 1.25, 1.5, 100, True)), 0)
+        self.assertEqual(
+            self.handler.calls,
+            [("Reset",), ("Tick", "SPAM", 1.5), ("Quote", "HAM", 1.25, 1.5, 100, True)],
+        )
+
+    def test_same_as_generic(self):
+        params = _dispparams("EGGS", 2)  # an integer where a double is declared
+        self.invoke(2, params)
+        self.sink._sink_table_ = {}
+        self.invoke(2, params)
+        self.assertEqual(self.handler.calls, [("Tick", "EGGS", 2)] * 2)
+
+    def test_named_args_fall_back(self):
+        self.invoke(2, _dispparams(3.0, "SPAM", named=[0, 1]))
+        self.assertEqual(self.handler.calls, [("Tick", "SPAM", 3.0)])
+
+    def test_unknown_dispid(self):
+        DISP_E_MEMBERNOTFOUND = -2147352573
+        self.assertEqual(self.invoke(42, _dispparams()), DISP_E_MEMBERNOTFOUND)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,37 @@
+import unittest as ut
+
+import comtypes
+from comtypes.client._sta import PinnedObject, STAExecutor
+from comtypes.test.test_apartment import FakePump
+
+
+class Test_STAExecutor(ut.TestCase):
+    def create_executor(self, n, **kw):
+        self.flags = []
+
+        def pump_factory(flags):
+            self.flags.append(flags)
+            return FakePump()
+
+        executor = STAExecutor(n, pump_factory=pump_factory, **kw)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_invalid_max_workers(self):
+        self.assertRaises(ValueError, STAExecutor, 0)
+
+    def test_apartments(self):
+        self.create_executor(2)
+        self.assertEqual(self.flags, [comtypes.COINIT_APARTMENTTHREADED] * 2)
+        self.create_executor(2, multithreaded=True)
+        self.assertEqual(self.flags, [comtypes.COINIT_MULTITHREADED] * 2)
+
+    def test_submit(self):
+        executor = self.create_executor(2)
+        self.assertEqual(executor.submit(pow, 2, 10).result(5), 1024)
+        obj = executor.create(object).result(5)
+        self.assertIsInstance(obj, PinnedObject)
+
+
+if __name__ == "__main__":
+    ut.main()
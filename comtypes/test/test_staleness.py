@@ -0,0 +1,155 @@
+import os
+import tempfile
+import threading
+import types
+import unittest as ut
+from unittest import mock
+
+from comtypes import _tlib_version_checker
+from comtypes.client import _manifest
+from comtypes.tools.codegenerator import version
+
+
+class _TypelibTestCase(ut.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.tmp_dir = td.name
+        self.tlb_path = os.path.join(self.tmp_dir, "spam.tlb")
+        with open(self.tlb_path, "wb") as ofi:
+            ofi.write(b"spam")
+        self.mtime = os.stat(self.tlb_path).st_mtime
+        orig_policy, orig_ttl = _tlib_version_checker.get_staleness_policy()
+        self.addCleanup(
+            _tlib_version_checker.set_staleness_policy, orig_policy, orig_ttl
+        )
+        _tlib_version_checker._forget_mtimes()
+        self.addCleanup(_tlib_version_checker._forget_mtimes)
+
+    def touch(self, delta):
+        os.utime(self.tlb_path, (self.mtime + delta, self.mtime + delta))
+
+
+class Test_CheckVersion(_TypelibTestCase):
+    def test_wrong_version(self):
+        with self.assertRaises(ImportError):
+            _tlib_version_checker._check_version("0.0.0", self.mtime, self.tlb_path)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            _tlib_version_checker.set_staleness_policy("sometimes")
+
+    def test_always(self):
+        _tlib_version_checker.set_staleness_policy("always")
+        _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+        self.touch(10)
+        with self.assertRaises(ImportError):
+            _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+
+    def test_once(self):
+        _tlib_version_checker.set_staleness_policy("once")
+        _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+        self.touch(10)
+        with mock.patch.object(os, "stat", side_effect=AssertionError):
+            _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+
+    def test_ttl(self):
+        _tlib_version_checker.set_staleness_policy("ttl", 60.0)
+        _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+        self.touch(10)
+        _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+        _tlib_version_checker.set_staleness_policy("ttl", 0.0)
+        with self.assertRaises(ImportError):
+            _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+
+    def test_never(self):
+        _tlib_version_checker.set_staleness_policy("never")
+        self.touch(10)
+        with mock.patch.object(os, "stat", side_effect=AssertionError):
+            _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+
+    def test_typelib_path_from_caller_globals(self):
+        _tlib_version_checker.set_staleness_policy("always")
+        self.touch(10)
+        ns = {
+            "typelib_path": self.tlb_path,
+            "_check_version": _tlib_version_checker._check_version,
+        }
+        with self.assertRaises(ImportError):
+            exec(f"_check_version({version!r}, {self.mtime!r})", ns)
+
+
+class Test_Manifest(_TypelibTestCase):
+    def record(self, modname):
+        mod = types.ModuleType(modname)
+        mod.typelib_path = self.tlb_path
+        _manifest.record_module(self.tmp_dir, modname, mod, "comtypes.gen.Spam")
+
+    def test_record_and_load(self):
+        self.record("comtypes.gen._spam")
+        entries = _manifest.load_manifest(self.tmp_dir)
+        entry = entries["comtypes.gen._spam"]
+        self.assertEqual(entry["typelib_path"], self.tlb_path)
+        self.assertEqual(entry["friendly_name"], "comtypes.gen.Spam")
+        self.assertEqual(entry["size"], 4)
+        self.assertEqual(entry["mtime"], self.mtime)
+
+    def test_validate(self):
+        self.record("comtypes.gen._spam")
+        self.record("comtypes.gen._ham")
+        _tlib_version_checker.set_staleness_policy("once")
+        with mock.patch.object(os, "stat", wraps=os.stat) as stat:
+            self.assertEqual(_manifest.validate_manifest(self.tmp_dir), [])
+        self.assertEqual(stat.call_count, 1)
+        with mock.patch.object(os, "stat", side_effect=AssertionError):
+            _tlib_version_checker._check_version(version, self.mtime, self.tlb_path)
+
+    def test_validate_modified(self):
+        self.record("comtypes.gen._spam")
+        with open(self.tlb_path, "wb") as ofi:
+            ofi.write(b"spam and eggs")
+        self.assertEqual(
+            _manifest.validate_manifest(self.tmp_dir), ["comtypes.gen._spam"]
+        )
+
+    def test_validate_deep(self):
+        self.record("comtypes.gen._spam")
+        with open(self.tlb_path, "wb") as ofi:
+            ofi.write(b"eggs")
+        self.touch(0)
+        self.assertEqual(_manifest.validate_manifest(self.tmp_dir), [])
+        self.assertEqual(
+            _manifest.validate_manifest(self.tmp_dir, deep=True),
+            ["comtypes.gen._spam"],
+        )
+
+    def test_remove(self):
+        self.record("comtypes.gen._spam")
+        _manifest.remove_modules(self.tmp_dir, ["comtypes.gen._spam"])
+        self.assertEqual(_manifest.load_manifest(self.tmp_dir), {})
+
+    def test_concurrent_records(self):
+        names = [f"comtypes.gen._spam{i}" for i in range(20)]
+        threads = [threading.Thread(target=self.record, args=(n,)) for n in names]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(_manifest.load_manifest(self.tmp_dir)), sorted(names))
+        # no lock file and no temporary manifest is left behind
+        self.assertEqual(
+            sorted(os.listdir(self.tmp_dir)), [_manifest.MANIFEST_NAME, "spam.tlb"]
+        )
+
+    def test_lock_left_over(self):
+        lock = os.path.join(self.tmp_dir, f"{_manifest.MANIFEST_NAME}.lock")
+        open(lock, "w").close()
+        with mock.patch.object(_manifest, "_LOCK_TIMEOUT", 0.05):
+            with self.assertLogs(_manifest.logger, "INFO"):
+                self.record("comtypes.gen._spam")
+        self.assertIn("comtypes.gen._spam", _manifest.load_manifest(self.tmp_dir))
+        self.assertFalse(os.path.exists(lock))
+
+
+if __name__ == "__main__":
+    ut.main()
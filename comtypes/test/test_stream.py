@@ -1,8 +1,12 @@
+import io
+import mmap
 import unittest as ut
 
 from ctypes import POINTER, byref, c_bool, c_ubyte, c_ulonglong, oledll, pointer
 import comtypes
 import comtypes.client
+import comtypes.stream
+from comtypes.stream import ComStreamIO, FileStream, MappedStream, buffered_reader
 
 comtypes.client.GetModule("portabledeviceapi.dll")
 from comtypes.gen.PortableDeviceApiLib import IStream
@@ -127,5 +131,39 @@ class Test_Clone(ut.TestCase):
         self.assertEqual(bytearray(buf)[0:read], test_data)
 
 
+class Test_ComStreamIO(ut.TestCase):
+    def test_hglobal_stream(self):
+        f = ComStreamIO(_create_stream())
+        f.write(b"spam egg bacon ham")
+        f.seek(5)
+        buf = bytearray(3)
+        self.assertEqual(f.readinto(buf), 3)
+        self.assertEqual(buf, b"egg")
+        self.assertEqual(f.size(), 18)
+        self.assertEqual(f.read(), b" bacon ham")
+
+    def test_file_stream(self):
+        file = io.BytesIO(b"spam egg bacon ham")
+        stream = FileStream(file).QueryInterface(comtypes.stream.IStream)
+        f = ComStreamIO(stream)
+        self.assertEqual(f.read(4), b"spam")
+        self.assertEqual(f.size(), 18)
+        clone = ComStreamIO(stream.Clone())
+        self.assertEqual(clone.read(), b" egg bacon ham")
+        self.assertEqual(f.read(4), b" egg")
+        f.seek(0)
+        self.assertEqual(buffered_reader(stream).read(), file.getvalue())
+
+    def test_mapped_stream(self):
+        mm = mmap.mmap(-1, 18)
+        mm[:] = b"spam egg bacon ham"
+        stream = MappedStream(mm).QueryInterface(comtypes.stream.IStream)
+        f = ComStreamIO(stream)
+        f.seek(5)
+        f.write(b"EGG")
+        self.assertEqual(mm[:8], b"spam EGG")
+        self.assertEqual(ComStreamIO(stream.Clone()).read(), b" bacon ham")
+
+
 if __name__ == "__main__":
     ut.main()
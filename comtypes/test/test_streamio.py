@@ -0,0 +1,298 @@
+import io
+import mmap
+import unittest as ut
+from ctypes import POINTER, c_ubyte, c_ulong, c_ulonglong, pointer, string_at
+
+from comtypes import ReturnHRESULT, hresult
+from comtypes.stream import (
+    STATFLAG_NONAME,
+    STGM_READ,
+    STGM_READWRITE,
+    STGTY_STREAM,
+    STREAM_SEEK_CUR,
+    STREAM_SEEK_END,
+    STREAM_SEEK_SET,
+    ComStreamIO,
+    FileStream,
+    MappedStream,
+    buffered_reader,
+    tagSTATSTG,
+)
+
+
+class FakeStream(object):
+    """Implements the methods of an `IStream` pointer used by `ComStreamIO`
+    on top of a `BytesIO`."""
+
+    def __init__(self, data=b""):
+        self.file = io.BytesIO(data)
+        self.reads = []
+        self.commits = 0
+
+    def readinto(self, b):
+        self.reads.append(len(b))
+        return self.file.readinto(b)
+
+    def RemoteWrite(self, pv, cb):
+        return self.file.write(string_at(pv, cb))
+
+    def RemoteSeek(self, dlibMove, dwOrigin):
+        return self.file.seek(dlibMove, dwOrigin)
+
+    def SetSize(self, libNewSize):
+        self.file.truncate(libNewSize)
+
+    def Stat(self, grfStatFlag):
+        assert grfStatFlag == STATFLAG_NONAME
+        stat = tagSTATSTG()
+        stat.cbSize = len(self.file.getvalue())
+        return stat
+
+    def Commit(self, grfCommitFlags):
+        self.commits += 1
+
+
+class Test_ComStreamIO(ut.TestCase):
+    def test_readinto(self):
+        stream = FakeStream(b"spam egg bacon ham")
+        f = ComStreamIO(stream)
+        buf = bytearray(4)
+        self.assertEqual(f.readinto(buf), 4)
+        self.assertEqual(buf, b"spam")
+        self.assertEqual(f.read(), b" egg bacon ham")
+        self.assertEqual(f.read(), b"")
+
+    def test_readall_preallocates(self):
+        stream = FakeStream(b"x" * 100000)
+        f = ComStreamIO(stream)
+        f.seek(10)
+        self.assertEqual(f.readall(), b"x" * 99990)
+        self.assertEqual(stream.reads[0], 99990)
+
+    def test_readall_grown(self):
+        stream = FakeStream(b"spam")
+        f = ComStreamIO(stream)
+        # the size is taken before the stream grows
+        stream.Stat = lambda flag: tagSTATSTG(cbSize=2)
+        self.assertEqual(f.readall(), b"spam")
+
+    def test_closed(self):
+        f = ComStreamIO(FakeStream(b"spam"))
+        f.close()
+        for method in (f.read, f.readall, f.truncate, f.tell):
+            with self.subTest(method=method.__name__):
+                self.assertRaises(ValueError, method)
+
+    def test_write(self):
+        stream = FakeStream()
+        f = ComStreamIO(stream)
+        self.assertEqual(f.write(b"spam "), 5)
+        self.assertEqual(f.write(bytearray(b"egg ")), 4)
+        self.assertEqual(f.write(memoryview(b"xxbaconxx")[2:7]), 5)
+        self.assertEqual(f.write(b""), 0)
+        self.assertEqual(stream.file.getvalue(), b"spam egg bacon")
+
+    def test_seek_stat(self):
+        stream = FakeStream(b"spam egg bacon ham")
+        f = ComStreamIO(stream)
+        self.assertTrue(f.seekable())
+        self.assertEqual(f.seek(-3, io.SEEK_END), 15)
+        self.assertEqual(f.tell(), 15)
+        self.assertEqual(f.size(), 18)
+        self.assertEqual(f.truncate(4), 4)
+        self.assertEqual(f.size(), 4)
+        f.flush()
+        self.assertEqual(stream.commits, 1)
+
+    def test_not_seekable(self):
+        f = ComStreamIO(object())
+        self.assertFalse(f.seekable())
+        with self.assertRaises(io.UnsupportedOperation):
+            f.seek(0)
+
+    def test_buffered_reader(self):
+        stream = FakeStream(b"line 1\nline 2\n" * 100)
+        reader = buffered_reader(stream, 64)
+        self.assertEqual(reader.readline(), b"line 1\n")
+        self.assertEqual(stream.reads, [64])
+        self.assertEqual(len(reader.read()), 14 * 100 - 7)
+
+
+def _buffer(data):
+    buf = (c_ubyte * len(data)).from_buffer_copy(data)
+    return buf, POINTER(c_ubyte)(buf)
+
+
+class Test_FileStream(ut.TestCase):
+    def setUp(self):
+        self.file = io.BytesIO(b"spam egg bacon ham")
+        self.stream = FileStream(self.file)
+
+    def _read(self, stream, cb):
+        buf = (c_ubyte * cb)()
+        read = c_ulong()
+        hr = stream.ISequentialStream_RemoteRead(
+            None, POINTER(c_ubyte)(buf), cb, pointer(read)
+        )
+        return hr, bytes(buf[: read.value])
+
+    def _seek(self, stream, move, origin):
+        pos = c_ulonglong()
+        hr = stream.IStream_RemoteSeek(None, move, origin, pointer(pos))
+        self.assertEqual(hr, hresult.S_OK)
+        return pos.value
+
+    def test_read(self):
+        self.assertEqual(self._read(self.stream, 4), (hresult.S_OK, b"spam"))
+        self.assertEqual(
+            self._read(self.stream, 100), (hresult.S_FALSE, b" egg bacon ham")
+        )
+
+    def test_write(self):
+        _, pv = _buffer(b"SPAM")
+        written = c_ulong()
+        self._seek(self.stream, 5, STREAM_SEEK_SET)
+        hr = self.stream.ISequentialStream_RemoteWrite(None, pv, 4, pointer(written))
+        self.assertEqual((hr, written.value), (hresult.S_OK, 4))
+        self.assertEqual(self.file.getvalue(), b"spam SPAMbacon ham")
+        self.assertEqual(self._seek(self.stream, 0, STREAM_SEEK_CUR), 9)
+
+    def test_null_pointers(self):
+        hr = self.stream.ISequentialStream_RemoteRead(None, POINTER(c_ubyte)(), 1, None)
+        self.assertEqual(hr, hresult.STG_E_INVALIDPOINTER)
+        _, pv = _buffer(b"x")
+        hr = self.stream.ISequentialStream_RemoteWrite(None, pv, 1, None)
+        self.assertEqual(hr, hresult.S_OK)
+
+    def test_seek(self):
+        self.assertEqual(self._seek(self.stream, 9, STREAM_SEEK_SET), 9)
+        self.assertEqual(self._seek(self.stream, -4, STREAM_SEEK_CUR), 5)
+        self.assertEqual(self._seek(self.stream, -3, STREAM_SEEK_END), 15)
+        self.assertEqual(self._read(self.stream, 10)[1], b"ham")
+        hr = self.stream.IStream_RemoteSeek(None, -1, STREAM_SEEK_SET, None)
+        self.assertEqual(hr, hresult.STG_E_INVALIDFUNCTION)
+        hr = self.stream.IStream_RemoteSeek(None, 0, 3, None)
+        self.assertEqual(hr, hresult.STG_E_INVALIDFUNCTION)
+
+    def test_set_size_stat(self):
+        self.stream.IStream_SetSize(None, 4)
+        stat = tagSTATSTG()
+        self.assertEqual(
+            self.stream.IStream_Stat(None, pointer(stat), STATFLAG_NONAME),
+            hresult.S_OK,
+        )
+        self.assertEqual(stat.cbSize, 4)
+        self.assertEqual(stat.type, STGTY_STREAM)
+        self.assertEqual(stat.grfMode, STGM_READWRITE)
+        self.assertIsNone(stat.pwcsName)
+
+    def test_clone_has_own_position(self):
+        self._seek(self.stream, 5, STREAM_SEEK_SET)
+        clone = self.stream._clone()
+        self.assertEqual(self._read(self.stream, 4)[1], b"egg ")
+        self.assertEqual(self._read(clone, 3)[1], b"egg")
+        self.assertEqual(self._read(self.stream, 5)[1], b"bacon")
+
+    def test_copy_to(self):
+        target = FakeStream()
+        read, written = c_ulonglong(), c_ulonglong()
+        self._seek(self.stream, 5, STREAM_SEEK_SET)
+        hr = self.stream.IStream_RemoteCopyTo(
+            None, target, 100, pointer(read), pointer(written)
+        )
+        self.assertEqual(hr, hresult.S_OK)
+        self.assertEqual((read.value, written.value), (13, 13))
+        self.assertEqual(target.file.getvalue(), b"egg bacon ham")
+
+
+class Test_MappedStream(ut.TestCase):
+    def _read(self, stream, cb):
+        buf = (c_ubyte * cb)()
+        read = c_ulong()
+        hr = stream.ISequentialStream_RemoteRead(
+            None, POINTER(c_ubyte)(buf), cb, pointer(read)
+        )
+        return hr, bytes(buf[: read.value])
+
+    def _write(self, stream, data):
+        _, pv = _buffer(data)
+        written = c_ulong()
+        hr = stream.ISequentialStream_RemoteWrite(None, pv, len(data), pointer(written))
+        self.assertEqual(hr, hresult.S_OK)
+        return written.value
+
+    def _stat(self, stream):
+        stat = tagSTATSTG()
+        stream.IStream_Stat(None, pointer(stat), STATFLAG_NONAME)
+        return stat
+
+    def test_read(self):
+        stream = MappedStream(b"spam egg bacon ham")
+        self.assertEqual(self._read(stream, 4), (hresult.S_OK, b"spam"))
+        stream.IStream_RemoteSeek(None, -3, STREAM_SEEK_END, None)
+        self.assertEqual(self._read(stream, 10), (hresult.S_FALSE, b"ham"))
+        self.assertEqual(self._read(stream, 10), (hresult.S_FALSE, b""))
+        self.assertEqual(self._stat(stream).grfMode, STGM_READ)
+
+    def test_read_only(self):
+        stream = MappedStream(b"spam")
+        with self.assertRaises(ReturnHRESULT) as cm:
+            self._write(stream, b"x")
+        self.assertEqual(cm.exception.args[0], hresult.STG_E_ACCESSDENIED)
+
+    def test_write_grows_bytearray(self):
+        data = bytearray(b"spam egg")
+        stream = MappedStream(data)
+        stream.IStream_RemoteSeek(None, 5, STREAM_SEEK_SET, None)
+        self.assertEqual(self._write(stream, b"bacon ham"), 9)
+        self.assertEqual(data, b"spam bacon ham")
+        self.assertEqual(self._stat(stream).cbSize, 14)
+        stream.IStream_SetSize(None, 4)
+        self.assertEqual(data, b"spam")
+
+    def test_fixed_size_buffer(self):
+        data = memoryview(bytearray(b"spam"))
+        stream = MappedStream(data)
+        self.assertEqual(self._write(stream, b"SPAM"), 4)
+        self.assertEqual(bytes(data), b"SPAM")
+        with self.assertRaises(ReturnHRESULT) as cm:
+            self._write(stream, b"!")
+        self.assertEqual(cm.exception.args[0], hresult.STG_E_MEDIUMFULL)
+
+    def test_mmap(self):
+        mm = mmap.mmap(-1, 8)
+        stream = MappedStream(mm)
+        self._write(stream, b"spam egg")
+        try:
+            stream.IStream_SetSize(None, 14)
+        except (OSError, SystemError):
+            self.skipTest("anonymous maps cannot be resized here")
+        self.assertEqual(len(mm), 14)
+        self._write(stream, b" bacon")
+        self.assertEqual(mm[:], b"spam egg bacon")
+        stream.IStream_RemoteSeek(None, 5, STREAM_SEEK_SET, None)
+        self.assertEqual(self._read(stream, 3)[1], b"egg")
+        stream.IStream_SetSize(None, 4)
+        self.assertEqual(mm[:], b"spam")
+
+    def test_clone_shares_memory(self):
+        stream = MappedStream(bytearray(b"spam egg"))
+        stream.IStream_RemoteSeek(None, 5, STREAM_SEEK_SET, None)
+        clone = stream._clone()
+        self.assertIs(clone.buffer, stream.buffer)
+        self._write(clone, b"EGG bacon")
+        self.assertEqual(self._read(stream, 20)[1], b"EGG bacon")
+        self.assertEqual(self._stat(stream).cbSize, 14)
+
+    def test_copy_to(self):
+        stream = MappedStream(b"spam egg bacon ham")
+        target = FakeStream()
+        read, written = c_ulonglong(), c_ulonglong()
+        stream.IStream_RemoteCopyTo(None, target, 8, pointer(read), pointer(written))
+        self.assertEqual((read.value, written.value), (8, 8))
+        self.assertEqual(target.file.getvalue(), b"spam egg")
+        self.assertEqual(self._read(stream, 6)[1], b" bacon")
+
+
+if __name__ == "__main__":
+    ut.main()
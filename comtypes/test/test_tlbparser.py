@@ -0,0 +1,196 @@
+import concurrent.futures
+import ctypes
+import unittest as ut
+from unittest import mock
+
+from comtypes import GUID, automation, typeinfo
+from comtypes.benchmarks.synthetic import build_typedescs
+from comtypes.client._generate import _get_known_namespaces
+from comtypes.tools import tlbparser, typedesc
+from comtypes.tools.codegenerator import codegenerator
+
+
+def _typedesc(vt, elem=None):
+    tdesc = typeinfo.TYPEDESC()
+    tdesc.vt = vt
+    if elem is not None:
+        tdesc._.lptdesc = ctypes.pointer(elem)
+    return tdesc
+
+
+def _arraydesc(elem, lbound, count):
+    adesc = typeinfo.tagARRAYDESC()
+    adesc.tdescElem = elem
+    adesc.cDims = 1
+    adesc.rgbounds[0].lLbound = lbound
+    adesc.rgbounds[0].cElements = count
+    tdesc = typeinfo.TYPEDESC()
+    tdesc.vt = automation.VT_CARRAY
+    tdesc._.lpadesc = ctypes.pointer(adesc)
+    return tdesc
+
+
+class _FakeTypeLib(object):
+    def __init__(self):
+        self.calls = 0
+
+    def GetLibAttr(self):
+        self.calls += 1
+        return "{spam} 1.0"
+
+
+class _FakeTypeInfo(object):
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def GetDocumentation(self, memid):
+        self.calls += 1
+        return (self.name, None, 0, None)
+
+
+class Test_MakeType(ut.TestCase):
+    def setUp(self):
+        self.parser = tlbparser.Parser(_FakeTypeLib())
+
+    def test_pointers_are_shared(self):
+        first = self.parser.make_type(
+            _typedesc(automation.VT_PTR, _typedesc(automation.VT_BSTR)), None
+        )
+        second = self.parser.make_type(
+            _typedesc(automation.VT_PTR, _typedesc(automation.VT_BSTR)), None
+        )
+        self.assertIsInstance(first, typedesc.PointerType)
+        self.assertIs(first.typ, tlbparser.BSTR_type)
+        self.assertIs(first, second)
+        other = self.parser.make_type(
+            _typedesc(automation.VT_PTR, _typedesc(automation.VT_I4)), None
+        )
+        self.assertIsNot(first, other)
+
+    def test_safearrays_are_shared(self):
+        tdesc = _typedesc(automation.VT_SAFEARRAY, _typedesc(automation.VT_VARIANT))
+        first = self.parser.make_type(tdesc, None)
+        self.assertIsInstance(first, typedesc.SAFEARRAYType)
+        self.assertIs(first, self.parser.make_type(tdesc, None))
+
+    def test_arrays_are_shared(self):
+        elem = _typedesc(automation.VT_I4)
+        first = self.parser.make_type(_arraydesc(elem, 0, 4), None)
+        self.assertIsInstance(first, typedesc.ArrayType)
+        self.assertEqual((first.min, first.max), (0, 3))
+        self.assertIs(first, self.parser.make_type(_arraydesc(elem, 0, 4), None))
+        self.assertIsNot(first, self.parser.make_type(_arraydesc(elem, 1, 4), None))
+
+
+class Test_ParseTypeInfo(ut.TestCase):
+    def test_typeinfo_is_looked_up_once(self):
+        tlib = _FakeTypeLib()
+        parser = tlbparser.Parser(tlib)
+        tinfo = _FakeTypeInfo("ISpam")
+        itf = object()
+        parser.items[f"{parser._typelib_module()}.ISpam"] = itf
+        for _ in range(3):
+            self.assertIs(parser.parse_typeinfo(tinfo), itf)
+        self.assertEqual(tinfo.calls, 1)
+        self.assertEqual(tlib.calls, 1)
+
+
+def _create_fragment(interfaces):
+    # The synthetic items, keyed as a worker process would key them.
+    items = build_typedescs(interfaces, 1)
+    return {f"lib.{item.name}": item for item in items}
+
+
+class Test_MergeFragments(ut.TestCase):
+    def test_references_are_relinked(self):
+        first = _create_fragment(2)
+        second = _create_fragment(3)
+        items = tlbparser._merge_fragments([first, second])
+        added = ["lib.Item2", "lib.IItem2", "lib.DItem2"]
+        self.assertEqual(list(items), list(first) + added)
+        self.assertIs(items["lib.IItem1"], first["lib.IItem1"])
+        self.assertIs(items["lib.IItem2"], second["lib.IItem2"])
+        # `IItem2.Method0(s, e, ppOther)`, `ppOther` points to `IItem0`
+        args = items["lib.IItem2"].members[1].arguments
+        self.assertIs(args[0][0], items["lib.Struct0"])
+        self.assertIs(args[1][0], items["lib.Enum0"])
+        self.assertIs(args[2][0].typ.typ, items["lib.IItem0"])
+
+    def test_pickled_fragments(self):
+        tlibattr = typeinfo.TLIBATTR()
+        tlibattr.guid = GUID.create_new()
+        tlibattr.wMajorVerNum = 2
+        items = _create_fragment(2)
+        coclass = typedesc.CoClass("Foo", str(GUID.create_new()), [], tlibattr, None)
+        coclass.add_interface(items["lib.IItem1"], 1)
+        items["lib.Foo"] = coclass
+        data = tlbparser._dump_fragment(items)
+        loaded = tlbparser._load_fragment(data, {})
+        foo = loaded["lib.Foo"]
+        self.assertEqual(foo.tlibattr.guid, tlibattr.guid)
+        self.assertEqual(foo.tlibattr.wMajorVerNum, 2)
+        ((itf, _),) = foo.interfaces
+        self.assertIs(itf, loaded["lib.IItem1"])
+        self.assertIs(itf.get_head().itf, itf)
+
+
+class Test_CompactTypedescs(ut.TestCase):
+    def test_no_instance_dict(self):
+        itf = _create_fragment(1)["lib.IItem0"]
+        for obj in (itf, itf.get_head(), itf.members[0], tlbparser.PTR(itf)):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj))
+
+    def test_idlflags_are_shared(self):
+        parser = tlbparser.Parser(_FakeTypeLib())
+        flags = parser._intern_flags(["in", "out"])
+        self.assertIs(parser._intern_flags(["in", "out"]), flags)
+        self.assertIsNot(parser._intern_flags(["in"]), flags)
+
+    def test_compact_arguments(self):
+        items = _create_fragment(2)
+        tlbparser._compact_arguments(items)
+        args = items["lib.IItem1"].members[1].arguments
+        self.assertIsInstance(args, tuple)
+        self.assertEqual(len(args), 3)
+
+
+def _generate(items):
+    codegen = codegenerator.CodeGenerator(*_get_known_namespaces())
+    return codegen.generate_wrapper_code(list(items.values()), None)
+
+
+class Test_ParsePartitioned(ut.TestCase):
+    def setUp(self):
+        self.tlib = typeinfo.LoadTypeLibEx("stdole2.tlb")
+        self.path = tlbparser.get_tlib_filename(self.tlib)
+        # stdole2.tlb has a few dozen type infos; parse it in three processes
+        count = self.tlib.GetTypeInfoCount()
+        patcher = mock.patch.object(tlbparser, "_MIN_PARTITION_SIZE", count // 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_code_as_parse(self):
+        expected = _generate(tlbparser.TypeLibParser(self.tlib).parse())
+        with mock.patch.object(tlbparser.logger, "warning") as warning:
+            items = tlbparser.parse_partitioned(self.tlib, self.path, 3)
+        warning.assert_not_called()
+        self.assertEqual(_generate(items), expected)
+
+    def test_fallback_is_logged(self):
+        expected = _generate(tlbparser.TypeLibParser(self.tlib).parse())
+        broken = mock.Mock(side_effect=concurrent.futures.BrokenExecutor)
+        with mock.patch.object(concurrent.futures, "ProcessPoolExecutor", broken):
+            with self.assertLogs(tlbparser.logger, "WARNING"):
+                items = tlbparser.parse_partitioned(self.tlib, self.path, 3)
+        self.assertEqual(_generate(items), expected)
+
+    def test_worker_bugs_are_raised(self):
+        broken = mock.Mock(side_effect=AttributeError)
+        with mock.patch.object(concurrent.futures, "ProcessPoolExecutor", broken):
+            with self.assertRaises(AttributeError):
+                tlbparser.parse_partitioned(self.tlib, self.path, 3)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,86 @@
+import gc
+import unittest as ut
+import weakref
+from ctypes import HRESULT, POINTER, addressof, c_int, pointer
+from unittest import mock
+
+from comtypes import COMMETHOD, GUID, COMObject, IUnknown, _vtbl, hresult
+
+
+class IValue(IUnknown):
+    _iid_ = GUID("{B1A4A2C3-0F4B-4D0B-9D83-5C0A6D2B7E11}")
+    _methods_ = [
+        COMMETHOD([], HRESULT, "GetValue", (["out"], POINTER(c_int), "pVal")),
+    ]
+
+
+class Value(COMObject):
+    _com_interfaces_ = [IValue]
+
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    def GetValue(self):
+        return self.value
+
+
+def _call_get_value(obj):
+    # Calls `GetValue` through the vtable of the COM pointer, like a client.
+    ptr = obj._com_pointers_[IValue._iid_]
+    this = addressof(ptr.contents)
+    result = c_int()
+    hr = ptr.contents.contents.GetValue(this, pointer(result))
+    return hr, result.value
+
+
+class Test_SharedVtbl(ut.TestCase):
+    def test_same_vtbl(self):
+        a, b = Value(1), Value(2)
+        pa = a._com_pointers_[IValue._iid_]
+        pb = b._com_pointers_[IValue._iid_]
+        self.assertNotEqual(addressof(pa.contents), addressof(pb.contents))
+        self.assertEqual(
+            addressof(pa.contents.contents), addressof(pb.contents.contents)
+        )
+        self.assertIs(_vtbl.get_shared_vtbl(IValue), _vtbl.get_shared_vtbl(IValue))
+
+    def test_dispatch_to_instance(self):
+        a, b = Value(1), Value(2)
+        self.assertEqual(_call_get_value(a), (0, 1))
+        self.assertEqual(_call_get_value(b), (0, 2))
+        a.value = 3
+        self.assertEqual(_call_get_value(a), (0, 3))
+
+    def test_base_interface_pointers(self):
+        obj = Value(1)
+        self.assertLessEqual({IUnknown._iid_, IValue._iid_}, set(obj._com_pointers_))
+
+    def test_forget_collected_object(self):
+        obj = Value(1)
+        this = addressof(obj._com_pointers_[IValue._iid_].contents)
+        self.assertIn(this, _vtbl._this_to_impls)
+        del obj
+        gc.collect()
+        self.assertNotIn(this, _vtbl._this_to_impls)
+
+    def test_unknown_this(self):
+        obj = Value(1)
+        with mock.patch.dict(_vtbl._this_to_impls, clear=True):
+            with self.assertLogs(_vtbl.logger, "ERROR"):
+                hr, _ = _call_get_value(obj)
+        self.assertEqual(hr, hresult.E_UNEXPECTED)
+        self.assertEqual(_call_get_value(obj), (0, 1))
+
+    def test_released_this(self):
+        obj = Value(1)
+        this = addressof(obj._com_pointers_[IValue._iid_].contents)
+        with mock.patch.dict(_vtbl._this_to_impls):
+            _vtbl._this_to_impls[this] = weakref.ref(_vtbl._Impls())
+            with self.assertLogs(_vtbl.logger, "ERROR"):
+                hr, _ = _call_get_value(obj)
+        self.assertEqual(hr, hresult.E_UNEXPECTED)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,38 @@
+# The basic C and COM data types of the type descriptions created by
+# `tlbparser`.  They are defined here, without using COM, so that type
+# descriptions can be built where the `comtypes` package cannot be imported,
+# like the synthetic ones of `comtypes.benchmarks`.
+
+from ctypes import alignment, c_void_p, sizeof
+
+from comtypes.tools import typedesc
+
+
+def PTR(typ):
+    return typedesc.PointerType(typ, sizeof(c_void_p) * 8, alignment(c_void_p) * 8)
+
+
+# basic C data types, with size and alignment in bits
+char_type = typedesc.FundamentalType("char", 8, 8)
+uchar_type = typedesc.FundamentalType("unsigned char", 8, 8)
+wchar_t_type = typedesc.FundamentalType("wchar_t", 16, 16)
+short_type = typedesc.FundamentalType("short int", 16, 16)
+ushort_type = typedesc.FundamentalType("short unsigned int", 16, 16)
+int_type = typedesc.FundamentalType("int", 32, 32)
+uint_type = typedesc.FundamentalType("unsigned int", 32, 32)
+long_type = typedesc.FundamentalType("long int", 32, 32)
+ulong_type = typedesc.FundamentalType("long unsigned int", 32, 32)
+longlong_type = typedesc.FundamentalType("long long int", 64, 64)
+ulonglong_type = typedesc.FundamentalType("long long unsigned int", 64, 64)
+float_type = typedesc.FundamentalType("float", 32, 32)
+double_type = typedesc.FundamentalType("double", 64, 64)
+void_type = typedesc.FundamentalType("void", 0, 0)
+
+# basic COM data types
+BSTR_type = typedesc.Typedef("BSTR", PTR(wchar_t_type))
+SCODE_type = typedesc.Typedef("SCODE", int_type)
+VARIANT_BOOL_type = typedesc.Typedef("VARIANT_BOOL", short_type)
+HRESULT_type = typedesc.Typedef("HRESULT", ulong_type)
+
+IDISPATCH_type = typedesc.Typedef("IDispatch", None)
+IUNKNOWN_type = typedesc.Typedef("IUnknown", None)
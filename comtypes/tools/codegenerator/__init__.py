@@ -1,5 +1,27 @@
-from comtypes.tools.codegenerator.modulenamer import (  # noqa
-    name_friendly_module,
-    name_wrapper_module,
-)
-from comtypes.tools.codegenerator.codegenerator import CodeGenerator, version  # noqa
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from comtypes.tools.codegenerator.modulenamer import (  # noqa
+        name_friendly_module,
+        name_partial_module,
+        name_wrapper_module,
+    )
+    from comtypes.tools.codegenerator.codegenerator import CodeGenerator, version  # noqa
+
+# The names are imported lazily, so that the submodules which do not use COM,
+# like `namespaces` and `packing`, can be imported where COM is not available.
+_EXPORTS = {
+    "name_friendly_module": "modulenamer",
+    "name_partial_module": "modulenamer",
+    "name_wrapper_module": "modulenamer",
+    "CodeGenerator": "codegenerator",
+    "version": "codegenerator",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f"{__name__}.{_EXPORTS[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
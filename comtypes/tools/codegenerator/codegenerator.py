@@ -3,16 +3,18 @@
 import keyword
 import logging
 import os
+import shutil
+import tempfile
 import textwrap
-from typing import Any
+import time
+from typing import Any, TextIO
 from typing import Dict, List, Tuple
 from typing import Sequence
 from typing import Optional, Union as _UnionT
 import io
 
 import comtypes
-from comtypes import typeinfo
-from comtypes.tools import tlbparser, typedesc
+from comtypes.tools import typedesc
 from comtypes.tools.codegenerator import namespaces
 from comtypes.tools.codegenerator import packing
 from comtypes.tools.codegenerator.modulenamer import name_wrapper_module
@@ -44,9 +46,54 @@ _InterfaceTypeDesc = _UnionT[
 ]
 
 
+# The body of a wrapper module is spilled to a temporary file when it becomes
+# larger than this, so huge typelibs are not generated entirely in memory.
+_SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class GenerationStats(object):
+    """Counts the type descriptions generated by a `CodeGenerator`, and the
+    time spent on them, per kind of type description.
+    """
+
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.counts: Dict[str, int] = {}
+        self.times: Dict[str, float] = {}
+        # time spent in nested items, which is not accounted to their parent
+        self._nested: List[float] = []
+
+    @property
+    def items(self) -> int:
+        return sum(self.counts.values())
+
+    def _enter(self) -> None:
+        self._nested.append(0.0)
+
+    def _leave(self, kind: str, elapsed: float) -> None:
+        nested = self._nested.pop()
+        if self._nested:
+            self._nested[-1] += elapsed
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.times[kind] = self.times.get(kind, 0.0) + elapsed - nested
+
+    def report(self) -> str:
+        lines = [f"{self.items} items in {self.rounds} rounds"]
+        for kind in sorted(self.times, key=self.times.__getitem__, reverse=True):
+            lines.append(
+                f"    {kind:<20} {self.counts[kind]:>8} {self.times[kind]:10.4f}s"
+            )
+        return "\n".join(lines)
+
+
 class CodeGenerator(object):
     def __init__(self, known_symbols=None, known_interfaces=None) -> None:
-        self.stream = io.StringIO()
+        # The imports, declarations and enums are only known when all the type
+        # descriptions were generated, so the body is written to the spooled
+        # `stream` first, then copied after them.
+        self.stream = tempfile.SpooledTemporaryFile(
+            max_size=_SPOOL_MAX_SIZE, mode="w+", encoding="utf-8"
+        )
         self.imports = namespaces.ImportedNamespaces()
         self.declarations = namespaces.DeclaredNamespaces()
         self.enums = namespaces.EnumerationNamespaces()
@@ -56,6 +103,10 @@ class CodeGenerator(object):
         self.known_interfaces = known_interfaces or {}
 
         self.done = set()  # type descriptions that have been generated
+        # type descriptions whose generation was deferred, mostly bodies of
+        # types whose heads were already generated
+        self._pending: List[Any] = []
+        self.stats = GenerationStats()
         self.names = set()  # names that have been generated
         self.externals = []  # typelibs imported to generated module
         self.enum_aliases: Dict[str, str] = {}
@@ -78,16 +129,39 @@ class CodeGenerator(object):
                 self.done.add(item.get_head())
                 self.done.add(item.get_body())
             return
-        mth = getattr(self, type(item).__name__)
         # to avoid infinite recursion, we have to mark it as done
         # before actually generating the code.
         self.done.add(item)
+        self._dispatch(item)
+
+    def _dispatch(self, item) -> None:
+        kind = type(item).__name__
+        mth = getattr(self, kind)
+        self.stats._enter()
+        start = time.perf_counter()
         mth(item)
+        self.stats._leave(kind, time.perf_counter() - start)
+
+    def _defer(self, item) -> None:
+        if item not in self.done:
+            self._pending.append(item)
 
     def generate_all(self, items):
         for item in items:
             self.generate(item)
 
+    def _generate_pending(self, tdescs: Sequence[Any]) -> None:
+        # Each round generates the items deferred by the previous one, so
+        # every item is visited only when it was queued, and the heads of
+        # the types are always generated before their bodies.
+        self._pending = list(dict.fromkeys(tdescs))
+        while self._pending:
+            self.stats.rounds += 1
+            items, self._pending = self._pending, []
+            self.generate_all(items)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("generated %s", self.stats.report())
+
     def _make_relative_path(self, path1, path2):
         """path1 and path2 are pathnames.
         Return path1 as a relative path to path2, if possible.
@@ -151,9 +225,39 @@ class CodeGenerator(object):
         and version numbers.
         Such as `comtypes.gen._xxxxxxxx_xxxx_xxxx_xxxx_xxxxxxxxxxxx_l_M_m`.
         """
+        output = io.StringIO()
+        self.write_wrapper_code(tdescs, filename, output)
+        return output.getvalue()
+
+    def write_wrapper_code(
+        self, tdescs: Sequence[Any], filename: Optional[str], output: TextIO
+    ) -> None:
+        """Writes the code for the COM type library wrapper module to `output`.
+
+        This is the streaming version of `generate_wrapper_code`; the code is
+        written section by section, and the body is copied from the spooled
+        `stream` in chunks, so that the whole module is never held in memory.
+
+        The spooled `stream` is closed afterwards, so the code generator
+        writes one wrapper module only.
+        """
+        try:
+            self._write_wrapper_code(tdescs, filename, output)
+        finally:
+            self.stream.close()
+
+    def _write_wrapper_code(
+        self, tdescs: Sequence[Any], filename: Optional[str], output: TextIO
+    ) -> None:
         tlib_mtime = None
 
         if filename is not None:
+            # Imported here, so that the code of type descriptions which were
+            # not loaded from a file can be generated where COM is not
+            # available, as `comtypes.benchmarks` does.
+            from comtypes import typeinfo
+            from comtypes.tools import tlbparser
+
             # get full path to DLL first (os.stat can't work with relative DLL paths properly)
             loaded_typelib = typeinfo.LoadTypeLib(filename)
             full_filename = tlbparser.get_tlib_filename(loaded_typelib)
@@ -173,21 +277,12 @@ class CodeGenerator(object):
         self.declarations.add("_lcid", "0", "change this if required")
         self._generate_typelib_path(filename)
 
-        items = set(tdescs)
-        loops = 0
-        while items:
-            loops += 1
-            self.more = set()
-            self.generate_all(items)
-
-            items |= self.more
-            items -= self.done
+        self._generate_pending(tdescs)
 
         self.imports.add("ctypes", "*")  # HACK: wildcard import is so ugly.
         if tlib_mtime is not None:
             logger.debug('filename: "%s": tlib_mtime: %s', filename, tlib_mtime)
             self.imports.add("comtypes", "_check_version")
-        output = io.StringIO()
         if filename is not None:
             # Hm, what is the CORRECT encoding?
             print("# -*- coding: mbcs -*-", file=output)
@@ -214,12 +309,16 @@ class CodeGenerator(object):
             for k, v in self.enum_aliases.items():
                 print(f"{k} = {v}", file=output)
             print(file=output)
-        print(self.stream.getvalue(), file=output)
+        self.stream.seek(0)
+        shutil.copyfileobj(self.stream, output)
+        print(file=output)
         print(self._make_dunder_all_part(), file=output)
         print(file=output)
         if tlib_mtime is not None:
-            print("_check_version(%r, %f)" % (version, tlib_mtime), file=output)
-        return output.getvalue()
+            print(
+                "_check_version(%r, %f, typelib_path)" % (version, tlib_mtime),
+                file=output,
+            )
 
     def generate_friendly_code(self, modname: str) -> str:
         """Returns the code for the COM type library friendly module.
@@ -323,7 +422,7 @@ class CodeGenerator(object):
     def Typedef(self, tp: typedesc.Typedef) -> None:
         if isinstance(tp.typ, (typedesc.Structure, typedesc.Union)):
             self.generate(tp.typ.get_head())
-            self.more.add(tp.typ)
+            self._defer(tp.typ)
         else:
             self.generate(tp.typ)
         definition = self._to_type_name(tp.typ)
@@ -344,7 +443,7 @@ class CodeGenerator(object):
     def StructureHead(self, head: typedesc.StructureHead) -> None:
         for struct in head.struct.bases:
             self.generate(struct.get_head())
-            self.more.add(struct)
+            self._defer(struct)
         if head.struct.location:
             self.last_item_class = False
             print(f"# {head.struct.location}", file=self.stream)
@@ -616,12 +715,12 @@ class CodeGenerator(object):
             # this defines the class
             self.generate(tp.typ.get_head())
             # this defines the _methods_
-            self.more.add(tp.typ)
+            self._defer(tp.typ)
         elif type(tp.typ) is typedesc.PointerType:
             self.generate(tp.typ)
         elif type(tp.typ) in (typedesc.Union, typedesc.Structure):
             self.generate(tp.typ.get_head())
-            self.more.add(tp.typ)
+            self._defer(tp.typ)
         elif type(tp.typ) is typedesc.Typedef:
             self.generate(tp.typ)
         else:
@@ -723,8 +822,7 @@ class CodeGenerator(object):
         else:
             raise TypeError
         self.done.add(item)  # to avoid infinite recursion.
-        mth = getattr(self, type(item).__name__)
-        mth(item)
+        self._dispatch(item)
 
     def ComInterface(self, itf: typedesc.ComInterface) -> None:
         self.generate(itf.get_head())
@@ -756,7 +854,7 @@ class CodeGenerator(object):
             # we don't beed to generate IUnknown
             return
         self.generate(head.itf.base.get_head())
-        self.more.add(head.itf.base)
+        self._defer(head.itf.base)
         basename = self._to_type_name(head.itf.base)
 
         self.imports.add("comtypes", "GUID")
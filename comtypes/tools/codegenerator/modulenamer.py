@@ -1,10 +1,13 @@
-from typing import Optional
+import hashlib
+from typing import TYPE_CHECKING, Iterable, Optional
 
 import comtypes
-from comtypes import typeinfo
 
+if TYPE_CHECKING:
+    from comtypes import typeinfo
 
-def name_wrapper_module(tlib: typeinfo.ITypeLib) -> str:
+
+def name_wrapper_module(tlib: "typeinfo.ITypeLib") -> str:
     """Determine the name of a typelib wrapper module"""
     libattr = tlib.GetLibAttr()
     guid = str(libattr.guid)[1:-1].replace("-", "_")
@@ -12,7 +15,15 @@ def name_wrapper_module(tlib: typeinfo.ITypeLib) -> str:
     return f"comtypes.gen.{modname}"
 
 
-def name_friendly_module(tlib: typeinfo.ITypeLib) -> Optional[str]:
+def name_partial_module(tlib: "typeinfo.ITypeLib", only: Iterable[str]) -> str:
+    """Determine the name of a wrapper module containing only the `only`
+    types of a typelib, and the types they depend on."""
+    key = "\0".join(sorted(set(only))).encode("utf-8")
+    digest = hashlib.sha1(key).hexdigest()[:12]
+    return f"{name_wrapper_module(tlib)}_only_{digest}"
+
+
+def name_friendly_module(tlib: "typeinfo.ITypeLib") -> Optional[str]:
     """Determine the friendly-name of a typelib module.
     If cannot get friendly-name from typelib, returns `None`.
     """
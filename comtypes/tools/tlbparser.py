@@ -1,14 +1,43 @@
+import concurrent.futures
+import io
+import logging
 import os
+import pickle
 import sys
 from typing import Any
-from typing import Dict, List, Optional, Tuple
-from ctypes import alignment, byref, c_void_p, sizeof, windll
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from ctypes import POINTER, alignment, byref, c_void_p, sizeof, windll
 
-from comtypes import automation, BSTR, COMError, typeinfo
+from comtypes import automation, BSTR, COMError, GUID, typeinfo
 from comtypes.tools import typedesc
+from comtypes.tools._fundamentals import (  # noqa
+    PTR,
+    BSTR_type,
+    HRESULT_type,
+    IDISPATCH_type,
+    IUNKNOWN_type,
+    SCODE_type,
+    VARIANT_BOOL_type,
+    char_type,
+    double_type,
+    float_type,
+    int_type,
+    long_type,
+    longlong_type,
+    short_type,
+    uchar_type,
+    uint_type,
+    ulong_type,
+    ulonglong_type,
+    ushort_type,
+    void_type,
+    wchar_t_type,
+)
 from comtypes.client._code_cache import _get_module_filename
 
 
+logger = logging.getLogger(__name__)
+
 # Is the process 64-bit?
 is_64bits = sys.maxsize > 2**32
 
@@ -16,32 +45,7 @@ is_64bits = sys.maxsize > 2**32
 ################################
 
 
-def PTR(typ):
-    return typedesc.PointerType(typ, sizeof(c_void_p) * 8, alignment(c_void_p) * 8)
-
-
-# basic C data types, with size and alignment in bits
-char_type = typedesc.FundamentalType("char", 8, 8)
-uchar_type = typedesc.FundamentalType("unsigned char", 8, 8)
-wchar_t_type = typedesc.FundamentalType("wchar_t", 16, 16)
-short_type = typedesc.FundamentalType("short int", 16, 16)
-ushort_type = typedesc.FundamentalType("short unsigned int", 16, 16)
-int_type = typedesc.FundamentalType("int", 32, 32)
-uint_type = typedesc.FundamentalType("unsigned int", 32, 32)
-long_type = typedesc.FundamentalType("long int", 32, 32)
-ulong_type = typedesc.FundamentalType("long unsigned int", 32, 32)
-longlong_type = typedesc.FundamentalType("long long int", 64, 64)
-ulonglong_type = typedesc.FundamentalType("long long unsigned int", 64, 64)
-float_type = typedesc.FundamentalType("float", 32, 32)
-double_type = typedesc.FundamentalType("double", 64, 64)
-void_type = typedesc.FundamentalType("void", 0, 0)
-
-# basic COM data types
-BSTR_type = typedesc.Typedef("BSTR", PTR(wchar_t_type))
-SCODE_type = typedesc.Typedef("SCODE", int_type)
-VARIANT_BOOL_type = typedesc.Typedef("VARIANT_BOOL", short_type)
-HRESULT_type = typedesc.Typedef("HRESULT", ulong_type)
-
+# basic COM data types which need `comtypes.automation`
 VARIANT_type = typedesc.Structure(
     "VARIANT",
     align=alignment(automation.VARIANT) * 8,
@@ -49,8 +53,6 @@ VARIANT_type = typedesc.Structure(
     bases=[],
     size=sizeof(automation.VARIANT) * 8,
 )
-IDISPATCH_type = typedesc.Typedef("IDispatch", None)
-IUNKNOWN_type = typedesc.Typedef("IUnknown", None)
 DECIMAL_type = typedesc.Structure(
     "DECIMAL",
     align=alignment(automation.DECIMAL) * 8,
@@ -109,10 +111,68 @@ COMTYPES = {
 ################################################################
 
 
+def _intern(name: Optional[str]) -> Optional[str]:
+    # The same member and parameter names are used over and over again.
+    return name if name is None else sys.intern(name)
+
+
+def _compact_arguments(items: Dict[str, Any]) -> None:
+    # The arguments of the methods are not added to after parsing, store them
+    # in tuples instead of over-allocated lists.
+    for item in items.values():
+        if isinstance(item, (typedesc.ComInterface, typedesc.DispInterface)):
+            for m in item.members:
+                if isinstance(m, (typedesc.ComMethod, typedesc.DispMethod)):
+                    m.arguments = tuple(m.arguments)  # type: ignore
+
+
 class Parser(object):
     tlib: typeinfo.ITypeLib
     items: Dict[str, Any]
 
+    def __init__(self, tlib: typeinfo.ITypeLib) -> None:
+        self.tlib = tlib
+        self.items = {}
+        # Structural types (pointers, arrays and safearrays) are shared,
+        # keyed by the `id()` of the type they are made of.
+        self._structural_types: Dict[Tuple[Any, ...], Any] = {}
+        # The typedesc each `ITypeInfo` was parsed into.  Keeping the
+        # `ITypeInfo` pointer alive as key also keeps its identity unique.
+        self._parsed: Dict[typeinfo.ITypeInfo, Any] = {}
+        self._typelib_keys: Dict[typeinfo.ITypeLib, str] = {}
+        self._libattr: Optional[typeinfo.TLIBATTR] = None
+        self._idlflags: Dict[Tuple[str, ...], List[str]] = {}
+
+    def _intern_flags(self, flags: List[str]) -> List[str]:
+        # Equal idlflags lists are shared by all the type descriptions, so
+        # they must not be modified.
+        return self._idlflags.setdefault(tuple(flags), flags)
+
+    def make_pointer(self, typ: Any) -> typedesc.PointerType:
+        key = ("ptr", id(typ))
+        try:
+            return self._structural_types[key]
+        except KeyError:
+            result = self._structural_types[key] = PTR(typ)
+            return result
+
+    def make_array(self, typ: Any, min: int, max: int) -> typedesc.ArrayType:
+        key = ("array", id(typ), min, max)
+        try:
+            return self._structural_types[key]
+        except KeyError:
+            result = typedesc.ArrayType(typ, min, max)
+            self._structural_types[key] = result
+            return result
+
+    def make_safearray(self, typ: Any) -> typedesc.SAFEARRAYType:
+        key = ("safearray", id(typ))
+        try:
+            return self._structural_types[key]
+        except KeyError:
+            result = self._structural_types[key] = midlSAFEARRAY(typ)
+            return result
+
     def make_type(self, tdesc: typeinfo.TYPEDESC, tinfo: typeinfo.ITypeInfo) -> Any:
         if tdesc.vt in COMTYPES:
             return COMTYPES[tdesc.vt]
@@ -120,14 +180,14 @@ class Parser(object):
             arraydesc: typeinfo.tagARRAYDESC = tdesc._.lpadesc[0]
             typ = self.make_type(arraydesc.tdescElem, tinfo)
             for i in range(arraydesc.cDims):
-                typ = typedesc.ArrayType(
+                typ = self.make_array(
                     typ,
                     arraydesc.rgbounds[i].lLbound,
                     arraydesc.rgbounds[i].cElements - 1,
                 )
             return typ
         elif tdesc.vt == automation.VT_PTR:
-            return PTR(self.make_type(tdesc._.lptdesc[0], tinfo))
+            return self.make_pointer(self.make_type(tdesc._.lptdesc[0], tinfo))
         elif tdesc.vt == automation.VT_USERDEFINED:
             try:
                 ti = tinfo.GetRefTypeInfo(tdesc._.hreftype)
@@ -152,7 +212,7 @@ class Parser(object):
             return result
         elif tdesc.vt == automation.VT_SAFEARRAY:
             # SAFEARRAY(<type>), see Don Box pp.331f
-            return midlSAFEARRAY(self.make_type(tdesc._.lptdesc[0], tinfo))
+            return self.make_safearray(self.make_type(tdesc._.lptdesc[0], tinfo))
         raise NotImplementedError(tdesc.vt)
 
     ################################################################
@@ -161,14 +221,13 @@ class Parser(object):
     def ParseEnum(
         self, tinfo: typeinfo.ITypeInfo, ta: typeinfo.TYPEATTR
     ) -> typedesc.Enumeration:
-        ta = tinfo.GetTypeAttr()
         enum_name = tinfo.GetDocumentation(-1)[0]
         enum = typedesc.Enumeration(enum_name, 32, 32)
         self._register(enum_name, enum)
 
         for i in range(ta.cVars):
             vd = tinfo.GetVarDesc(i)
-            name = tinfo.GetDocumentation(vd.memid)[0]
+            name = _intern(tinfo.GetDocumentation(vd.memid)[0])
             assert vd.varkind == typeinfo.VAR_CONST
             num_val: int = vd._.lpvarValue[0].value
             v = typedesc.EnumValue(name, num_val, enum)
@@ -190,8 +249,7 @@ class Parser(object):
         )
         self._register(struct_name, struct)
 
-        tlib, _ = tinfo.GetContainingTypeLib()
-        tlib_ta = tlib.GetLibAttr()
+        tlib_ta = self._get_libattr()
         # If this is a 32-bit typlib being loaded in a 64-bit process, then the
         # size and alignment are incorrect. Set the size to None to disable
         # size checks and correct the alignment.
@@ -210,7 +268,7 @@ class Parser(object):
 
         for i in range(ta.cVars):
             vd = tinfo.GetVarDesc(i)
-            name = tinfo.GetDocumentation(vd.memid)[0]
+            name = _intern(tinfo.GetDocumentation(vd.memid)[0])
             offset = vd._.oInst * 8
             assert vd.varkind == typeinfo.VAR_PERINSTANCE
             typ = self.make_type(vd.elemdescVar.tdesc, tinfo)
@@ -276,7 +334,7 @@ class Parser(object):
             return None
 
         iid = str(ta.guid)
-        idlflags = self.interface_type_flags(ta.wTypeFlags)
+        idlflags = self._intern_flags(self.interface_type_flags(ta.wTypeFlags))
         itf = typedesc.ComInterface(itf_name, None, iid, idlflags, itf_doc)
         self._register(itf_name, itf)
 
@@ -301,19 +359,26 @@ class Parser(object):
             flags = self.func_flags(fd.wFuncFlags)
             flags += self.inv_kind(fd.invkind)
             mth = typedesc.ComMethod(
-                fd.invkind, fd.memid, func_name, returns, flags, func_doc
+                fd.invkind,
+                fd.memid,
+                _intern(func_name),
+                returns,
+                self._intern_flags(flags),
+                func_doc,
             )
             for j in range(fd.cParams):
                 elemdesc = fd.lprgelemdescParam[j]
                 typ = self.make_type(elemdesc.tdesc, tinfo)
-                name = names[j + 1]
+                name = _intern(names[j + 1])
                 paramdesc = elemdesc._.paramdesc
                 if paramdesc.wParamFlags & typeinfo.PARAMFLAG_FHASDEFAULT:
                     # XXX should be handled by VARIANT itself
                     default: Any = paramdesc.pparamdescex[0].varDefaultValue.value
                 else:
                     default = None
-                param_flags = self.param_flags(paramdesc.wParamFlags)
+                param_flags = self._intern_flags(
+                    self.param_flags(paramdesc.wParamFlags)
+                )
                 mth.add_argument(typ, name, param_flags, default)
             members.append((fd.oVft, mth))
         # Sort the methods by oVft (VTable offset): Some typeinfo
@@ -333,7 +398,7 @@ class Parser(object):
         tibase = tinfo.GetRefTypeInfo(hr)
         base = self.parse_typeinfo(tibase)
         iid = str(ta.guid)
-        idlflags = self.interface_type_flags(ta.wTypeFlags)
+        idlflags = self._intern_flags(self.interface_type_flags(ta.wTypeFlags))
         doc = str(doc.split("\0")[0]) if doc is not None else doc
         itf = typedesc.DispInterface(itf_name, base, iid, idlflags, doc)
         self._register(itf_name, itf)
@@ -348,7 +413,11 @@ class Parser(object):
             var_name, var_doc = tinfo.GetDocumentation(vd.memid)[0:2]
             typ = self.make_type(vd.elemdescVar.tdesc, tinfo)
             mth = typedesc.DispProperty(
-                vd.memid, var_name, typ, self.var_flags(vd.wVarFlags), var_doc
+                vd.memid,
+                _intern(var_name),
+                typ,
+                self._intern_flags(self.var_flags(vd.wVarFlags)),
+                var_doc,
             )
             itf.add_member(mth)
 
@@ -387,19 +456,26 @@ class Parser(object):
             flags = self.func_flags(fd.wFuncFlags)
             flags += self.inv_kind(fd.invkind)
             mth = typedesc.DispMethod(
-                fd.memid, fd.invkind, func_name, returns, flags, func_doc
+                fd.memid,
+                fd.invkind,
+                _intern(func_name),
+                returns,
+                self._intern_flags(flags),
+                func_doc,
             )
             for j in range(fd.cParams):
                 elemdesc = fd.lprgelemdescParam[j]
                 typ = self.make_type(elemdesc.tdesc, tinfo)
-                name = names[j + 1]
+                name = _intern(names[j + 1])
                 paramdesc = elemdesc._.paramdesc
                 if paramdesc.wParamFlags & typeinfo.PARAMFLAG_FHASDEFAULT:
                     # XXX should be handled by VARIANT itself
                     default: Any = paramdesc.pparamdescex[0].varDefaultValue.value
                 else:
                     default = None
-                param_flags = self.param_flags(paramdesc.wParamFlags)
+                param_flags = self._intern_flags(
+                    self.param_flags(paramdesc.wParamFlags)
+                )
                 mth.add_argument(typ, name, param_flags, default)
             itf.add_member(mth)
         return itf
@@ -518,9 +594,9 @@ class Parser(object):
         # possible ta.wTypeFlags: helpstring, helpcontext, licensed,
         #        version, control, hidden, and appobject
         coclass_name, doc = tinfo.GetDocumentation(-1)[0:2]
-        tlibattr = tinfo.GetContainingTypeLib()[0].GetLibAttr()
+        tlibattr = self._get_libattr()
         clsid = str(ta.guid)
-        idlflags = self.coclass_type_flags(ta.wTypeFlags)
+        idlflags = self._intern_flags(self.coclass_type_flags(ta.wTypeFlags))
         coclass = typedesc.CoClass(coclass_name, clsid, idlflags, tlibattr, doc)
         self._register(coclass_name, coclass)
 
@@ -557,8 +633,7 @@ class Parser(object):
         )
         self._register(union_name, union)
 
-        tlib, _ = tinfo.GetContainingTypeLib()
-        tlib_ta = tlib.GetLibAttr()
+        tlib_ta = self._get_libattr()
         # If this is a 32-bit typlib being loaded in a 64-bit process, then the
         # size and alignment are incorrect. Set the size to None to disable
         # size checks and correct the alignment.
@@ -568,7 +643,7 @@ class Parser(object):
 
         for i in range(ta.cVars):
             vd = tinfo.GetVarDesc(i)
-            name = tinfo.GetDocumentation(vd.memid)[0]
+            name = _intern(tinfo.GetDocumentation(vd.memid)[0])
             offset = vd._.oInst * 8
             assert vd.varkind == typeinfo.VAR_PERINSTANCE
             typ = self.make_type(vd.elemdescVar.tdesc, tinfo)
@@ -578,12 +653,23 @@ class Parser(object):
 
     ################################################################
 
+    def _get_libattr(self) -> typeinfo.TLIBATTR:
+        # Only the types of the parsed typelib itself are parsed, the others
+        # are `External`s, so this is the libattr of every parsed type.
+        if self._libattr is None:
+            self._libattr = self.tlib.GetLibAttr()
+        return self._libattr
+
     def _typelib_module(self, tlib: Optional[typeinfo.ITypeLib] = None) -> str:
         if tlib is None:
             tlib = self.tlib
         # return a string that uniquely identifies a typelib.
         # The string doesn't have any meaning outside this instance.
-        return str(tlib.GetLibAttr())
+        try:
+            return self._typelib_keys[tlib]
+        except KeyError:
+            result = self._typelib_keys[tlib] = str(tlib.GetLibAttr())
+            return result
 
     def _register(
         self, name: Optional[str], value: Any, tlib: Optional[typeinfo.ITypeLib] = None
@@ -599,13 +685,22 @@ class Parser(object):
         self.items[fullname] = value
 
     def parse_typeinfo(self, tinfo: typeinfo.ITypeInfo) -> Any:
+        try:
+            return self._parsed[tinfo]
+        except KeyError:
+            pass
         name = tinfo.GetDocumentation(-1)[0]
         modname = self._typelib_module()
         try:
-            return self.items[f"{modname}.{name}"]
+            # Registered by another `ITypeInfo` of the same type, or still
+            # being parsed, e.g. an interface with methods referring to it.
+            result = self.items[f"{modname}.{name}"]
         except KeyError:
-            pass
+            result = self._parse_typeinfo(tinfo, name)
+        self._parsed[tinfo] = result
+        return result
 
+    def _parse_typeinfo(self, tinfo: typeinfo.ITypeInfo, name: str) -> Any:
         tlib = tinfo.GetContainingTypeLib()[0]
         if tlib != self.tlib:
             return self._parse_External(name, tlib, tinfo)
@@ -674,6 +769,7 @@ class Parser(object):
         for i in range(self.tlib.GetTypeInfoCount()):
             tinfo = self.tlib.GetTypeInfo(i)
             self.parse_typeinfo(tinfo)
+        _compact_arguments(self.items)
         return self.items
 
 
@@ -682,14 +778,190 @@ class TlbFileParser(Parser):
 
     def __init__(self, path):
         # XXX DOESN'T LOOK CORRECT: We should NOT register the typelib.
-        self.tlib = typeinfo.LoadTypeLibEx(path)  # , regkind=typeinfo.REGKIND_REGISTER)
-        self.items = {}
+        super().__init__(
+            typeinfo.LoadTypeLibEx(path)  # , regkind=typeinfo.REGKIND_REGISTER)
+        )
 
 
 class TypeLibParser(Parser):
     def __init__(self, tlib):
-        self.tlib = tlib
-        self.items = {}
+        super().__init__(tlib)
+
+
+################################################################
+# partitioned parsing
+
+# Typelibs with fewer type infos per process are parsed in a single process,
+# the overhead of the worker processes would outweigh the gain.
+_MIN_PARTITION_SIZE = 200
+
+_TlibKey = Tuple[str, int, int, int]  # libid, major, minor, lcid
+
+
+def _tlib_key(tlib: typeinfo.ITypeLib) -> _TlibKey:
+    la = tlib.GetLibAttr()
+    return (str(la.guid), la.wMajorVerNum, la.wMinorVerNum, la.lcid)
+
+
+class _FragmentPickler(pickle.Pickler):
+    # `ITypeLib` pointers, e.g. of `External`s, cannot be pickled; they are
+    # passed by reference and loaded again in the parent process.
+    def persistent_id(self, obj: Any) -> Optional[Tuple[Any, ...]]:
+        if isinstance(obj, POINTER(typeinfo.ITypeLib)):
+            return ("tlib", _tlib_key(obj), get_tlib_filename(obj))
+        return None
+
+
+class _FragmentUnpickler(pickle.Unpickler):
+    def __init__(
+        self, file: io.BytesIO, tlibs: Dict[_TlibKey, typeinfo.ITypeLib]
+    ) -> None:
+        super().__init__(file)
+        self._tlibs = tlibs
+
+    def persistent_load(self, pid: Tuple[Any, ...]) -> typeinfo.ITypeLib:
+        tag, key, path = pid
+        if tag != "tlib":
+            raise pickle.UnpicklingError(f"unsupported persistent id {pid!r}")
+        try:
+            return self._tlibs[key]
+        except KeyError:
+            pass
+        libid, major, minor, lcid = key
+        try:
+            tlib = typeinfo.LoadRegTypeLib(GUID(libid), major, minor, lcid)
+        except (COMError, OSError):
+            if path is None:
+                raise
+            tlib = typeinfo.LoadTypeLibEx(path)
+        self._tlibs[key] = tlib
+        return tlib
+
+
+def _dump_fragment(items: Dict[str, Any]) -> bytes:
+    f = io.BytesIO()
+    _FragmentPickler(f, pickle.HIGHEST_PROTOCOL).dump(items)
+    return f.getvalue()
+
+
+def _load_fragment(
+    data: bytes, tlibs: Dict[_TlibKey, typeinfo.ITypeLib]
+) -> Dict[str, Any]:
+    return _FragmentUnpickler(io.BytesIO(data), tlibs).load()
+
+
+def _parse_partition(path: str, start: int, stop: int) -> bytes:
+    # Runs in a worker process.  The types referred to by the type infos of
+    # the partition are parsed, too, so every fragment is self-contained.
+    parser = TlbFileParser(path)
+    parser.parse_LibraryDescription()
+    for i in range(start, stop):
+        parser.parse_typeinfo(parser.tlib.GetTypeInfo(i))
+    return _dump_fragment(parser.items)
+
+
+def _is_typedesc(value: Any) -> bool:
+    return type(value).__module__ in (typedesc.__name__, typedesc.__name__ + "_base")
+
+
+def _attribute_names(node: Any) -> List[str]:
+    # Most type descriptions have `__slots__`, the others a `__dict__`.
+    names = [n for cls in type(node).__mro__ for n in getattr(cls, "__slots__", ())]
+    names += getattr(node, "__dict__", {})
+    return [n for n in names if hasattr(node, n)]
+
+
+def _merge_fragments(fragments: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merges the items of the fragments.
+
+    The same type may have been parsed into several fragments.  The first
+    one parsed is kept, and all references to the others are replaced by
+    references to it.
+    """
+    items: Dict[str, Any] = {}
+    replacements: Dict[int, Any] = {}
+    for fragment in fragments:
+        for fullname, value in fragment.items():
+            first = items.setdefault(fullname, value)
+            if first is value:
+                continue
+            replacements[id(value)] = first
+            for part in ("get_head", "get_body"):
+                if hasattr(value, part):
+                    replacements[id(getattr(value, part)())] = getattr(first, part)()
+
+    stack = list(items.values())
+    seen: Set[int] = set(id(v) for v in stack)
+
+    def relink(value: Any) -> Any:
+        if id(value) in replacements:
+            return replacements[id(value)]
+        if isinstance(value, list):
+            value[:] = [relink(v) for v in value]
+        elif isinstance(value, tuple):
+            return tuple(relink(v) for v in value)
+        elif _is_typedesc(value) and id(value) not in seen:
+            seen.add(id(value))
+            stack.append(value)
+        return value
+
+    # The graph is walked iteratively, chains of types referring to each
+    # other can be much longer than the recursion limit.
+    while stack:
+        node = stack.pop()
+        for name in _attribute_names(node):
+            setattr(node, name, relink(getattr(node, name)))
+    return items
+
+
+def parse_partitioned(
+    tlib: typeinfo.ITypeLib, path: str, processes: Optional[int] = None
+) -> Dict[str, Any]:
+    """Parses the typelib `tlib`, loaded from `path`, in worker processes.
+
+    The type infos are split into `processes` (by default, the number of
+    CPUs) ranges, each parsed by a worker process that loads the typelib
+    from `path`.  The resulting fragments are merged, and references across
+    them are resolved by the typelib and the name of the types.
+
+    Returns the same items as `TypeLibParser(tlib).parse()` does.  Small
+    typelibs are parsed in the current process, and so are typelibs the
+    worker processes cannot load; the fallback is logged as a warning.
+    """
+    count = tlib.GetTypeInfoCount()
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, count // _MIN_PARTITION_SIZE)
+    if processes <= 1:
+        return TypeLibParser(tlib).parse()
+    bounds = [count * i // processes for i in range(processes + 1)]
+    tlibs = {_tlib_key(tlib): tlib}
+    try:
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = [
+                executor.submit(_parse_partition, path, start, stop)
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            fragments = [_load_fragment(f.result(), tlibs) for f in futures]
+    except (
+        OSError,
+        COMError,
+        pickle.PickleError,
+        concurrent.futures.BrokenExecutor,
+    ):
+        # The worker processes could not be started, died, or failed to load
+        # the typelib.  Other exceptions are bugs of the worker code, and are
+        # raised instead of being hidden by the fallback.
+        logger.warning(
+            "Parsing %s in %d processes failed, parsing it in one process",
+            path,
+            processes,
+            exc_info=True,
+        )
+        return TypeLibParser(tlib).parse()
+    items = _merge_fragments(fragments)
+    _compact_arguments(items)
+    return items
 
 
 ################################################################
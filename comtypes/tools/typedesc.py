@@ -2,14 +2,23 @@
 # in typedesc_base
 
 import ctypes
-from typing import Any, List, Optional, Sequence, Tuple, Union as _UnionT
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple
+from typing import Union as _UnionT
 
-from comtypes import typeinfo
-from comtypes.typeinfo import ITypeLib, TLIBATTR
 from comtypes.tools.typedesc_base import *
 
+if TYPE_CHECKING:
+    from comtypes.typeinfo import ITypeLib, TLIBATTR
+
+# `comtypes.typeinfo.IMPLTYPEFLAG_*`; this module does not import `typeinfo`,
+# so that the type descriptions can be built where COM is not available.
+_IMPLTYPEFLAG_FDEFAULT = 1
+_IMPLTYPEFLAG_FSOURCE = 2
+
 
 class TypeLib(object):
+    __slots__ = ("name", "guid", "major", "minor", "doc")
+
     def __init__(
         self, name: str, guid: str, major: int, minor: int, doc: Optional[str] = None
     ) -> None:
@@ -24,6 +33,8 @@ class TypeLib(object):
 
 
 class Constant(object):
+    __slots__ = ("name", "typ", "value", "doc")
+
     def __init__(
         self,
         name: str,
@@ -38,9 +49,11 @@ class Constant(object):
 
 
 class External(object):
+    __slots__ = ("tlib", "symbol_name", "size", "align", "docs")
+
     def __init__(
         self,
-        tlib: ITypeLib,
+        tlib: "ITypeLib",
         name: str,
         size: int,
         align: int,
@@ -61,6 +74,8 @@ class External(object):
 
 
 class SAFEARRAYType(object):
+    __slots__ = ("typ", "align", "size")
+
     def __init__(self, typ: Any) -> None:
         self.typ = typ
         self.align = self.size = ctypes.sizeof(ctypes.c_void_p) * 8
@@ -68,6 +83,8 @@ class SAFEARRAYType(object):
 
 class ComMethod(object):
     # custom COM method, parsed from typelib
+    __slots__ = ("invkind", "name", "returns", "idlflags", "memid", "doc", "arguments")
+
     def __init__(
         self,
         invkind: int,
@@ -93,6 +110,8 @@ class ComMethod(object):
 
 class DispMethod(object):
     # dispatchable COM method, parsed from typelib
+    __slots__ = ("dispid", "invkind", "name", "returns", "idlflags", "doc", "arguments")
+
     def __init__(
         self,
         dispid: int,
@@ -118,6 +137,8 @@ class DispMethod(object):
 
 class DispProperty(object):
     # dispatchable COM property, parsed from typelib
+    __slots__ = ("dispid", "name", "typ", "idlflags", "doc")
+
     def __init__(
         self, dispid: int, name: str, typ: Any, idlflags: List[str], doc: Optional[Any]
     ) -> None:
@@ -129,16 +150,31 @@ class DispProperty(object):
 
 
 class DispInterfaceHead(object):
+    __slots__ = ("itf",)
+
     def __init__(self, itf: "DispInterface") -> None:
         self.itf = itf
 
 
 class DispInterfaceBody(object):
+    __slots__ = ("itf",)
+
     def __init__(self, itf: "DispInterface") -> None:
         self.itf = itf
 
 
 class DispInterface(object):
+    __slots__ = (
+        "name",
+        "members",
+        "base",
+        "iid",
+        "idlflags",
+        "itf_head",
+        "itf_body",
+        "doc",
+    )
+
     def __init__(
         self,
         name: str,
@@ -167,16 +203,31 @@ class DispInterface(object):
 
 
 class ComInterfaceHead(object):
+    __slots__ = ("itf",)
+
     def __init__(self, itf: "ComInterface") -> None:
         self.itf = itf
 
 
 class ComInterfaceBody(object):
+    __slots__ = ("itf",)
+
     def __init__(self, itf: "ComInterface") -> None:
         self.itf = itf
 
 
 class ComInterface(object):
+    __slots__ = (
+        "name",
+        "members",
+        "base",
+        "iid",
+        "idlflags",
+        "itf_head",
+        "itf_body",
+        "doc",
+    )
+
     def __init__(
         self,
         name: str,
@@ -209,12 +260,14 @@ _Interface = _UnionT[ComInterface, DispInterface]
 
 
 class CoClass(object):
+    __slots__ = ("name", "clsid", "idlflags", "tlibattr", "interfaces", "doc")
+
     def __init__(
         self,
         name: str,
         clsid: str,
         idlflags: List[str],
-        tlibattr: TLIBATTR,
+        tlibattr: "TLIBATTR",
         doc: Optional[str],
     ) -> None:
         self.name = name
@@ -238,13 +291,13 @@ def groupby_impltypeflags(
     implemented = []
     sources = []
     for itf, impltypeflags in seq:
-        if impltypeflags & typeinfo.IMPLTYPEFLAG_FSOURCE:
+        if impltypeflags & _IMPLTYPEFLAG_FSOURCE:
             # source interface
             where = sources
         else:
             # sink interface
             where = implemented
-        if impltypeflags & typeinfo.IMPLTYPEFLAG_FDEFAULT:
+        if impltypeflags & _IMPLTYPEFLAG_FDEFAULT:
             # The default interface should be the first item on the list
             where.insert(0, itf)
         else:
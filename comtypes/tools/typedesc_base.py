@@ -2,8 +2,6 @@
 from typing import Any, SupportsInt
 from typing import List, Optional, Tuple, Union as _UnionT
 
-import comtypes
-
 
 class Argument(object):
     "a Parameter in the argument list of a callable (Function, Method, ...)"
@@ -108,6 +106,8 @@ class Method(_HasArgs):
 
 
 class FundamentalType(object):
+    __slots__ = ("name", "size", "align")
+
     location = None
 
     def __init__(self, name, size, align):
@@ -118,6 +118,8 @@ class FundamentalType(object):
 
 
 class PointerType(object):
+    __slots__ = ("typ", "size", "align")
+
     location = None
 
     def __init__(self, typ, size, align):
@@ -127,6 +129,8 @@ class PointerType(object):
 
 
 class Typedef(object):
+    __slots__ = ("name", "typ")
+
     location = None
 
     def __init__(self, name, typ):
@@ -135,6 +139,8 @@ class Typedef(object):
 
 
 class ArrayType(object):
+    __slots__ = ("typ", "min", "max")
+
     location = None
 
     def __init__(self, typ: Any, min: int, max: int) -> None:
@@ -144,6 +150,8 @@ class ArrayType(object):
 
 
 class StructureHead(object):
+    __slots__ = ("struct",)
+
     location = None
 
     def __init__(self, struct: "_Struct_Union_Base") -> None:
@@ -151,6 +159,8 @@ class StructureHead(object):
 
 
 class StructureBody(object):
+    __slots__ = ("struct",)
+
     location = None
 
     def __init__(self, struct: "_Struct_Union_Base") -> None:
@@ -158,6 +168,18 @@ class StructureBody(object):
 
 
 class _Struct_Union_Base(object):
+    __slots__ = (
+        "name",
+        "align",
+        "members",
+        "bases",
+        "artificial",
+        "size",
+        "_recordinfo_",
+        "struct_body",
+        "struct_head",
+    )
+
     name: str
     align: int
     members: List[_UnionT["Field", Method, Constructor]]
@@ -180,6 +202,8 @@ class _Struct_Union_Base(object):
 
 
 class Structure(_Struct_Union_Base):
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -202,6 +226,8 @@ class Structure(_Struct_Union_Base):
 
 
 class Union(_Struct_Union_Base):
+    __slots__ = ()
+
     def __init__(
         self,
         name: str,
@@ -224,6 +250,8 @@ class Union(_Struct_Union_Base):
 
 
 class Field(object):
+    __slots__ = ("name", "typ", "bits", "offset")
+
     def __init__(
         self, name: str, typ: Any, bits: Optional[Any], offset: SupportsInt
     ) -> None:
@@ -241,6 +269,8 @@ class CvQualifiedType(object):
 
 
 class Enumeration(object):
+    __slots__ = ("name", "size", "align", "values")
+
     location = None
 
     def __init__(self, name: str, size: SupportsInt, align: SupportsInt) -> None:
@@ -254,6 +284,8 @@ class Enumeration(object):
 
 
 class EnumValue(object):
+    __slots__ = ("name", "value", "enumeration")
+
     def __init__(self, name: str, value: int, enumeration: Enumeration) -> None:
         self.name = name
         self.value = value
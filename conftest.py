@@ -0,0 +1,12 @@
+# pytest imports `comtypes/test/conftest.py` and the tests as submodules of
+# the `comtypes` package.  Where the package cannot be imported, e.g. on
+# Linux, a placeholder package is installed first, so that the tests of the
+# modules which do not use COM can be run; see `comtypes/test/_pure.py`.
+import os
+import sys
+
+try:
+    import comtypes  # noqa
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), "comtypes", "test"))
+    import _pure  # noqa